@@ -0,0 +1,7 @@
+"""
+Código de inicialización para el paquete api.
+Este archivo es necesario para que Python trate el directorio como un paquete.
+"""
+
+# Este archivo puede estar vacío, su presencia es suficiente
+# para que Python reconozca el directorio como un paquete.
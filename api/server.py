@@ -0,0 +1,275 @@
+"""
+Servidor HTTP/JSON local: un único proceso es dueño de la base de datos (un TaskDAO) y los equipos
+de la recepción se conectan a él (RemoteTaskDAO, con TASK_API_URL en el .env) en lugar de abrir
+database.db a través de una carpeta compartida, donde los bloqueos de SQLite no son fiables.
+
+Cada conexión de cliente se atiende en su propio hilo (lecturas concurrentes, cada hilo con su
+conexión a SQLite) y todas las escrituras pasan por un único hilo escritor, de a una y en orden.
+Las conexiones HTTP se mantienen abiertas entre peticiones (HTTP/1.1 keep-alive).
+
+Uso:
+    python -m api.server [--host 127.0.0.1] [--port 8765] [--db database.db] [--verbose]
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from dotenv import load_dotenv
+
+from dao.task_dao import TaskDAO
+from models.task import Task
+from services.task_service import TaskService
+from utils.util import Util
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+class TaskAPIServer(ThreadingHTTPServer):
+    """Servidor HTTP con hilos que comparte un TaskDAO y un único hilo para las escrituras."""
+
+    daemon_threads = True
+
+    def __init__(self, address, task_dao, token="", verbose=False):
+        super().__init__(address, TaskAPIHandler)
+        self.task_dao = task_dao
+        self.token = token
+        self.verbose = verbose
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="api-escritura")
+
+    def write(self, fn, *args):
+        """Ejecuta una escritura en el hilo escritor y espera su resultado."""
+        return self._writer.submit(fn, *args).result()
+
+    def server_close(self):
+        super().server_close()
+        self._writer.shutdown(wait=True) # No perder escrituras ya aceptadas
+        self.task_dao.close()
+
+def _task_from_body(body, task_id=None):
+    """Crea una Task a partir del JSON recibido, validando los campos como el formulario."""
+    fields = {field: str(body.get(field) or "").strip() for field in TaskService.EDITABLE_FIELDS}
+    TaskService.validate(fields)
+    status = body.get("status") or "pendiente"
+    if status not in TaskService.STATUSES:
+        raise ValueError(f"Estado no válido: '{status}'.")
+    return Task(id=task_id, fecha_creacion=body.get("fecha_creacion"),
+                fecha_completado=body.get("fecha_completado"), status=status, **fields)
+
+def _tasks_json(tasks):
+    return [task.to_dict() for task in tasks]
+
+def _int_or_none(value):
+    return int(value) if value not in (None, "") else None
+
+class TaskAPIHandler(BaseHTTPRequestHandler):
+    """Atiende las peticiones JSON. Las rutas se resuelven con la tabla ROUTES."""
+
+    protocol_version = "HTTP/1.1" # Keep-alive: el cliente reutiliza la conexión
+    timeout = 120 # Segundos que una conexión inactiva se mantiene abierta
+    server_version = "GestorTareasAPI/1.0"
+
+    # (método HTTP, patrón de la ruta, nombre del método del handler)
+    ROUTES = (
+        ("GET", r"/tasks", "list_tasks"),
+        ("POST", r"/tasks", "create_task"),
+        ("GET", r"/tasks/ids", "task_ids"),
+        ("POST", r"/tasks/lookup", "lookup_tasks"),
+        ("POST", r"/tasks/status", "update_status_many"),
+        ("POST", r"/tasks/delete", "delete_many"),
+        ("GET", r"/tasks/(\d+)", "get_task"),
+        ("PUT", r"/tasks/(\d+)", "update_task"),
+        ("DELETE", r"/tasks/(\d+)", "delete_task"),
+        ("GET", r"/tasks/(\d+)/matches", "task_matches"),
+        ("GET", r"/search", "search"),
+        ("GET", r"/search/page", "search_page"),
+        ("GET", r"/cedulas/([^/]+)", "cedula_exists"),
+        ("GET", r"/report", "report"),
+        ("GET", r"/counters", "counters"),
+        ("POST", r"/counters/verify", "verify_counters"),
+        ("GET", r"/changes", "changes"),
+        ("GET", r"/changes/last", "last_change"),
+    )
+
+    @property
+    def dao(self):
+        return self.server.task_dao
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method):
+        """Busca la ruta, ejecuta su método y responde con JSON; los errores se traducen a códigos HTTP."""
+        url = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        try:
+            body = self._read_body()
+            if self.server.token and self.headers.get("Authorization") != f"Bearer {self.server.token}":
+                return self._send(401, {"error": "Token de acceso no válido.", "tipo": "PermissionError"})
+            for route_method, pattern, handler_name in self.ROUTES:
+                match = re.fullmatch(pattern, url.path.rstrip("/") or "/")
+                if match and route_method == method:
+                    status, payload = getattr(self, handler_name)(body, *match.groups())
+                    return self._send(status, payload)
+            self._send(404, {"error": f"Ruta no encontrada: {method} {url.path}", "tipo": "LookupError"})
+        except LookupError as e:
+            self._send(404, {"error": str(e), "tipo": "LookupError"})
+        except (ValueError, sqlite3.IntegrityError) as e:
+            # Datos no válidos o restricción de la BD (p. ej. cédula repetida): el cliente recibe ValueError
+            self._send(400, {"error": str(e), "tipo": "ValueError"})
+        except Exception as e:
+            self._send(500, {"error": str(e), "tipo": "Exception"})
+
+    def _read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ValueError("El cuerpo de la petición es demasiado grande.")
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length).decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"JSON no válido: {e}")
+
+    def _send(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    # --- Lecturas: en el hilo de la conexión, con su propia conexión a SQLite ---
+
+    def list_tasks(self, body):
+        page = self.dao.get_tasks_page(_int_or_none(self.query.get("after_id")),
+                                       int(self.query.get("limit", TaskDAO.DEFAULT_PAGE_SIZE)),
+                                       self.query.get("status") or None)
+        return 200, {"tareas": _tasks_json(page.tasks), "hay_mas": page.has_more}
+
+    def task_ids(self, body):
+        return 200, {"ids": self.dao.get_task_ids(self.query.get("status") or None, self.query.get("q") or None)}
+
+    def lookup_tasks(self, body):
+        return 200, {"tareas": _tasks_json(self.dao.get_tasks_by_ids(int(i) for i in body.get("ids", [])))}
+
+    def get_task(self, body, task_id):
+        task = self.dao.get_task_by_id(int(task_id))
+        if task is None:
+            raise LookupError(f"No se encontró la tarea con ID {task_id}.")
+        return 200, {"tarea": task.to_dict()}
+
+    def task_matches(self, body, task_id):
+        return 200, {"coincide": self.dao.task_matches_query(int(task_id), self.query.get("q", ""))}
+
+    def search(self, body):
+        return 200, {"tareas": _tasks_json(self.dao.search_tasks(self.query.get("q", "")))}
+
+    def search_page(self, body):
+        page = self.dao.search_tasks_page(self.query.get("q", ""), _int_or_none(self.query.get("after_id")),
+                                          int(self.query.get("limit", TaskDAO.DEFAULT_PAGE_SIZE)),
+                                          self.query.get("status") or None)
+        return 200, {"tareas": _tasks_json(page.tasks), "hay_mas": page.has_more}
+
+    def cedula_exists(self, body, cedula):
+        # Cualquier texto llega aquí (no un 404) y se valida con la misma regla que TaskService
+        cedula = unquote(cedula).strip()
+        valid, message = Util.validate_cedula(cedula)
+        if not valid:
+            raise ValueError(message)
+        return 200, {"existe": self.dao.check_cedula_exists(cedula, _int_or_none(self.query.get("exclude_id")))}
+
+    def report(self, body):
+        return 200, Util.report_to_json(self.dao.get_report(self.query.get("period") or "month"))
+
+    def counters(self, body):
+        return 200, self.dao.get_counters()
+
+    def changes(self, body):
+        changes = self.dao.get_changes_since(int(self.query.get("since", 0)), int(self.query.get("limit", 1000)))
+        return 200, dict(changes, changed=_tasks_json(changes["changed"]))
+
+    def last_change(self, body):
+        return 200, {"seq": self.dao.get_last_change_seq()}
+
+    # --- Escrituras: siempre en el único hilo escritor ---
+
+    def create_task(self, body):
+        task = _task_from_body(body)
+        return 201, {"tarea": self.server.write(self.dao.insert_task, task).to_dict()}
+
+    def update_task(self, body, task_id):
+        task = _task_from_body(body, int(task_id))
+        if self.dao.get_task_by_id(task.id) is None:
+            raise LookupError(f"No se encontró la tarea con ID {task_id} para actualizar.")
+        return 200, {"tarea": self.server.write(self.dao.update_task, task).to_dict()}
+
+    def delete_task(self, body, task_id):
+        if self.dao.get_task_by_id(int(task_id)) is None:
+            raise LookupError(f"No se encontró la tarea con ID {task_id} para eliminar.")
+        return 200, {"eliminada": self.server.write(self.dao.delete_task, int(task_id))}
+
+    def update_status_many(self, body):
+        status = body.get("status")
+        if status not in TaskService.STATUSES:
+            raise ValueError(f"Estado no válido: '{status}'.")
+        ids = [int(task_id) for task_id in body.get("ids", [])]
+        return 200, {"cambiadas": self.server.write(self.dao.update_status_many, ids, status)}
+
+    def delete_many(self, body):
+        ids = [int(task_id) for task_id in body.get("ids", [])]
+        return 200, {"eliminadas": self.server.write(self.dao.delete_many, ids)}
+
+    def verify_counters(self, body):
+        if body.get("rebuild"):
+            drift = self.server.write(self.dao.verify_counters, True)
+        else:
+            drift = self.dao.verify_counters()
+        return 200, {"diferencias": drift}
+
+def main(argv=None):
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Servidor HTTP/JSON del Gestor de Tareas")
+    parser.add_argument("--host", default=os.getenv("API_HOST", "127.0.0.1"),
+                        help="Dirección en la que escuchar (por defecto API_HOST o 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8765")),
+                        help="Puerto (por defecto API_PORT o 8765)")
+    parser.add_argument("--db", default=os.getenv("DATABASE_NAME", "database.db"),
+                        help="Base de datos (por defecto DATABASE_NAME del .env)")
+    parser.add_argument("--verbose", action="store_true", help="Mostrar cada petición")
+    args = parser.parse_args(argv)
+
+    token = os.getenv("API_TOKEN", "")
+    if args.host not in ("127.0.0.1", "localhost") and not token:
+        print("Advertencia: el servidor acepta conexiones de la red sin API_TOKEN; cualquiera podrá leer y modificar las tareas.")
+    server = TaskAPIServer((args.host, args.port), TaskDAO(args.db), token=token, verbose=args.verbose)
+    print(f"Sirviendo '{args.db}' en http://{args.host}:{server.server_address[1]} (Ctrl+C para detener)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
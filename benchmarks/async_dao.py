@@ -0,0 +1,93 @@
+"""
+Benchmark de clientes concurrentes: compara el TaskDAO síncrono (un hilo por cliente, cada uno con
+su conexión) con AsyncTaskDAO (una corutina por cliente sobre un único hilo de conexión, con las
+escrituras pendientes agrupadas en una transacción). Cada cliente inserta tareas, las marca como
+completadas y las vuelve a leer; se mide cuántas operaciones por segundo se completan en total.
+
+Uso:
+    python -m benchmarks.async_dao [--clients 1 8 32] [--ops 200]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.generate_dataset import generate_rows
+from dao.async_task_dao import AsyncTaskDAO
+from dao.task_dao import TaskDAO
+from models.task import Task
+
+def client_tasks(clients, ops):
+    """Tareas nuevas (sin fechas: las pone la base) repartidas entre los clientes."""
+    rows = list(generate_rows(clients * ops, seed=clients))
+    return [[Task(cedula=row[0], nombre=row[1], apellido=row[2], curso=row[3], turno=row[4], accion=row[5])
+             for row in rows[i * ops:(i + 1) * ops]] for i in range(clients)]
+
+def run_sync(db_name, workload):
+    """Un hilo por cliente sobre un TaskDAO compartido. Devuelve los segundos transcurridos."""
+    dao = TaskDAO(db_name)
+    errors = []
+
+    def client(tasks):
+        try:
+            for task in tasks:
+                dao.insert_task(task)
+                task.mark_as_completed()
+                dao.update_task(task)
+                dao.get_task_by_id(task.id)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=client, args=(tasks,)) for tasks in workload]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    dao.close()
+    if errors:
+        raise errors[0]
+    return elapsed, None
+
+async def run_async(db_name, workload):
+    """Una corutina por cliente sobre un AsyncTaskDAO. Devuelve los segundos y las transacciones."""
+    async with AsyncTaskDAO(db_name) as dao:
+        async def client(tasks):
+            for task in tasks:
+                await dao.insert_task(task)
+                task.mark_as_completed()
+                await dao.update_task(task)
+                await dao.get_task_by_id(task.id)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client(tasks) for tasks in workload))
+        elapsed = time.perf_counter() - start
+        return elapsed, dao.get_batch_stats()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rendimiento con clientes concurrentes: TaskDAO vs AsyncTaskDAO")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32], help="Clientes concurrentes")
+    parser.add_argument("--ops", type=int, default=200, help="Tareas que procesa cada cliente (3 operaciones por tarea)")
+    args = parser.parse_args(argv)
+
+    print(f"{'DAO':<8}{'Clientes':>9}{'Operaciones':>13}{'Segundos':>10}{'Ops/s':>10}{'Escrituras/commit':>19}")
+    with tempfile.TemporaryDirectory() as directory:
+        for clients in args.clients:
+            for name in ("sync", "async"):
+                db_name = os.path.join(directory, f"{name}_{clients}.db")
+                workload = client_tasks(clients, args.ops)
+                if name == "sync":
+                    elapsed, batches = run_sync(db_name, workload)
+                else:
+                    elapsed, batches = asyncio.run(run_async(db_name, workload))
+                operations = clients * args.ops * 3
+                per_commit = batches["escrituras"] / max(batches["transacciones"], 1) if batches else 1
+                print(f"{name:<8}{clients:>9}{operations:>13}{elapsed:>10.2f}{operations / elapsed:>10.0f}"
+                      f"{per_commit:>19.1f}")
+
+if __name__ == "__main__":
+    main()
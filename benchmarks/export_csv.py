@@ -0,0 +1,69 @@
+"""
+Benchmark de la exportación a CSV: filas por segundo y memoria máxima de la exportación por bloques
+(TaskDAO.iter_task_rows + Util.export_rows_to_csv) frente a la anterior (get_all_tasks + export_to_csv).
+
+Uso:
+    python -m benchmarks.export_csv [--rows 1000 100000 1000000] [--legacy]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from dao.task_dao import TaskDAO
+from utils.util import Util
+
+def create_database(path, rows):
+    """Crea una base con 'rows' tareas sintéticas (insertadas directamente, sin validaciones)."""
+    dao = TaskDAO(path)
+    dao.insert_task_rows(
+        (str(1000000 + i), "Nombre", "Apellido", f"{i % 6 + 1}° Año", "Mañana", f"Acción {i % 50}",
+         "2024-03-01 08:00:00", "" if i % 3 else "2024-03-02 09:30:00", "completada" if i % 3 == 0 else "pendiente")
+        for i in range(rows))
+    return dao
+
+def export_streaming(dao, filename):
+    success, message, _ = Util.export_rows_to_csv(dao.iter_task_rows(), filename)
+    return success, message
+
+def export_legacy(dao, filename):
+    return Util.export_to_csv(dao.get_all_tasks(), filename)
+
+def measure(export, dao, filename, rows):
+    """Devuelve (filas por segundo, memoria máxima en MB). El tiempo se mide sin tracemalloc."""
+    start = time.perf_counter()
+    success, message = export(dao, filename)
+    seconds = time.perf_counter() - start
+    if not success:
+        raise Exception(message)
+
+    tracemalloc.start()
+    export(dao, filename)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows / seconds, peak / (1024 * 1024)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rendimiento de la exportación a CSV")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 100000],
+                        help="Cantidades de tareas a probar (por defecto 1000 100000)")
+    parser.add_argument("--legacy", action="store_true", help="Medir también la exportación anterior")
+    args = parser.parse_args(argv)
+
+    print(f"{'Tareas':>10}  {'Versión':<12}{'Filas/s':>12}{'Memoria máx.':>15}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.rows:
+            dao = create_database(os.path.join(directory, f"bench_{rows}.db"), rows)
+            filename = os.path.join(directory, "export.csv")
+            versions = [("por bloques", export_streaming)]
+            if args.legacy:
+                versions.append(("anterior", export_legacy))
+            for label, export in versions:
+                rate, peak = measure(export, dao, filename, rows)
+                print(f"{rows:>10}  {label:<12}{rate:>12.0f}{peak:>12.1f} MB")
+            dao.close()
+
+if __name__ == "__main__":
+    main()
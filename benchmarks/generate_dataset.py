@@ -0,0 +1,114 @@
+"""
+Generador de datos sintéticos para pruebas de carga: llena una base de datos con N tareas realistas
+(cédulas válidas de 6 a 10 dígitos, nombres y apellidos con acentos, cursos y turnos con una
+distribución parecida a la de una escuela) usando TaskDAO.insert_task_rows. Con la misma semilla
+se generan siempre las mismas tareas.
+
+Uso:
+    python -m benchmarks.generate_dataset --rows 100000 [--db database.db] [--seed 42] [--completed 0.6]
+"""
+
+import argparse
+import os
+import random
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+from dao.task_dao import TaskDAO
+from utils.util import Util
+
+NOMBRES = ("María", "José", "Luis", "Ana", "Sofía", "Martín", "Lucía", "Andrés", "Valentina", "Tomás",
+           "Camila", "Joaquín", "Inés", "Ramón", "Ángel", "Mónica", "Raúl", "Verónica", "Sebastián",
+           "Begoña", "Iñaki", "Nicolás", "Agustina", "Jesús", "Valeria", "Héctor", "Rocío", "Matías",
+           "Julián", "Noemí", "Simón", "Dolores", "Máximo", "Belén", "Germán", "Zoé")
+APELLIDOS = ("González", "Rodríguez", "Fernández", "López", "Martínez", "García", "Pérez", "Sánchez",
+             "Gómez", "Díaz", "Núñez", "Álvarez", "Benítez", "Giménez", "Peña", "Muñoz", "Ramírez",
+             "Domínguez", "Suárez", "Vázquez", "Ibáñez", "Ortiz", "Acuña", "Cáceres", "Chávez",
+             "Ruiz Díaz", "Villalba", "O'Higgins", "Pérez-Reverte", "Zúñiga", "Báez", "Ojeda")
+# Los mismos cursos que ofrece el formulario, con más alumnos en primaria que en los cursos superiores
+CURSOS = (("Pre Escolar", 6), ("1° Grado", 10), ("2° Grado", 10), ("3° Grado", 10), ("4° Grado", 9),
+          ("5° Grado", 9), ("6° Grado", 9), ("7° Grado", 8), ("8° Grado", 8), ("9no Grado", 7),
+          ("1° Curso", 6), ("2° Curso", 5), ("3° Curso", 3))
+TURNOS = (("Mañana", 65), ("Tarde", 35))
+ACCIONES = ("Entregar fotocopia de cédula", "Entregar certificado de nacimiento", "Completar ficha médica",
+            "Pagar matrícula", "Traer foto carnet", "Firmar autorización de salida", "Entregar boletín anterior",
+            "Actualizar datos de contacto", "Presentar constancia de vacunas", "Retirar uniforme")
+# Cantidad de dígitos de las cédulas: la mayoría tiene 7 u 8
+CEDULA_DIGITOS = ((6, 3), (7, 30), (8, 60), (9, 5), (10, 2))
+
+def _weighted(rng, options, count):
+    """Elige 'count' valores de options ((valor, peso), ...) según sus pesos."""
+    values, weights = zip(*options)
+    return rng.choices(values, weights=weights, k=count)
+
+def generate_cedulas(rng, count):
+    """Devuelve 'count' cédulas distintas (como texto), mezcladas, con 6 a 10 dígitos."""
+    lengths = _weighted(rng, CEDULA_DIGITOS, count)
+    cedulas = []
+    for digits, _ in CEDULA_DIGITOS:
+        numbers = range(10 ** (digits - 1), 10 ** digits)
+        wanted = min(lengths.count(digits), len(numbers))
+        cedulas.extend(str(n) for n in rng.sample(numbers, wanted))
+    while len(cedulas) < count: # Solo si no alcanzan las cédulas de 6 dígitos (más de ~900.000)
+        cedulas.extend(str(n) for n in rng.sample(range(10 ** 9, 10 ** 10), count - len(cedulas)))
+        cedulas = list(dict.fromkeys(cedulas))
+    rng.shuffle(cedulas)
+    return cedulas
+
+def generate_rows(count, seed=42, completed_ratio=0.5, days=365, now=None):
+    """
+    Genera 'count' tuplas listas para TaskDAO.insert_task_rows. Las fechas de creación se reparten en
+    los últimos 'days' días y las tareas completadas se completan entre unas horas y 30 días después.
+    """
+    rng = random.Random(seed)
+    now = now or datetime(2025, 3, 1, 8, 0)
+    cursos = _weighted(rng, CURSOS, count)
+    turnos = _weighted(rng, TURNOS, count)
+    span = days * 86400
+    for i, cedula in enumerate(generate_cedulas(rng, count)):
+        nombre = rng.choice(NOMBRES)
+        if rng.random() < 0.3:
+            nombre = f"{nombre} {rng.choice(NOMBRES)}" # Nombres compuestos
+        apellido = f"{rng.choice(APELLIDOS)} {rng.choice(APELLIDOS)}" if rng.random() < 0.4 else rng.choice(APELLIDOS)
+        created = now - timedelta(seconds=rng.randrange(span))
+        if rng.random() < completed_ratio:
+            completed = min(created + timedelta(seconds=rng.randrange(3600, 30 * 86400)), now)
+            fecha_completado, status = completed.strftime(Util.STORAGE_DATE_FORMAT), "completada"
+        else:
+            fecha_completado, status = "", "pendiente"
+        yield (cedula, nombre, apellido, cursos[i], turnos[i], rng.choice(ACCIONES),
+               created.strftime(Util.STORAGE_DATE_FORMAT), fecha_completado, status)
+
+def main(argv=None):
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Genera tareas sintéticas para pruebas de carga")
+    parser.add_argument("--rows", type=int, default=10000, help="Cantidad de tareas (por defecto 10000)")
+    parser.add_argument("--db", default=os.getenv("DATABASE_NAME", "database.db"),
+                        help="Base de datos de destino (por defecto DATABASE_NAME del .env)")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla; la misma semilla genera las mismas tareas")
+    parser.add_argument("--completed", type=float, default=0.5, help="Proporción de tareas completadas (0 a 1)")
+    parser.add_argument("--days", type=int, default=365, help="Días hacia atrás en los que se reparten las fechas")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="Filas por transacción")
+    args = parser.parse_args(argv)
+    if not 0 <= args.completed <= 1:
+        parser.error("--completed debe estar entre 0 y 1")
+
+    dao = TaskDAO(args.db)
+    start = time.perf_counter()
+
+    def report(done):
+        print(f"\r{done}/{args.rows} tareas ({done / (time.perf_counter() - start):.0f} filas/s)", end="", flush=True)
+
+    try:
+        inserted, ignored = dao.insert_task_rows(
+            generate_rows(args.rows, args.seed, args.completed, args.days),
+            chunk_size=args.chunk_size, on_progress=report)
+    finally:
+        dao.close()
+    print(f"\n{inserted} tareas insertadas en '{args.db}' en {time.perf_counter() - start:.1f} s"
+          + (f"; {ignored} omitidas porque su cédula ya existía" if ignored else ""))
+
+if __name__ == "__main__":
+    main()
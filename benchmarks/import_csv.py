@@ -0,0 +1,59 @@
+"""
+Benchmark de la importación desde CSV (TaskDAO.import_from_csv): genera un archivo con tareas
+válidas, lo importa en una base nueva y mide filas por segundo. Con --repeat-upsert vuelve a
+importarlo en modo 'upsert', donde todas las cédulas ya existen. Con --workers se elige cuántos
+procesos leen y validan el archivo (1 = lectura secuencial).
+
+Uso:
+    python -m benchmarks.import_csv [--rows 1000000] [--chunk-size 5000] [--workers 4] [--repeat-upsert]
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from dao.task_dao import TaskDAO
+from models.task import TASK_FIELDS
+
+def write_csv(path, rows):
+    """Escribe un CSV con el mismo formato que genera la exportación."""
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(TASK_FIELDS)
+        for i in range(rows):
+            completada = i % 3 == 0
+            writer.writerow(("", str(1000000 + i), "María José", "Núñez", f"{i % 6 + 1}° Año", "Mañana",
+                             f"Acción {i % 50}", "01/03/2024 08:00", "02/03/2024 09:30" if completada else "",
+                             "completada" if completada else "pendiente"))
+
+def run(dao, path, mode, chunk_size, workers):
+    stats = dao.import_from_csv(path, mode=mode, chunk_size=chunk_size, resume=False, workers=workers)
+    print(f"{mode:<8}{stats['procesos']:>9}{stats['leidas']:>10}{stats['insertadas']:>12}{stats['actualizadas']:>13}"
+          f"{stats['segundos']:>10.1f}{stats['filas_por_segundo']:>12.0f}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rendimiento de la importación desde CSV")
+    parser.add_argument("--rows", type=int, default=100000, help="Filas del CSV (por defecto 100000)")
+    parser.add_argument("--chunk-size", type=int, default=TaskDAO.IMPORT_CHUNK_SIZE, help="Filas por transacción")
+    parser.add_argument("--workers", type=int, default=0, help="Procesos de lectura (0 = uno por núcleo)")
+    parser.add_argument("--repeat-upsert", action="store_true", help="Reimportar en modo 'upsert'")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tareas.csv")
+        start = time.perf_counter()
+        write_csv(path, args.rows)
+        print(f"CSV de {args.rows} filas generado en {time.perf_counter() - start:.1f} s "
+              f"({os.path.getsize(path) / (1024 * 1024):.0f} MB)")
+
+        dao = TaskDAO(os.path.join(directory, "bench.db"))
+        print(f"{'Modo':<8}{'Procesos':>9}{'Leídas':>10}{'Insertadas':>12}{'Actualizadas':>13}{'Segundos':>10}{'Filas/s':>12}")
+        run(dao, path, "skip", args.chunk_size, args.workers)
+        if args.repeat_upsert:
+            run(dao, path, "upsert", args.chunk_size, args.workers)
+        dao.close()
+
+if __name__ == "__main__":
+    main()
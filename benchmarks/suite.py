@@ -0,0 +1,196 @@
+"""
+Suite de benchmarks de los caminos críticos del DAO y de Util, sin interfaz gráfica (no importa Tk).
+Para cada tamaño genera una base con benchmarks.generate_dataset, mide cada operación varias veces y
+emite los percentiles en JSON. Con --baseline compara contra un resultado guardado y termina con
+código 1 si alguna operación empeoró más que la tolerancia, para detectarlo antes de publicar una versión.
+
+Uso:
+    python -m benchmarks.suite [--sizes 1000 10000 100000] [--repeat 50] [--output resultados.json]
+                               [--baseline base.json] [--tolerance 0.5] [--db-dir carpeta]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.generate_dataset import generate_rows
+from dao.task_dao import TaskDAO
+from models.task import Task
+from utils.util import Util
+
+SEED = 42
+SEARCH_QUERIES = ("gonzález", "maria", "1° Grado", "matrícula", "tarde", "núñez díaz")
+# Operaciones muy rápidas: cada muestra es el promedio de un lote de llamadas, para que no sea solo ruido
+FORMAT_DATE_BATCH = 1000
+LOOKUP_BATCH = 100
+PERCENTILES = (50, 90, 95, 99)
+
+def summarize(samples):
+    """Resume los tiempos (en segundos) en milisegundos: percentiles, mínimo, máximo y promedio."""
+    ordered = sorted(samples)
+    cuts = statistics.quantiles(ordered, n=100, method="inclusive") if len(ordered) > 1 else ordered * 99
+    summary = {"n": len(ordered)}
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(cuts[p - 1] * 1000, 4)
+    summary.update(min_ms=round(ordered[0] * 1000, 4), max_ms=round(ordered[-1] * 1000, 4),
+                   mean_ms=round(statistics.fmean(ordered) * 1000, 4))
+    return summary
+
+def timed(func, repeat, batch=1):
+    """Ejecuta func() 'repeat' veces (cada vez un lote de 'batch' llamadas) y devuelve el resumen."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(batch):
+            func()
+        samples.append((time.perf_counter() - start) / batch)
+    return summarize(samples)
+
+def open_database(directory, size):
+    """Abre (o genera, la primera vez) la base de 'size' tareas sintéticas de la carpeta."""
+    path = os.path.join(directory, f"suite_{size}_{SEED}.db")
+    dao = TaskDAO(path)
+    if dao.get_counters()["total"] != size: # tareas_resumen: sin recorrer la tabla
+        dao.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        dao = TaskDAO(path)
+        dao.insert_task_rows(generate_rows(size, seed=SEED), chunk_size=20000)
+    return dao
+
+def run_size(dao, size, repeat, work_dir):
+    """Mide todas las operaciones sobre una base ya cargada. Deja la base como estaba."""
+    rng = random.Random(SEED)
+    results = {}
+    heavy_repeat = max(3, repeat // 10) if size >= 100000 else repeat # Lecturas completas de la tabla
+
+    # Muestra aleatoria de tareas existentes, con la API pública del DAO
+    ids = dao.get_task_ids()
+    sample = [(task.id, task.cedula) for task in dao.get_tasks_by_ids(rng.sample(ids, min(repeat, len(ids))))]
+
+    # insert_task: cédulas de 10 dígitos que no existan; se borran al terminar
+    new_tasks = []
+    candidate = 9999000000
+    while len(new_tasks) < repeat:
+        candidate += 1
+        if not dao.check_cedula_exists(str(candidate)):
+            new_tasks.append(Task(cedula=str(candidate), nombre="Benchmark", apellido="Suite", curso="1° Grado",
+                                  turno="Mañana", accion="Medición", fecha_creacion=Util.now_timestamp()))
+    pending = iter(new_tasks)
+    results["insert_task"] = timed(lambda: dao.insert_task(next(pending)), repeat)
+
+    # update_task: se reescriben tareas existentes con sus mismos datos (los triggers se ejecutan igual)
+    tasks = iter(dao.get_tasks_by_ids([task_id for task_id, _ in sample]))
+    results["update_task"] = timed(lambda: dao.update_task(next(tasks)), min(repeat, len(sample)))
+    for task in new_tasks:
+        dao.delete_task(task.id)
+
+    cedulas = [cedula for _, cedula in sample] + [str(9999000000 + i) for i in range(1, repeat + 1)]
+    results["check_cedula_exists"] = timed(lambda: dao.check_cedula_exists(rng.choice(cedulas)), repeat,
+                                          batch=LOOKUP_BATCH)
+
+    for query in SEARCH_QUERIES: # Calentar la caché de páginas del índice FTS antes de medir
+        dao.search_tasks(query)
+    queries = iter(SEARCH_QUERIES * repeat)
+    results["search_tasks"] = timed(lambda: dao.search_tasks(next(queries)), repeat)
+
+    all_tasks = dao.get_all_tasks()
+    results["get_all_tasks"] = timed(dao.get_all_tasks, heavy_repeat)
+    csv_path = os.path.join(work_dir, "suite_export.csv")
+    results["Util.export_to_csv"] = timed(lambda: Util.export_to_csv(all_tasks, csv_path), heavy_repeat)
+    results["Util.generate_report"] = timed(lambda: Util.generate_report(all_tasks), heavy_repeat)
+
+    dates = [task.fecha_creacion for task in all_tasks[:FORMAT_DATE_BATCH]]
+    positions = iter(range(10 ** 9))
+    results["Util.format_date"] = timed(lambda: Util.format_date(dates[next(positions) % len(dates)]),
+                                        repeat, batch=FORMAT_DATE_BATCH)
+    return results
+
+def compare(results, baseline, tolerance, min_delta_ms=0.05, metric="p50_ms"):
+    """
+    Compara 'metric' de cada operación con la línea base. Devuelve una lista de
+    (tamaño, operación, base, actual, cambio relativo, empeoró). Un cambio menor que 'min_delta_ms'
+    no cuenta como empeoramiento aunque supere la tolerancia (en operaciones de microsegundos es ruido).
+    """
+    rows = []
+    for size, operations in results["results"].items():
+        for name, summary in operations.items():
+            base = baseline.get("results", {}).get(size, {}).get(name)
+            if not base or not base.get(metric):
+                continue
+            change = summary[metric] / base[metric] - 1
+            regressed = change > tolerance and summary[metric] - base[metric] > min_delta_ms
+            rows.append((size, name, base[metric], summary[metric], change, regressed))
+    return rows
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del DAO y de Util, con comparación contra una línea base")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Cantidades de tareas de las bases a probar (por defecto 1000 10000 100000)")
+    parser.add_argument("--repeat", type=int, default=50, help="Muestras por operación (por defecto 50)")
+    parser.add_argument("--output", help="Archivo donde guardar el JSON (por defecto se escribe en la salida estándar)")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior contra el que comparar")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="Empeoramiento relativo de la mediana admitido (por defecto 0.5 = 50%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05,
+                        help="Diferencia mínima en ms para considerar que una operación empeoró (por defecto 0.05)")
+    parser.add_argument("--db-dir", help="Carpeta donde generar y reutilizar las bases (por defecto una temporal)")
+    args = parser.parse_args(argv)
+    if args.repeat < 2:
+        parser.error("--repeat debe ser al menos 2")
+
+    results = {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "plataforma": platform.platform(),
+            "semilla": SEED,
+            "repeticiones": args.repeat,
+        },
+        "results": {},
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_dir = args.db_dir or temp_dir
+        os.makedirs(db_dir, exist_ok=True)
+        for size in args.sizes:
+            print(f"Midiendo {size} tareas...", file=sys.stderr)
+            dao = open_database(db_dir, size)
+            try:
+                results["results"][str(size)] = run_size(dao, size, args.repeat, temp_dir)
+            finally:
+                dao.close()
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.tolerance, args.min_delta_ms)
+        print(f"{'Tareas':>8}  {'Operación':<22}{'Base p50':>12}{'Actual p50':>12}{'Cambio':>9}", file=sys.stderr)
+        for size, name, base, current, change, regressed in rows:
+            print(f"{size:>8}  {name:<22}{base:>9.3f} ms{current:>9.3f} ms{change:>+8.0%}"
+                  + ("  << EMPEORÓ" if regressed else ""), file=sys.stderr)
+        regressions = [row for row in rows if row[5]]
+        if regressions:
+            print(f"{len(regressions)} operaciones empeoraron más de {args.tolerance:.0%}.", file=sys.stderr)
+            return 1
+        print("Sin regresiones respecto a la línea base.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
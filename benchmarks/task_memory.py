@@ -0,0 +1,115 @@
+"""
+Benchmark de memoria e hidratación de tareas: compara la Task original (con __dict__ por instancia,
+creada con argumentos con nombre) contra la Task con __slots__ creada por task_row_factory.
+
+Uso:
+    python -m benchmarks.task_memory [--rows 100000] [--repeat 3]
+"""
+
+import argparse
+import gc
+import sqlite3
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from models.task import task_row_factory
+
+SELECT_SQL = """
+    SELECT id, cedula, nombre, apellido, curso, turno, accion,
+    fecha_creacion, fecha_completado, status FROM tareas
+"""
+
+class LegacyTask:
+    """Copia de la Task anterior (sin __slots__), solo como referencia para el benchmark."""
+
+    def __init__(self, id=None, cedula="", nombre="", apellido="", curso="",
+                 turno="", accion="", fecha_creacion=None, fecha_completado=None,
+                 status="pendiente"):
+        self.id = id
+        self.cedula = cedula
+        self.nombre = nombre
+        self.apellido = apellido
+        self.curso = curso
+        self.turno = turno
+        self.accion = accion
+        self.fecha_creacion = fecha_creacion or datetime.now().strftime("%d/%m/%Y %H:%M")
+        self.fecha_completado = fecha_completado or ""
+        self.status = status
+
+def load_legacy(conn):
+    """Hidratación anterior: tuplas de sqlite3 y luego un LegacyTask por fila."""
+    cursor = conn.cursor()
+    cursor.execute(SELECT_SQL)
+    return [LegacyTask(id=row[0], cedula=row[1], nombre=row[2], apellido=row[3], curso=row[4],
+                       turno=row[5], accion=row[6], fecha_creacion=row[7],
+                       fecha_completado=row[8], status=row[9])
+            for row in cursor.fetchall()]
+
+def load_slots(conn):
+    """Hidratación actual: task_row_factory crea cada Task directamente desde la fila."""
+    cursor = conn.cursor()
+    cursor.row_factory = task_row_factory
+    cursor.execute(SELECT_SQL)
+    return cursor.fetchall()
+
+def create_database(rows):
+    """Crea una base en memoria con 'rows' tareas sintéticas."""
+    conn = sqlite3.connect(":memory:")
+    conn.execute('''
+        CREATE TABLE tareas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, cedula TEXT NOT NULL, nombre TEXT NOT NULL,
+            apellido TEXT NOT NULL, curso TEXT NOT NULL, turno TEXT NOT NULL, accion TEXT,
+            fecha_creacion TEXT NOT NULL, fecha_completado TEXT, status TEXT NOT NULL
+        )
+    ''')
+    conn.executemany(
+        "INSERT INTO tareas (cedula, nombre, apellido, curso, turno, accion, fecha_creacion, fecha_completado, status) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        ((str(1000000 + i), "Nombre", "Apellido", f"{i % 6 + 1}° Año", "Mañana", f"Acción {i % 50}",
+          "2024-03-01 08:00:00", "" if i % 3 else "2024-03-02 09:30:00", "completada" if i % 3 == 0 else "pendiente")
+         for i in range(rows)))
+    conn.commit()
+    return conn
+
+def measure(loader, conn, repeat):
+    """Devuelve (mejor tiempo en segundos, bytes asignados por tarea, bytes del objeto por tarea)."""
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        tasks = loader(conn)
+        best = min(best, time.perf_counter() - start)
+        del tasks
+
+    gc.collect()
+    tracemalloc.start()
+    tasks = loader(conn)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sample = tasks[0]
+    object_size = sys.getsizeof(sample) + (sys.getsizeof(sample.__dict__) if hasattr(sample, "__dict__") else 0)
+    return best, allocated / len(tasks), object_size
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memoria y tiempo de hidratación de tareas")
+    parser.add_argument("--rows", type=int, default=100000, help="Cantidad de tareas (por defecto 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones para medir el tiempo")
+    args = parser.parse_args(argv)
+
+    conn = create_database(args.rows)
+    results = [("Antes (__dict__)", measure(load_legacy, conn, args.repeat)),
+               ("Después (__slots__ + row_factory)", measure(load_slots, conn, args.repeat))]
+    conn.close()
+
+    print(f"{args.rows} tareas")
+    print(f"{'Versión':<36}{'Hidratación':>14}{'Bytes/tarea':>14}{'Objeto':>10}")
+    for label, (seconds, per_task, object_size) in results:
+        print(f"{label:<36}{seconds * 1000:>11.1f} ms{per_task:>14.0f}{object_size:>10}")
+    before, after = results[0][1], results[1][1]
+    print(f"Memoria: {100 * (1 - after[1] / before[1]):.0f}% menos; tiempo: {before[0] / after[0]:.2f}x más rápido")
+
+if __name__ == "__main__":
+    main()
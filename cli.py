@@ -0,0 +1,167 @@
+"""
+Línea de comandos del Gestor de Tareas Estudiantiles, sin interfaz gráfica (no importa tkinter).
+Usa la misma base de datos y las mismas reglas que la aplicación (TaskService), así que sirve
+para scripts y tareas programadas (cron) en un servidor sin pantalla.
+
+Cada comando escribe una línea JSON en la salida estándar: {"ok": true, "comando": ..., ...}
+o {"ok": false, "comando": ..., "error": ...}. El código de salida es 1 si algún comando falló.
+
+Uso:
+    python cli.py add --cedula 1234567 --nombre "María José" --apellido Núñez --curso "1° Grado" --turno Mañana
+    python cli.py update 42 --accion "Traer foto carnet"
+    python cli.py complete 42 43 (con varios ids se aplican todos en una transacción, o ninguno)
+    python cli.py reopen 42
+    python cli.py delete 42
+    python cli.py search "núñez" [--status pendiente] [--limit 20]
+    python cli.py import alumnos.csv [--mode upsert] [--no-resume]
+    python cli.py export tareas.csv
+    python cli.py report [--period week]
+    python cli.py batch < comandos.jsonl
+
+En modo batch cada línea de la entrada es un objeto JSON con "comando" y sus argumentos, p. ej.:
+    {"comando": "add", "cedula": "1234567", "nombre": "Ana", "apellido": "Díaz", "curso": "1° Grado", "turno": "Tarde"}
+    {"comando": "complete", "id": 42}
+    {"comando": "search", "query": "díaz", "status": "pendiente"}
+"""
+
+import argparse
+import json
+import os
+import sys
+from contextlib import redirect_stdout
+
+from dotenv import load_dotenv
+
+from dao.task_dao import TaskDAO
+from services.task_service import TaskService
+from utils.util import Util
+
+_output = sys.stdout # Solo las líneas JSON van aquí; los avisos del DAO (print) se desvían a stderr
+
+def run_command(service, command, args):
+    """Ejecuta un comando con sus argumentos (diccionario) y devuelve el resultado para la línea JSON."""
+    if command == "add":
+        return {"tarea": service.add_task(args).to_dict()}
+    if command == "update":
+        return {"tarea": service.update_task(int(args["id"]), args).to_dict()}
+    if command in ("complete", "reopen", "delete"):
+        ids = [int(task_id) for task_id in (args["id"] if isinstance(args["id"], list) else [args["id"]])]
+        # Todos o ninguno: si falta algún id no se toca nada; si no, una sola transacción
+        tasks = service.get_existing_tasks(ids, "eliminar" if command == "delete" else "cambiar estado")
+        if command == "delete":
+            service.delete_many(ids)
+        else:
+            tasks = service.set_status_many(ids, "completada" if command == "complete" else "pendiente")
+        return {"tareas": [task.to_dict() for task in tasks]}
+    if command == "search":
+        tasks = service.search(args["query"], args.get("status"), args.get("limit"))
+        return {"cantidad": len(tasks), "tareas": [task.to_dict() for task in tasks]}
+    if command == "import":
+        return {"estadisticas": service.import_csv(args["file"], mode=args.get("mode", "skip"),
+                                                   resume=args.get("resume", True), workers=args.get("workers"))}
+    if command == "export":
+        success, message, stats = service.export_csv(args["file"])
+        if not success:
+            raise Exception(message)
+        return {"mensaje": message, "estadisticas": stats}
+    if command == "report":
+        return {"informe": Util.report_to_json(service.report(args.get("period")))}
+    raise ValueError(f"Comando desconocido: '{command}'.")
+
+def emit(command, result=None, error=None, line=None):
+    """Escribe la línea JSON de un comando (en la salida estándar original, ver main)."""
+    output = {"ok": error is None, "comando": command}
+    if line is not None:
+        output["linea"] = line
+    if error is not None:
+        output["error"] = str(error)
+    else:
+        output.update(result)
+    print(json.dumps(output, ensure_ascii=False), file=_output, flush=True)
+
+def run_batch(service, stream):
+    """Ejecuta un comando por cada línea JSON de la entrada. Devuelve True si todos terminaron bien."""
+    all_ok = True
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        command = None
+        try:
+            args = json.loads(line)
+            command = args.pop("comando")
+            if command == "batch":
+                raise ValueError("No se puede anidar 'batch'.")
+            emit(command, run_command(service, command, args), line=line_number)
+        except KeyError as e:
+            all_ok = False
+            emit(command, error=f"Falta el argumento {e}.", line=line_number)
+        except Exception as e:
+            all_ok = False
+            emit(command, error=e if command else f"Línea no válida: {e}", line=line_number)
+    return all_ok
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Gestor de Tareas Estudiantiles (sin interfaz gráfica)")
+    parser.add_argument("--db", default=None, help="Base de datos (por defecto DATABASE_NAME del .env)")
+    commands = parser.add_subparsers(dest="comando", required=True)
+
+    def task_fields(subparser, required):
+        for field in TaskService.EDITABLE_FIELDS:
+            subparser.add_argument(f"--{field}", required=required and field != "accion")
+
+    task_fields(commands.add_parser("add", help="Agregar una tarea pendiente"), required=True)
+    update = commands.add_parser("update", help="Modificar campos de una tarea")
+    update.add_argument("id", type=int)
+    task_fields(update, required=False)
+    for name, help_text in (("complete", "Marcar tareas como completadas"), ("reopen", "Marcar tareas como pendientes"),
+                            ("delete", "Eliminar tareas")):
+        commands.add_parser(name, help=help_text).add_argument("id", type=int, nargs="+")
+    search = commands.add_parser("search", help="Buscar tareas")
+    search.add_argument("query")
+    search.add_argument("--status", choices=TaskService.STATUSES)
+    search.add_argument("--limit", type=int)
+    import_parser = commands.add_parser("import", help="Importar tareas desde un CSV")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--mode", choices=("skip", "upsert"), default="skip",
+                               help="Qué hacer con las cédulas existentes: dejarlas (skip) o actualizarlas (upsert)")
+    import_parser.add_argument("--no-resume", dest="resume", action="store_false",
+                               help="Empezar desde el principio aunque el archivo se haya importado en parte")
+    import_parser.add_argument("--workers", type=int, help="Procesos de lectura (por defecto IMPORT_WORKERS)")
+    commands.add_parser("export", help="Exportar todas las tareas a un CSV").add_argument("file")
+    report = commands.add_parser("report", help="Informe de tareas")
+    report.add_argument("--period", choices=tuple(TaskDAO.REPORT_PERIODS))
+    commands.add_parser("batch", help="Ejecutar comandos JSON (uno por línea) leídos de la entrada estándar")
+    return parser
+
+def main(argv=None):
+    global _output
+    load_dotenv()
+    args = vars(build_parser().parse_args(argv))
+    command = args.pop("comando")
+    db_name = args.pop("db") or os.getenv("DATABASE_NAME", "database.db")
+    _output = sys.stdout
+    with redirect_stdout(sys.stderr):
+        return run(command, args, db_name)
+
+def run(command, args, db_name):
+    """Abre la base de datos, ejecuta el comando (o el lote) y devuelve el código de salida."""
+    try:
+        task_dao = TaskDAO(db_name)
+    except Exception as e:
+        emit(command, error=e)
+        return 1
+    service = TaskService(task_dao)
+    try:
+        if command == "batch":
+            return 0 if run_batch(service, sys.stdin) else 1
+        try:
+            emit(command, run_command(service, command, args))
+            return 0
+        except Exception as e:
+            emit(command, error=e)
+            return 1
+    finally:
+        task_dao.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Ejecutor de llamadas al DAO fuera del hilo de Tk.
+Las lecturas corren en un pool de hilos y las escrituras en un único hilo (en el orden en que se
+enviaron); los resultados vuelven al hilo de Tk mediante root.after.
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+class DAOExecutor:
+    """Ejecuta trabajos del DAO en segundo plano y entrega sus resultados en el hilo de Tk."""
+
+    POLL_MS = 25 # Cada cuánto revisa el hilo de Tk si terminaron trabajos
+
+    def __init__(self, root, on_busy_change=None, read_workers=2):
+        """
+        root: ventana de Tk (para root.after).
+        on_busy_change(busy, description): se llama en el hilo de Tk al empezar/terminar trabajos.
+        """
+        self.root = root
+        self.on_busy_change = on_busy_change
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="dao-lectura")
+        # Un solo hilo de escritura: las escrituras se aplican en orden y nunca compiten entre sí
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dao-escritura")
+        self._done = queue.Queue()
+        self._pending = 0 # Solo se modifica en el hilo de Tk
+        self._poll_id = None
+
+    @property
+    def busy(self):
+        """True si hay trabajos en curso."""
+        return self._pending > 0
+
+    def submit_read(self, fn, on_success=None, on_error=None, description="Cargando..."):
+        """Ejecuta una lectura en el pool de lectores."""
+        return self._submit(self._readers, fn, on_success, on_error, description)
+
+    def submit_write(self, fn, on_success=None, on_error=None, description="Guardando..."):
+        """Ejecuta una escritura en el hilo escritor, detrás de las escrituras enviadas antes."""
+        return self._submit(self._writer, fn, on_success, on_error, description)
+
+    def _submit(self, pool, fn, on_success, on_error, description):
+        """Envía el trabajo al pool y se asegura de que el hilo de Tk revise cuando termine."""
+        self._pending += 1
+        if self.on_busy_change:
+            self.on_busy_change(True, description)
+        future = pool.submit(fn)
+        future.add_done_callback(lambda f: self._done.put((f, on_success, on_error)))
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+        return future
+
+    def _poll(self):
+        """En el hilo de Tk: ejecuta los callbacks de los trabajos terminados."""
+        self._poll_id = None
+        while True:
+            try:
+                future, on_success, on_error = self._done.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            error = future.exception()
+            try:
+                if error is not None:
+                    if on_error:
+                        on_error(error)
+                    else:
+                        print(f"Error en trabajo en segundo plano: {error}")
+                elif on_success:
+                    on_success(future.result())
+            except Exception as e:
+                print(f"Error en callback de trabajo en segundo plano: {e}")
+        if self._pending > 0:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+        elif self.on_busy_change:
+            self.on_busy_change(False, "")
+
+    def shutdown(self):
+        """Espera a que terminen las escrituras pendientes y detiene los hilos."""
+        self._writer.shutdown(wait=True) # No perder escrituras ya enviadas
+        self._readers.shutdown(wait=False)
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
@@ -0,0 +1,118 @@
+"""
+Búsqueda mientras se escribe: espera a que el usuario deje de teclear (debounce), ejecuta la consulta
+en un hilo de fondo y entrega en el hilo de Tk solo el resultado de la búsqueda más reciente.
+"""
+
+import queue
+import threading
+
+class SearchPipeline:
+    """Ejecuta búsquedas con debounce en un hilo de trabajo, descartando las que quedaron obsoletas."""
+
+    POLL_MS = 30 # Cada cuánto revisa el hilo de Tk si llegó un resultado
+
+    def __init__(self, root, search_fn, on_result, on_error, delay_ms=300, interrupt_fn=None):
+        """
+        root: ventana de Tk (para root.after).
+        search_fn: función que recibe la query y devuelve el resultado; corre en el hilo de trabajo.
+        on_result(query, result) / on_error(query, error): se llaman en el hilo de Tk.
+        interrupt_fn: función que recibe el hilo de trabajo y cancela su consulta en curso.
+        """
+        self.root = root
+        self.search_fn = search_fn
+        self.on_result = on_result
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+        self.interrupt_fn = interrupt_fn
+
+        self._generation = 0 # Se incrementa con cada búsqueda; solo la última es válida
+        self._after_id = None
+        self._poll_id = None
+        self._pending = None # (generación, query) esperando al hilo de trabajo
+        self._running = False
+        self._condition = threading.Condition()
+        self._results = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._worker, name="search-worker", daemon=True)
+        self._thread.start()
+
+    def request(self, query, delay_ms=None):
+        """Programa una búsqueda; si llega otra antes de que venza la espera, reemplaza a la anterior."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        delay = self.delay_ms if delay_ms is None else delay_ms
+        self._after_id = self.root.after(delay, lambda: self._dispatch(query))
+
+    def cancel(self):
+        """Descarta la búsqueda programada y cualquier resultado que esté en curso."""
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+            if self._running and self.interrupt_fn:
+                self.interrupt_fn(self._thread)
+
+    def close(self):
+        """Detiene el hilo de trabajo."""
+        self.cancel()
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+
+    def _dispatch(self, query):
+        """Envía la query al hilo de trabajo, interrumpiendo la búsqueda anterior si sigue corriendo."""
+        self._after_id = None
+        with self._condition:
+            self._generation += 1
+            self._pending = (self._generation, query)
+            if self._running and self.interrupt_fn:
+                self.interrupt_fn(self._thread)
+            self._condition.notify()
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+
+    def _worker(self):
+        """Bucle del hilo de trabajo: toma siempre la búsqueda más reciente."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                generation, query = self._pending
+                self._pending = None
+                self._running = True
+            try:
+                result, error = self.search_fn(query), None
+            except Exception as e:
+                result, error = None, e
+            with self._condition:
+                self._running = False
+                # Los resultados obsoletos (o interrumpidos) se descartan sin tocar la UI.
+                # Se encolan con el lock tomado para que _poll no deje de revisar antes de recibirlos.
+                if generation == self._generation:
+                    self._results.put((generation, query, result, error))
+
+    def _poll(self):
+        """En el hilo de Tk: entrega el resultado si es de la última búsqueda."""
+        self._poll_id = None
+        while True:
+            try:
+                generation, query, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if generation != self._generation:
+                continue
+            if error is not None:
+                self.on_error(query, error)
+            else:
+                self.on_result(query, result)
+        with self._condition:
+            busy = self._running or self._pending is not None
+        if busy or not self._results.empty():
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
@@ -11,87 +11,65 @@ import threading
 import time
 
 from dao.task_dao import TaskDAO
-from models.task import Task
+from dao.remote_task_dao import RemoteTaskDAO
+from dao.write_behind import WriteBehindTaskDAO
+from controllers.search_pipeline import SearchPipeline
+from controllers.dao_executor import DAOExecutor
+from services.task_service import TaskService
 from utils.util import Util
 
 class TaskController:
     """Controlador para manejar la lógica entre la UI y el DAO."""
     
+    PROGRESS_INTERVAL = 0.2 # Segundos mínimos entre avisos de progreso a la interfaz
+    
     def __init__(self, app, db_name="database.db"):
         """Inicializa el controlador con referencia a la app y el DAO."""
         self.app = app
-        self.task_dao = TaskDAO(db_name)
-        self.pending_tasks = []
-        self.completed_tasks = []
+        # Con TASK_API_URL la app usa el servidor de tareas (api/server.py) en lugar de abrir la BD
+        api_url = os.getenv("TASK_API_URL", "").strip()
+        if api_url:
+            self.task_dao = RemoteTaskDAO(api_url, token=os.getenv("API_TOKEN", ""))
+        else:
+            # Con WRITE_BEHIND=true las modificaciones y eliminaciones se guardan por lotes (ver dao/write_behind.py)
+            self.task_dao = WriteBehindTaskDAO.from_env(TaskDAO(db_name), on_error=self._on_write_behind_error)
+        self.service = TaskService(self.task_dao) # Reglas de negocio, compartidas con cli.py
+        self.pending_ids = [] # Solo ids: las filas se leen a medida que las vistas las muestran
+        self.completed_ids = []
         self.last_search_query = ""
+        self._ids_query = "" # Búsqueda con la que se obtuvieron pending_ids y completed_ids
         self.auto_refresh_enabled = False
         self.auto_refresh_thread = None
+        self._refresh_stop = threading.Event()
+        self._last_change_seq = 0 # Último cambio de tareas_cambios reflejado en los árboles
+        self._operation_cancel = None # threading.Event de la exportación o importación en curso
+        # Las llamadas al DAO corren fuera del hilo de Tk; las escrituras, en orden y de a una
+        self.executor = DAOExecutor(self.app.root, on_busy_change=self.app.set_busy)
+        # Búsqueda mientras se escribe: con debounce y en un hilo de fondo
+        self.search_pipeline = SearchPipeline(
+            self.app.root,
+            search_fn=self._search_ids,
+            on_result=self._on_search_result,
+            on_error=self._on_search_error,
+            delay_ms=int(os.getenv("SEARCH_DEBOUNCE_MS", "300")),
+            interrupt_fn=self.task_dao.interrupt
+        )
         # Las tareas se cargarán explícitamente desde StudentTaskManager después de crear los widgets
     
-    def load_tasks(self, query=None):
-        """Carga tareas desde la base de datos, opcionalmente filtradas por una query."""
-        try:
-            if query:
-                tasks = self.task_dao.search_tasks(query)
-                self.app.update_status(f"Mostrando resultados para: '{query}'")
-            else:
-                tasks = self.task_dao.get_all_tasks()
-                self.app.update_status(f"Tareas cargadas. Total: {len(tasks)}")
-            
-            self.pending_tasks = [task for task in tasks if task.status == "pendiente"]
-            self.completed_tasks = [task for task in tasks if task.status == "completada"]
-            
-            return True
-        except Exception as e:
-            error_msg = f"Error al cargar tareas: {e}"
-            self.app.update_status(error_msg)
-            messagebox.showerror("Error de Carga", error_msg)
-            return False
+    def reload_tasks(self):
+        """Vuelve a cargar las listas (respetando la búsqueda activa) sin bloquear la interfaz."""
+        self.search_pipeline.request(self.last_search_query, delay_ms=0)
     
     def update_trees(self):
-        """Actualiza los árboles de tareas en la interfaz con las listas locales."""
+        """Actualiza los árboles de tareas en la interfaz con los ids cargados."""
         try:
-            # Limpiar los trees
-            for tree in [self.app.tree_pendientes, self.app.tree_completadas]:
-                for item in tree.get_children():
-                    tree.delete(item)
-            
-            # Insertar tareas pendientes
-            for task in self.pending_tasks:
-                values = (
-                    task.id,
-                    task.cedula,
-                    task.nombre,
-                    task.apellido,
-                    task.curso,
-                    task.turno,
-                    task.accion,
-                    task.fecha_creacion,
-                    task.fecha_completado
-                )
-                self.app.tree_pendientes.insert("", "end", values=values, tags=("pendiente",))
-            
-            # Insertar tareas completadas
-            for task in self.completed_tasks:
-                values = (
-                    task.id,
-                    task.cedula,
-                    task.nombre,
-                    task.apellido,
-                    task.curso,
-                    task.turno,
-                    task.accion,
-                    task.fecha_creacion,
-                    task.fecha_completado
-                )
-                self.app.tree_completadas.insert("", "end", values=values, tags=("completada",))
-            
-            # Configurar colores de las filas según el estado
-            self.app.tree_pendientes.tag_configure("pendiente", foreground="#e74c3c") # Considerar usar colores del tema
-            self.app.tree_completadas.tag_configure("completada", foreground="#27ae60") # Considerar usar colores del tema
+            # Con búsqueda los ids vienen por relevancia, no por id descendente
+            id_ordered = not self._ids_query
+            self.app.pendientes_view.set_ids(self.pending_ids, id_ordered)
+            self.app.completadas_view.set_ids(self.completed_ids, id_ordered)
             
             # Actualizar contadores en la barra de estado
-            self.app.update_status(f"Pendientes: {len(self.pending_tasks)}, Completadas: {len(self.completed_tasks)}")
+            self.app.update_status(self._counts_message())
             
             return True
         except Exception as e:
@@ -100,285 +78,509 @@ class TaskController:
             messagebox.showerror("Error de UI", error_msg)
             return False
     
-    def add_task(self):
-        """Añade una nueva tarea a la base de datos."""
+    def _counts_message(self):
+        """Texto con la cantidad de tareas mostradas en cada vista."""
+        return f"Pendientes: {len(self.app.pendientes_view)}, Completadas: {len(self.app.completadas_view)}"
+    
+    def apply_task_change(self, task, matches_search=True):
+        """
+        Refleja en los árboles el alta o modificación de una tarea con el cambio mínimo:
+        insertar una fila, actualizar sus valores o moverla entre pendientes y completadas.
+        matches_search indica si la tarea coincide con la búsqueda activa; se calcula antes, en el
+        hilo de trabajo (_matches_search), porque aquí estamos en el hilo de Tk.
+        """
+        if task.status == "pendiente":
+            target_view, other_view = self.app.pendientes_view, self.app.completadas_view
+        else:
+            target_view, other_view = self.app.completadas_view, self.app.pendientes_view
+        
+        other_view.remove_task(task.id)
+        if not matches_search:
+            # Con una búsqueda activa, la tarea solo se muestra si sigue coincidiendo
+            target_view.remove_task(task.id)
+        elif task.id in target_view:
+            target_view.update_task(task)
+        else:
+            target_view.insert_task(task)
+    
+    def apply_task_removal(self, task_id):
+        """Quita una tarea eliminada de los árboles sin reconstruirlos."""
+        self.app.pendientes_view.remove_task(task_id)
+        self.app.completadas_view.remove_task(task_id)
+    
+    def apply_task_changes(self, tasks, matching_ids=None):
+        """
+        Como apply_task_change, para muchas tareas a la vez: cada árbol se redibuja una sola vez.
+        matching_ids es el conjunto de ids que coinciden con la búsqueda activa (None = todas).
+        """
+        for view, status in ((self.app.pendientes_view, "pendiente"), (self.app.completadas_view, "completada")):
+            shown = [task for task in tasks if task.status == status and (matching_ids is None or task.id in matching_ids)]
+            shown_ids = {task.id for task in shown}
+            view.remove_tasks(task.id for task in tasks if task.id not in shown_ids)
+            view.insert_tasks(shown)
+    
+    def apply_task_removals(self, task_ids):
+        """Quita varias tareas eliminadas de los árboles con un solo redibujado por árbol."""
+        self.app.pendientes_view.remove_tasks(task_ids)
+        self.app.completadas_view.remove_tasks(task_ids)
+    
+    def _matching_ids(self, tasks):
+        """Ids de las tareas que deben verse con la búsqueda activa (None si no hay búsqueda)."""
+        if not self.last_search_query:
+            return None
+        return {task.id for task in tasks if self._matches_search(task)}
+    
+    def _matches_search(self, task):
+        """Indica si la tarea debe verse con la búsqueda activa (se llama desde el hilo de trabajo)."""
+        query = self.last_search_query
+        return not query or self.task_dao.task_matches_query(task.id, query)
+    
+    def _on_write_behind_error(self, error):
+        """Una escritura diferida no se pudo guardar (se llama desde el hilo que guarda)."""
+        def show():
+            self.app.update_status(f"No se pudo guardar un cambio: {error}")
+            messagebox.showerror("Error al Guardar", f"No se pudo guardar un cambio; las listas se recargarán.\n\n{error}")
+            self.reload_tasks()
         try:
-            # Validar los campos
-            if not self.app.validate_fields():
-                return False
-                
-            cedula = self.app.cédula.get()
-            
-            # Verificar si la cédula ya existe
-            if self.task_dao.check_cedula_exists(cedula):
-                messagebox.showerror("Error de Duplicado", "Ya existe un estudiante con esa cédula")
-                return False
-                
-            # Crear nueva tarea
-            task = Task(
-                cedula=cedula,
-                nombre=self.app.nombre.get(),
-                apellido=self.app.apellido.get(),
-                curso=self.app.curso_grado.get(),
-                turno=self.app.turno.get(),
-                accion=self.app.accion_pendiente_entry.get()
-            )
-            
-            # Insertar la tarea
-            self.task_dao.insert_task(task)
+            self.app.root.after(0, show)
+        except RuntimeError:
+            print(f"No se pudo guardar un cambio: {error}") # La ventana ya se cerró
+    
+    def _read_form(self):
+        """Lee los campos del formulario (solo desde el hilo de Tk)."""
+        return {
+            "cedula": self.app.cédula.get(),
+            "nombre": self.app.nombre.get(),
+            "apellido": self.app.apellido.get(),
+            "curso": self.app.curso_grado.get(),
+            "turno": self.app.turno.get(),
+            "accion": self.app.accion_pendiente_entry.get()
+        }
+    
+    def _show_action_error(self, error, title, prefix):
+        """Muestra en el hilo de Tk el error de una acción ejecutada en segundo plano."""
+        if isinstance(error, ValueError): # Cédula duplicada
+            self.app.update_status(str(error))
+            messagebox.showerror("Error de Duplicado", str(error))
+        elif isinstance(error, LookupError): # La tarea ya no existe
+            self.app.update_status(str(error))
+            messagebox.showerror("Error", str(error))
+        else:
+            error_msg = f"{prefix}: {error}"
+            self.app.update_status(error_msg)
+            messagebox.showerror(title, error_msg)
+    
+    def add_task(self):
+        """Añade una nueva tarea a la base de datos (la escritura corre en segundo plano)."""
+        # Validar los campos
+        if not self.app.validate_fields():
+            return False
             
-            # Recargar tareas y actualizar la interfaz
-            self.load_tasks() # Recargar todas las tareas
-            self.update_trees()
+        # Los widgets solo se leen en el hilo de Tk
+        form = self._read_form()
+        
+        def work():
+            # Valida, verifica que la cédula no exista e inserta la tarea
+            task = self.service.add_task(form)
+            return task, self._matches_search(task)
+        
+        def on_success(result):
+            task, matches_search = result
+            # Actualizar solo la fila nueva en la interfaz
+            self.apply_task_change(task, matches_search)
             self.app.clear_fields()
             self.app.update_status(f"Tarea agregada: {task.nombre} {task.apellido}")
             messagebox.showinfo("Éxito", "Tarea agregada correctamente")
-            
-            return True
-        except Exception as e:
-            error_msg = f"Error al agregar tarea: {e}"
-            self.app.update_status(error_msg)
-            messagebox.showerror("Error de Adición", error_msg)
-            return False
+        
+        self.executor.submit_write(work, on_success,
+                                   lambda e: self._show_action_error(e, "Error de Adición", "Error al agregar tarea"),
+                                   description="Guardando tarea...")
+        return True
     
     def update_task(self):
-        """Actualiza una tarea existente."""
-        try:
-            # Validar los campos
-            if not self.app.validate_fields():
-                return False
-            
-            if self.app.current_index is None:
-                messagebox.showerror("Error de Selección", "No hay tarea seleccionada para actualizar")
-                return False
-                
-            if not self.app.editing_mode:
-                # Esto no debería ocurrir si la UI está bien gestionada
-                messagebox.showwarning("Modo incorrecto", "Debe estar en modo edición para actualizar.")
-                return False
-            
-            # Buscar la tarea actual (usar DAO para asegurar datos frescos)
-            task = self.task_dao.get_task_by_id(self.app.current_index)
-            if not task:
-                messagebox.showerror("Error", f"No se encontró la tarea con ID {self.app.current_index} para actualizar.")
-                return False
-            
-            # Verificar si la cédula ya existe (pero no es la misma tarea)
-            cedula = self.app.cédula.get()
-            if cedula != task.cedula and self.task_dao.check_cedula_exists(cedula, task.id):
-                messagebox.showerror("Error de Duplicado", "Ya existe otro estudiante con esa cédula")
-                return False
-                
-            # Actualizar los datos del objeto task
-            task.cedula = cedula
-            task.nombre = self.app.nombre.get()
-            task.apellido = self.app.apellido.get()
-            task.curso = self.app.curso_grado.get()
-            task.turno = self.app.turno.get()
-            task.accion = self.app.accion_pendiente_entry.get()
-            
-            # Actualizar la tarea en la BD
-            self.task_dao.update_task(task)
+        """Actualiza una tarea existente (la escritura corre en segundo plano)."""
+        # Validar los campos
+        if not self.app.validate_fields():
+            return False
+        
+        if self.app.current_index is None:
+            messagebox.showerror("Error de Selección", "No hay tarea seleccionada para actualizar")
+            return False
             
-            # Recargar tareas y actualizar la interfaz
-            self.load_tasks() # Recargar todas las tareas
-            self.update_trees()
+        if not self.app.editing_mode:
+            # Esto no debería ocurrir si la UI está bien gestionada
+            messagebox.showwarning("Modo incorrecto", "Debe estar en modo edición para actualizar.")
+            return False
+        
+        task_id = self.app.current_index
+        form = self._read_form()
+        
+        def work():
+            # Relee la tarea (datos frescos), verifica la cédula y guarda los cambios
+            task = self.service.update_task(task_id, form)
+            return task, self._matches_search(task)
+        
+        def on_success(result):
+            task, matches_search = result
+            # Actualizar solo la fila modificada en la interfaz
+            self.apply_task_change(task, matches_search)
             self.app.clear_fields()
             self.app.toggle_edit_mode(False)
             self.app.update_status(f"Tarea actualizada: {task.nombre} {task.apellido}")
             messagebox.showinfo("Éxito", "Tarea actualizada correctamente")
-            
-            return True
-        except Exception as e:
-            error_msg = f"Error al actualizar tarea: {e}"
-            self.app.update_status(error_msg)
-            messagebox.showerror("Error de Actualización", error_msg)
-            return False
+        
+        self.executor.submit_write(work, on_success,
+                                   lambda e: self._show_action_error(e, "Error de Actualización", "Error al actualizar tarea"),
+                                   description="Actualizando tarea...")
+        return True
     
     def toggle_task_status(self, new_status):
-        """Cambia el estado de una tarea entre pendiente y completada."""
-        try:
-            # Selecciona el tree correcto según la acción
-            if new_status == "completada":
-                selected_tree = self.app.tree_pendientes
-                status_msg_user = "completada"
-            else:
-                selected_tree = self.app.tree_completadas
-                status_msg_user = "pendiente"
-            
-            selected_item = selected_tree.selection()
-            
-            if not selected_item:
-                messagebox.showwarning("Advertencia", "Seleccione un registro primero para cambiar su estado.")
-                return False
-                
-            # Confirmación
-            confirmacion = messagebox.askyesno(
-                "Confirmar Cambio de Estado", 
-                f"¿Está seguro que desea marcar esta tarea como {status_msg_user}?"
-            )
-            if not confirmacion:
-                return False
-                
-            item_values = selected_tree.item(selected_item)['values']
-            task_id = item_values[0]
-            
-            # Obtener la tarea
-            task = self.task_dao.get_task_by_id(task_id)
-            if not task:
-                messagebox.showerror("Error", f"No se encontró la tarea con ID {task_id} para cambiar estado.")
-                return False
-                
-            # Actualizar estado
-            if new_status == "completada":
-                task.mark_as_completed()
-            else:
-                task.mark_as_pending()
-                
-            # Guardar cambios
-            self.task_dao.update_task(task)
-            
-            # Recargar y actualizar interfaz
-            self.load_tasks()
-            self.update_trees()
-            self.app.update_status(f"Tarea marcada como {status_msg_user} correctamente")
-            messagebox.showinfo("Estado Actualizado", f"Estado de la tarea actualizado a {new_status.capitalize()}.")
+        """Cambia el estado de las tareas seleccionadas entre pendiente y completada (todas juntas)."""
+        # Selecciona la vista correcta según la acción
+        if new_status == "completada":
+            selected_view = self.app.pendientes_view
+            status_msg_user = "completada"
+        else:
+            selected_view = self.app.completadas_view
+            status_msg_user = "pendiente"
+        
+        selected_ids = selected_view.get_selected_ids()
+        
+        if not selected_ids:
+            messagebox.showwarning("Advertencia", "Seleccione un registro primero para cambiar su estado.")
+            return False
             
-            return True
-        except Exception as e:
-            error_msg = f"Error al cambiar estado: {e}"
-            self.app.update_status(error_msg)
-            messagebox.showerror("Error de Estado", error_msg)
+        # Una sola confirmación para toda la selección
+        if len(selected_ids) == 1:
+            question = f"¿Está seguro que desea marcar esta tarea como {status_msg_user}?"
+        else:
+            question = f"¿Está seguro que desea marcar las {len(selected_ids)} tareas seleccionadas como {status_msg_user}?"
+        confirmacion = messagebox.askyesno("Confirmar Cambio de Estado", question)
+        if not confirmacion:
             return False
+        
+        def work():
+            # Un solo UPDATE (executemany) en una transacción para todas las tareas
+            tasks = self.service.set_status_many(selected_ids, new_status)
+            return tasks, self._matching_ids(tasks)
+        
+        def on_success(result):
+            tasks, matching_ids = result
+            # Mover las filas al árbol del nuevo estado, redibujando una sola vez
+            self.apply_task_changes(tasks, matching_ids)
+            if len(tasks) == 1:
+                self.app.update_status(f"Tarea marcada como {status_msg_user} correctamente")
+                messagebox.showinfo("Estado Actualizado", f"Estado de la tarea actualizado a {new_status.capitalize()}.")
+            else:
+                self.app.update_status(f"{len(tasks)} tareas marcadas como {status_msg_user} correctamente")
+                messagebox.showinfo("Estado Actualizado", f"{len(tasks)} tareas actualizadas a {new_status.capitalize()}.")
+        
+        self.executor.submit_write(work, on_success,
+                                   lambda e: self._show_action_error(e, "Error de Estado", "Error al cambiar estado"),
+                                   description="Cambiando estado...")
+        return True
     
     def delete_task(self):
-        """Elimina una tarea seleccionada."""
-        try:
-            # Determinar pestaña activa para saber qué tree usar
-            if self.app.current_tab == "pendientes":
-                selected_tree = self.app.tree_pendientes
-            else:
-                selected_tree = self.app.tree_completadas
-                
-            selected_item = selected_tree.selection()
-            
-            if not selected_item:
+        """Elimina las tareas seleccionadas (todas juntas, en una transacción)."""
+        # Determinar pestaña activa para saber qué vista usar
+        if self.app.current_tab == "pendientes":
+            selected_view = self.app.pendientes_view
+        else:
+            selected_view = self.app.completadas_view
+        
+        selected_ids = selected_view.get_selected_ids()
+        if not selected_ids:
+            messagebox.showwarning("Advertencia", "Seleccione un registro primero para eliminar.")
+            return False
+        
+        if len(selected_ids) == 1:
+            selected_task = selected_view.cached_task(selected_ids[0])
+            if selected_task is None:
+                # La fila no está en memoria: leerla en segundo plano antes de pedir confirmación
+                self.executor.submit_read(
+                    lambda: self.task_dao.get_task_by_id(selected_ids[0]),
+                    lambda task: self._confirm_delete(selected_ids, task),
+                    lambda e: self._show_action_error(e, "Error de Eliminación", "Error al eliminar tarea"),
+                    description="Cargando tarea...")
+                return True
+            return self._confirm_delete(selected_ids, selected_task)
+        return self._confirm_delete(selected_ids)
+    
+    def _confirm_delete(self, selected_ids, selected_task=None):
+        """Pide confirmación y elimina las tareas (selected_task: la única seleccionada, para el mensaje)."""
+        if len(selected_ids) == 1:
+            if not selected_task:
                 messagebox.showwarning("Advertencia", "Seleccione un registro primero para eliminar.")
                 return False
-                
-            # Confirmación
-            confirmacion = messagebox.askyesno(
-                "Confirmar Eliminación", 
-                "¿Está seguro que desea eliminar esta tarea? Esta acción no se puede deshacer."
-            )
-            if not confirmacion:
-                return False
-                
-            item_values = selected_tree.item(selected_item)['values']
-            task_id = item_values[0]
-            student_name = f"{item_values[2]} {item_values[3]}"
-            
-            # Eliminar la tarea
-            self.task_dao.delete_task(task_id)
+            description = f"Tarea para {selected_task.nombre} {selected_task.apellido}"
+            question = "¿Está seguro que desea eliminar esta tarea? Esta acción no se puede deshacer."
+        else:
+            description = f"{len(selected_ids)} tareas"
+            question = (f"¿Está seguro que desea eliminar las {len(selected_ids)} tareas seleccionadas? "
+                        "Esta acción no se puede deshacer.")
             
-            # Recargar y actualizar interfaz
-            self.load_tasks()
-            self.update_trees()
+        # Confirmación
+        confirmacion = messagebox.askyesno("Confirmar Eliminación", question)
+        if not confirmacion:
+            return False
+        
+        def on_success(result):
+            # Quitar solo esas filas de la interfaz
+            self.apply_task_removals(selected_ids)
             self.app.clear_fields()
             self.app.toggle_edit_mode(False)
-            self.app.update_status(f"Tarea para {student_name} eliminada.")
-            messagebox.showinfo("Eliminado", f"Tarea para {student_name} eliminada correctamente.")
-            
-            return True
-        except Exception as e:
-            error_msg = f"Error al eliminar tarea: {e}"
-            self.app.update_status(error_msg)
-            messagebox.showerror("Error de Eliminación", error_msg)
-            return False
+            self.app.update_status(f"{description} eliminada{'s' if len(selected_ids) > 1 else ''}.")
+            messagebox.showinfo("Eliminado", f"{description} eliminada{'s' if len(selected_ids) > 1 else ''} correctamente.")
+        
+        # Eliminar las tareas (un solo DELETE con executemany)
+        self.executor.submit_write(lambda: self.service.delete_many(selected_ids), on_success,
+                                   lambda e: self._show_action_error(e, "Error de Eliminación", "Error al eliminar tarea"),
+                                   description="Eliminando tareas..." if len(selected_ids) > 1 else "Eliminando tarea...")
+        return True
     
     def search_tasks(self, query=None):
-        """Busca tareas y actualiza la vista. Si la query es None o vacía, carga todas las tareas."""
-        try:
-            if query is None: # Si se llama desde el botón de búsqueda
-                query = self.app.search_entry.get().strip().lower()
-            
-            self.last_search_query = query # Guardar para posible re-búsqueda o refresh
-            
-            if not query: # Si la query está vacía, cargar todo
-                self.load_tasks() # Carga todas las tareas
-            else:
-                self.load_tasks(query=query) # Carga tareas filtradas
-            
-            self.update_trees() # Actualiza los árboles con las tareas cargadas (filtradas o todas)
-            
-            if query:
-                self.app.update_status(f"Mostrando {len(self.pending_tasks) + len(self.completed_tasks)} resultados para: '{query}'")
-            else:
-                self.app.update_status(f"Mostrando todas las tareas. Pendientes: {len(self.pending_tasks)}, Completadas: {len(self.completed_tasks)}")
-            return True
-        except Exception as e:
-            error_msg = f"Error durante la búsqueda: {e}"
-            self.app.update_status(error_msg)
-            messagebox.showerror("Error de Búsqueda", error_msg)
-            # En caso de error de búsqueda, intentar cargar todas las tareas como fallback
-            self.load_tasks()
-            self.update_trees()
-            return False
+        """
+        Busca tareas y actualiza la vista. Si la query es None se toma del campo de búsqueda;
+        si está vacía se muestran todas las tareas. La consulta corre en segundo plano.
+        """
+        if query is None: # Si se llama desde el botón de búsqueda
+            query = self.app.search_entry.get().strip().lower()
+        self.app.update_status(f"Buscando '{query}'..." if query else "Cargando todas las tareas...")
+        self.search_pipeline.request(query, delay_ms=0)
+        return True
+    
+    def on_search_key(self, event=None):
+        """Búsqueda mientras se escribe: se ejecuta cuando el usuario deja de teclear."""
+        self.search_pipeline.request(self.app.search_entry.get().strip().lower())
+    
+    def _search_ids(self, query):
+        """
+        Se ejecuta en el hilo de búsqueda: obtiene los ids de cada estado para la query, junto con
+        el número del último cambio registrado (leído antes, para no perder cambios concurrentes)
+        y el total de tareas de la BD (de tareas_resumen, sin contar filas).
+        """
+        change_seq = self.task_dao.get_last_change_seq()
+        return (self.task_dao.get_task_ids("pendiente", query or None),
+                self.task_dao.get_task_ids("completada", query or None),
+                change_seq,
+                self.task_dao.get_counters()["total"] if query else None)
+    
+    def _on_search_result(self, query, result):
+        """En el hilo de Tk: muestra el resultado de la búsqueda más reciente."""
+        self.last_search_query = query # Guardar para posible re-búsqueda o refresh
+        self.pending_ids, self.completed_ids, self._last_change_seq, total = result
+        self._ids_query = query
+        self.update_trees() # Actualiza los árboles con los ids cargados (filtrados o todos)
+        
+        if query:
+            self.app.update_status(f"Mostrando {len(self.pending_ids) + len(self.completed_ids)} de {total} tareas para: '{query}'")
+        else:
+            self.app.update_status(f"Mostrando todas las tareas. Pendientes: {len(self.pending_ids)}, Completadas: {len(self.completed_ids)}")
+    
+    def _on_search_error(self, query, error):
+        """En el hilo de Tk: informa el error y vuelve a mostrar todas las tareas."""
+        error_msg = f"Error durante la búsqueda: {error}"
+        self.app.update_status(error_msg)
+        messagebox.showerror("Error de Búsqueda", error_msg)
+        # En caso de error de búsqueda, intentar cargar todas las tareas como fallback
+        self.last_search_query = ""
+        if query:
+            self.search_pipeline.request("", delay_ms=0)
     
     def clear_search(self):
         """Limpia el campo de búsqueda y muestra todos los registros."""
+        self.search_pipeline.cancel() # Que una búsqueda en curso no pise el listado completo
         self.last_search_query = ""
         self.app.search_entry.delete(0, tk.END)
-        self.update_trees()
+        self.search_pipeline.request("", delay_ms=0) # Volver a cargar todas las tareas (las listas actuales están filtradas)
         self.app.update_status("Búsqueda limpiada. Mostrando todos los registros.")
         return True
         
     def export_tasks_to_csv(self):
-        """Exporta las tareas a un archivo CSV."""
-        try:
-            # Preguntar dónde guardar el archivo
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                title="Guardar como CSV"
-            )
-            
-            if not filename:
-                return False  # Usuario canceló
-                
-            # Cargar todas las tareas
-            tasks = self.task_dao.get_all_tasks()
-            
-            # Exportar a CSV
-            if Util.export_to_csv(tasks, filename):
-                self.app.update_status(f"Datos exportados correctamente a {filename}")
+        """
+        Exporta las tareas a un archivo CSV en segundo plano, leyendo y escribiendo por bloques
+        (la memoria no crece con la cantidad de tareas). Muestra el progreso y se puede cancelar.
+        """
+        if self._operation_cancel is not None:
+            messagebox.showwarning("Operación en curso", "Espere a que termine la operación en curso.")
+            return False
+        
+        # Preguntar dónde guardar el archivo
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Guardar como CSV"
+        )
+        
+        if not filename:
+            return False  # Usuario canceló
+        
+        cancel_event = threading.Event()
+        self._operation_cancel = cancel_event
+        self.app.set_cancel_action(cancel_event.set)
+        last_report = [0.0]
+        
+        def on_progress(rows, total):
+            # Se llama en el hilo de lectura: limitar los avisos a la interfaz a unos pocos por segundo
+            now = time.monotonic()
+            if now - last_report[0] >= self.PROGRESS_INTERVAL:
+                last_report[0] = now
+                self.app.root.after(0, lambda: self._show_export_progress(cancel_event, rows, total))
+        
+        def finish():
+            self._operation_cancel = None
+            self.app.set_cancel_action(None)
+            self.app.set_progress(None)
+        
+        def on_success(result):
+            finish()
+            success, message, stats = result
+            if success:
+                self.app.update_status(f"{message} ({stats['segundos']:.1f} s, {stats['filas_por_segundo']:.0f} filas/s)")
                 messagebox.showinfo("Éxito", f"Datos exportados correctamente a {filename}")
-                return True
+            elif stats["cancelado"]:
+                self.app.update_status(message)
             else:
-                raise Exception("Error al exportar datos")
-                
-        except Exception as e:
+                on_error(message)
+        
+        def on_error(e):
+            finish()
             self.app.update_status(f"Error al exportar: {e}")
             messagebox.showerror("Error", f"Error al exportar datos: {e}")
+        
+        self.executor.submit_read(lambda: self.service.export_csv(filename, on_progress, cancel_event),
+                                  on_success, on_error, description="Exportando a CSV...")
+        return True
+    
+    def import_tasks_from_csv(self):
+        """
+        Importa tareas desde un CSV en segundo plano, por bloques (cada uno en su propia transacción).
+        Si una importación anterior del mismo archivo quedó a medias, ofrece continuarla.
+        """
+        if self._operation_cancel is not None:
+            messagebox.showwarning("Operación en curso", "Espere a que termine la operación en curso.")
             return False
+        
+        filename = filedialog.askopenfilename(
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Importar desde CSV"
+        )
+        if not filename:
+            return False  # Usuario canceló
+        
+        # El punto de reanudación se lee en segundo plano; la importación sigue en _start_import
+        self.executor.submit_read(lambda: self.task_dao.get_import_checkpoint(filename),
+                                  lambda checkpoint: self._start_import(filename, checkpoint),
+                                  lambda e: messagebox.showerror("Error", str(e)),
+                                  description="Revisando importaciones anteriores...")
+        return True
+    
+    def _start_import(self, filename, checkpoint):
+        """En el hilo de Tk: pregunta cómo importar el archivo y lanza la importación en segundo plano."""
+        if self._operation_cancel is not None:
+            messagebox.showwarning("Operación en curso", "Espere a que termine la operación en curso.")
+            return False
+        resume = False
+        if checkpoint:
+            resume = messagebox.askyesno(
+                "Reanudar importación",
+                f"Este archivo ya se importó parcialmente ({checkpoint} filas).\n¿Continuar desde donde quedó?"
+            )
+        update = messagebox.askyesnocancel(
+            "Cédulas existentes",
+            "Si una cédula del archivo ya existe:\n\nSí: actualizar la tarea con los datos del archivo\nNo: dejarla como está"
+        )
+        if update is None:
+            return False
+        
+        cancel_event = threading.Event()
+        self._operation_cancel = cancel_event # Una sola operación larga cancelable a la vez
+        self.app.set_cancel_action(cancel_event.set)
+        last_report = [0.0]
+        
+        def on_progress(rows, fraction):
+            now = time.monotonic()
+            if now - last_report[0] >= self.PROGRESS_INTERVAL:
+                last_report[0] = now
+                self.app.root.after(0, lambda: self._show_import_progress(cancel_event, rows, fraction))
+        
+        def finish():
+            self._operation_cancel = None
+            self.app.set_cancel_action(None)
+            self.app.set_progress(None)
+            self.reload_tasks()
+        
+        def on_success(stats):
+            finish()
+            summary = (f"{stats['insertadas']} nuevas, {stats['actualizadas']} actualizadas, "
+                       f"{stats['omitidas']} omitidas, {stats['rechazadas']} rechazadas")
+            speed = f"{stats['leidas']} filas en {stats['segundos']:.1f} s ({stats['filas_por_segundo']:.0f} filas/s)"
+            if stats["cancelado"]:
+                self.app.update_status(f"Importación detenida ({summary}). Se puede reanudar importando el mismo archivo.")
+                return
+            self.app.update_status(f"Importación terminada: {summary}. {speed}")
+            detail = f"Importación terminada.\n\n{summary}.\n{speed}."
+            if stats["archivo_rechazos"]:
+                detail += f"\n\nLas filas rechazadas y su motivo están en:\n{stats['archivo_rechazos']}"
+            messagebox.showinfo("Importación", detail)
+        
+        def on_error(e):
+            finish()
+            self.app.update_status(f"Error al importar: {e}")
+            messagebox.showerror("Error", f"Error al importar datos: {e}")
+        
+        self.executor.submit_write(
+            lambda: self.service.import_csv(filename, mode="upsert" if update else "skip", resume=resume,
+                                            on_progress=on_progress, cancel_event=cancel_event),
+            on_success, on_error, description="Importando desde CSV..."
+        )
+        return True
+    
+    def _show_import_progress(self, cancel_event, rows, fraction):
+        """En el hilo de Tk: muestra el avance de la importación en la barra de estado."""
+        if self._operation_cancel is not cancel_event or cancel_event.is_set():
+            return
+        self.app.set_progress(fraction)
+        self.app.update_status(f"Importando desde CSV: {rows} filas ({int(fraction * 100)}%)")
+    
+    def _show_export_progress(self, cancel_event, rows, total):
+        """En el hilo de Tk: muestra el avance de la exportación en la barra de estado."""
+        if self._operation_cancel is not cancel_event or cancel_event.is_set():
+            return # La exportación ya terminó o fue cancelada
+        if total:
+            self.app.set_progress(rows / total)
+            self.app.update_status(f"Exportando a CSV: {rows} de {total} tareas ({rows * 100 // total}%)")
+        else:
+            self.app.update_status(f"Exportando a CSV: {rows} tareas")
             
     def generate_and_show_report(self):
-        """Genera y muestra un informe de tareas."""
+        """Genera el informe de tareas en segundo plano y lo muestra al terminar."""
+        def on_error(e):
+            self.app.update_status(f"Error al generar informe: {e}")
+            messagebox.showerror("Error", f"Error al generar informe: {e}")
+        
+        # Los conteos se calculan con GROUP BY en SQLite: no se cargan tareas en memoria
+        self.executor.submit_read(self.service.report, self.show_report, on_error, description="Generando informe...")
+        return True
+    
+    def show_report(self, report):
+        """Muestra un informe ya calculado en una ventana nueva."""
         try:
-            tasks = self.task_dao.get_all_tasks()
-            report = Util.generate_report(tasks)
-            
             # Crear ventana para mostrar el informe
             report_window = tk.Toplevel(self.app.root)
             report_window.title("Informe de Tareas")
-            report_window.geometry("500x400")
+            report_window.geometry("600x450")
             
             # Agregar contenido
             ttk.Label(report_window, text="INFORME DE TAREAS", 
                      font=("Segoe UI", 16, "bold")).pack(pady=10)
             
-            frame = ttk.Frame(report_window)
-            frame.pack(fill="both", expand=True, padx=20, pady=10)
+            notebook = ttk.Notebook(report_window)
+            notebook.pack(fill="both", expand=True, padx=20, pady=10)
+            
+            # Resumen: totales y distribución por curso y por turno
+            frame = ttk.Frame(notebook)
+            notebook.add(frame, text="Resumen")
             
             # Datos generales
             ttk.Label(frame, text=f"Total de tareas: {report['total']}", 
@@ -391,24 +593,23 @@ class TaskController:
             # Divider
             ttk.Separator(frame, orient="horizontal").pack(fill="x", pady=10)
             
-            # Distribución por curso
-            ttk.Label(frame, text="Distribución por curso:", 
-                     font=("Segoe UI", 12, "bold")).pack(anchor="w", pady=5)
-            
-            for curso, cantidad in report["por_curso"].items():
-                ttk.Label(frame, text=f"- {curso}: {cantidad} tareas", 
-                         font=("Segoe UI", 10)).pack(anchor="w", padx=20)
+            self._report_table(frame, ("Curso", "Tareas"), report["por_curso"].items())
+            self._report_table(frame, ("Turno", "Tareas"), report["por_turno"].items())
             
-            # Divider
-            ttk.Separator(frame, orient="horizontal").pack(fill="x", pady=10)
+            # Cruce curso × turno × estado
+            frame = ttk.Frame(notebook)
+            notebook.add(frame, text="Curso × turno")
+            self._report_table(frame, ("Curso", "Turno", "Pendientes", "Completadas", "Total"),
+                               ((curso, turno, cell.get("pendiente", 0), cell.get("completada", 0), sum(cell.values()))
+                                for (curso, turno), cell in report.get("por_curso_turno", {}).items()))
             
-            # Distribución por turno
-            ttk.Label(frame, text="Distribución por turno:", 
-                     font=("Segoe UI", 12, "bold")).pack(anchor="w", pady=5)
-            
-            for turno, cantidad in report["por_turno"].items():
-                ttk.Label(frame, text=f"- {turno}: {cantidad} tareas", 
-                         font=("Segoe UI", 10)).pack(anchor="w", padx=20)
+            # Tareas creadas y completadas por periodo
+            frame = ttk.Frame(notebook)
+            period_names = {"day": "Por día", "week": "Por semana", "month": "Por mes", "year": "Por año"}
+            notebook.add(frame, text=period_names.get(report.get("periodo"), "Por periodo"))
+            self._report_table(frame, ("Periodo", "Creadas", "Completadas"),
+                               ((periodo, counts["creadas"], counts["completadas"])
+                                for periodo, counts in report.get("por_periodo", {}).items()))
             
             # Botón para cerrar
             ttk.Button(report_window, text="Cerrar", command=report_window.destroy).pack(pady=10)
@@ -418,46 +619,215 @@ class TaskController:
             self.app.update_status(f"Error al generar informe: {e}")
             messagebox.showerror("Error", f"Error al generar informe: {e}")
             return False
-            
-    def toggle_auto_refresh(self, interval=30):
-        """Activa o desactiva la actualización automática."""
+    
+    def verify_counters(self):
+        """Verifica en segundo plano los totales de tareas_resumen y ofrece reconstruirlos si no coinciden."""
+        def on_error(e):
+            self.app.update_status(f"Error al verificar totales: {e}")
+            messagebox.showerror("Error", f"Error al verificar totales: {e}")
+        
+        def on_verified(drift):
+            if not drift:
+                self.app.update_status("Totales verificados: sin diferencias.")
+                messagebox.showinfo("Verificar totales", "Los totales por estado, curso y turno son correctos.")
+                return
+            detail = "\n".join(f"- {dimension} '{valor}': guardado {guardado}, real {real}"
+                               for dimension, valor, guardado, real in drift[:20])
+            if len(drift) > 20:
+                detail += f"\n... y {len(drift) - 20} diferencias más"
+            self.app.update_status(f"Totales con {len(drift)} diferencia(s).")
+            if messagebox.askyesno("Verificar totales",
+                                   f"Se encontraron {len(drift)} diferencia(s):\n{detail}\n\n¿Reconstruir los totales?"):
+                self.executor.submit_write(lambda: self.task_dao.verify_counters(rebuild=True),
+                                           lambda d: self.app.update_status(f"Totales reconstruidos ({len(d)} corregido(s))."),
+                                           on_error, description="Reconstruyendo totales...")
+        
+        self.executor.submit_read(self.task_dao.verify_counters, on_verified, on_error,
+                                  description="Verificando totales...")
+        return True
+    
+    def show_db_stats(self):
+        """Muestra las estadísticas de la instrumentación del DAO (tiempos, SQL y consultas lentas)."""
+        instrumentation = self.task_dao.instrumentation
+        if isinstance(self.task_dao, RemoteTaskDAO):
+            # Con TASK_API_URL las consultas las hace el servidor: este equipo no tiene qué medir
+            messagebox.showinfo("Estadísticas de la base de datos",
+                                "La aplicación trabaja a través del servidor de tareas (TASK_API_URL), "
+                                "así que las estadísticas de la base de datos se miden en el servidor.\n\n"
+                                "La instrumentación se activa con DB_INSTRUMENTATION=true en el .env "
+                                "del equipo que ejecuta el servidor (api/server.py).")
+            return False
+        if not instrumentation.enabled:
+            messagebox.showinfo("Estadísticas de la base de datos",
+                                "La instrumentación está desactivada.\n\n"
+                                "Agregue DB_INSTRUMENTATION=true al archivo .env y reinicie la aplicación. "
+                                "Con DB_SLOW_QUERY_MS se define a partir de cuántos milisegundos "
+                                "una operación se considera lenta.")
+            return False
+
+        stats_window = tk.Toplevel(self.app.root)
+        stats_window.title("Estadísticas de la base de datos")
+        stats_window.geometry("850x500")
+        summary = ttk.Label(stats_window, font=("Segoe UI", 10))
+        summary.pack(anchor="w", padx=20, pady=(10, 0))
+        notebook = ttk.Notebook(stats_window)
+        notebook.pack(fill="both", expand=True, padx=20, pady=10)
+        tables = []
+        for title, columns in (
+                ("Métodos", ("Método", "Llamadas", "Total ms", "Media ms", "p95 ms", "Máx. ms", "Filas", "Errores")),
+                ("Consultas lentas", ("Fecha", "Método", "ms", "Filas", "SQL")),
+                ("Sentencias SQL", ("Veces", "SQL"))):
+            frame = ttk.Frame(notebook)
+            notebook.add(frame, text=title)
+            tables.append(self._report_table(frame, columns, ()))
+
+        def refresh():
+            # Las estadísticas están en memoria: se leen directamente, sin ir a la base de datos
+            stats = instrumentation.snapshot()
+            connections = stats["conexiones"]
+            summary.config(text=f"Desde {Util.format_date(stats['desde'].replace('T', ' '))} · "
+                                f"Conexiones abiertas: {connections['abiertas']} "
+                                f"(media {connections.get('apertura_media_ms', 0):.1f} ms) · "
+                                f"Umbral de consulta lenta: {stats['umbral_lenta_ms']:g} ms")
+            rows = (
+                [(name, m["llamadas"], m["total_ms"], m["media_ms"], m["p95_ms"], m["max_ms"], m["filas"], m["errores"])
+                 for name, m in stats["metodos"].items()],
+                [(s["fecha"].replace("T", " "), s["metodo"], s["ms"], s["filas"] if s["filas"] is not None else "",
+                  " ; ".join(s["sql"])) for s in reversed(stats["consultas_lentas"])],
+                [(s["veces"], s["sql"]) for s in stats["sentencias"]],
+            )
+            for tree, table_rows in zip(tables, rows):
+                tree.delete(*tree.get_children())
+                for row in table_rows:
+                    tree.insert("", "end", values=row)
+
+        def save():
+            filename = filedialog.asksaveasfilename(
+                parent=stats_window,
+                defaultextension=".json",
+                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                title="Guardar estadísticas"
+            )
+            if filename:
+                success, message = instrumentation.dump(filename)
+                self.app.update_status(message)
+                if not success:
+                    messagebox.showerror("Error", message, parent=stats_window)
+
+        def reset():
+            instrumentation.reset()
+            refresh()
+
+        buttons = ttk.Frame(stats_window)
+        buttons.pack(pady=(0, 10))
+        ttk.Button(buttons, text="Actualizar", command=refresh).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Guardar en archivo...", command=save).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Reiniciar", command=reset).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Cerrar", command=stats_window.destroy).pack(side="left", padx=5)
+        refresh()
+        return True
+
+    def _report_table(self, parent, columns, rows):
+        """Agrega al informe una tabla (Treeview con scroll) con las columnas y filas indicadas."""
+        frame = ttk.Frame(parent)
+        frame.pack(fill="both", expand=True, pady=5)
+        tree = ttk.Treeview(frame, columns=columns, show="headings", height=6)
+        for column in columns:
+            tree.heading(column, text=column)
+            text_column = column in ("Curso", "Turno", "Periodo", "Método", "Fecha", "SQL")
+            tree.column(column, width=400 if column == "SQL" else 100, anchor="w" if text_column else "e")
+        for row in rows:
+            tree.insert("", "end", values=row)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        return tree
+            
+    def toggle_auto_refresh(self, interval=None):
+        """
+        Activa o desactiva la actualización automática. En cada ciclo solo se consulta PRAGMA data_version
+        (sin leer tablas); si otra conexión cambió la BD se leen únicamente las tareas modificadas.
+        """
+        if interval is None:
+            interval = float(os.getenv("AUTO_REFRESH_SECONDS", "2"))
         if self.auto_refresh_enabled:
             self.auto_refresh_enabled = False
-            if self.auto_refresh_thread and self.auto_refresh_thread.is_alive():
-                # No podemos detener directamente un thread, pero la bandera
-                # hará que salga del bucle
-                self.app.update_status("Actualización automática desactivada")
-                return False
+            self._refresh_stop.set() # Despierta al hilo para que termine enseguida
+            self.app.update_status("Actualización automática desactivada")
+            return False
         else:
             self.auto_refresh_enabled = True
+            self._refresh_stop = threading.Event()
             self.auto_refresh_thread = threading.Thread(
                 target=self._auto_refresh_worker,
-                args=(interval,),
+                args=(interval, self._refresh_stop),
+                name="auto-refresh",
                 daemon=True
             )
             self.auto_refresh_thread.start()
-            self.app.update_status(f"Actualización automática activada (cada {interval} segundos)")
+            self.app.update_status(f"Actualización automática activada (cada {interval:g} segundos)")
             return True
             
-    def _auto_refresh_worker(self, interval):
+    def _auto_refresh_worker(self, interval, stop_event):
         """Método worker para el thread de actualización automática."""
-        while self.auto_refresh_enabled:
-            time.sleep(interval)
-            if not self.auto_refresh_enabled:
-                break
+        last_version = None
+        while not stop_event.wait(interval):
+            try:
+                # data_version solo cambia cuando otra conexión confirma cambios
+                version = self.task_dao.get_data_version()
+                if version == last_version:
+                    continue
+                last_version = version
                 
-            # Actualizar en el thread principal
-            if self.app.root and self.app.root.winfo_exists():
-                self.app.root.after(0, self._safe_update)
+                since = self._last_change_seq
+                changes = self.task_dao.get_changes_since(since)
+                if changes["seq"] == since:
+                    continue
+                
+                # Si hay una búsqueda activa, decidir aquí (fuera del hilo de Tk) qué tareas siguen coincidiendo
+                query = self.last_search_query
+                matches = {}
+                if query and changes["complete"]:
+                    matches = {task.id: self.task_dao.task_matches_query(task.id, query) for task in changes["changed"]}
+                
+                # Aplicar en el thread principal
+                self.app.root.after(0, lambda: self._apply_remote_changes(changes, since, query, matches))
+            except RuntimeError:
+                break # La ventana ya se cerró
+            except Exception as e:
+                print(f"Error en actualización automática: {e}")
     
-    def _safe_update(self):
-        """Realiza una actualización segura para llamarse desde el thread principal."""
-        try:
-            if self.last_search_query:
-                # Si hay una búsqueda activa, actualizarla
-                self.search_tasks(self.last_search_query)
-            else:
-                # Si no, actualizar normalmente
-                self.update_trees()
-        except Exception as e:
-            print(f"Error en actualización automática: {e}")
+    def _apply_remote_changes(self, changes, since, query, matches):
+        """En el hilo de Tk: aplica a los árboles solo las tareas que cambiaron desde la última actualización."""
+        if since != self._last_change_seq:
+            return # Ya se aplicó o hubo una recarga completa mientras tanto
+        if not changes["complete"]:
+            self.reload_tasks() # Demasiados cambios o registro recortado: recargar todo
+            return
+        
+        if query != self.last_search_query:
+            # La búsqueda cambió mientras tanto: recargar en segundo plano en lugar de consultar aquí
+            self.reload_tasks()
+            return
+        for task in changes["changed"]:
+            self.apply_task_change(task, matches.get(task.id, True))
+        for task_id in changes["deleted"]:
+            self.apply_task_removal(task_id)
+        self._last_change_seq = changes["seq"]
+        
+        total = len(changes["changed"]) + len(changes["deleted"])
+        self.app.update_status(f"Actualizado: {total} tarea(s) modificada(s) en otro equipo. {self._counts_message()}")
+    
+    def close(self):
+        """Libera los recursos del controlador (hilos y conexiones a la base de datos)."""
+        self.auto_refresh_enabled = False
+        self._refresh_stop.set()
+        if self._operation_cancel is not None:
+            self._operation_cancel.set() # Detener una exportación o importación larga (la importación se puede reanudar)
+        self.search_pipeline.close()
+        self.executor.shutdown() # Espera a que terminen las escrituras pendientes
+        if self.task_dao.instrumentation.enabled: # Solo con DB_INSTRUMENTATION; si no, está en show_db_stats
+            stats = self.task_dao.get_connection_stats()
+            print(f"Conexiones a la BD: {stats['abiertas']} abiertas, {stats['reutilizadas']} reutilizadas.")
+        self.task_dao.close()
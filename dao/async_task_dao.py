@@ -0,0 +1,186 @@
+"""
+DAO asíncrono: las mismas operaciones que TaskDAO, pero como corutinas (await) para código asyncio.
+Todas las operaciones se encolan y las ejecuta un único hilo dueño de la conexión a SQLite, así el
+bucle de eventos nunca se bloquea esperando a la base de datos.
+
+Las escrituras (insert_task, update_task, delete_task) que se acumulan en la cola mientras el hilo
+está ocupado se agrupan y se confirman juntas en una sola transacción (TaskDAO.apply_task_writes):
+con muchos clientes concurrentes se hace un commit por lote en lugar de uno por escritura.
+
+Uso:
+    async with AsyncTaskDAO("database.db") as dao:
+        task = await dao.insert_task(Task(...))
+        tasks = await dao.search_tasks("núñez")
+        async for rows in dao.iter_task_rows():
+            ...
+"""
+
+import asyncio
+import functools
+import inspect
+import queue
+import threading
+
+from dao.task_dao import TaskDAO
+
+_END = object() # Marca el fin de un generador recorrido desde el hilo de la conexión
+
+class _Request:
+    """Una operación encolada: la función a ejecutar (o la escritura a agrupar) y su future."""
+
+    __slots__ = ("fn", "write", "loop", "future")
+
+    def __init__(self, fn, write, loop, future):
+        self.fn = fn # fn(task_dao) para lecturas y operaciones sueltas
+        self.write = write # (operación, argumento) para las escrituras que se pueden agrupar
+        self.loop = loop
+        self.future = future
+
+def _set_future(future, ok, value):
+    """Entrega el resultado al future (en el hilo del bucle), salvo que se haya cancelado."""
+    if future.cancelled():
+        return
+    if ok:
+        future.set_result(value)
+    else:
+        future.set_exception(value)
+
+class AsyncTaskDAO:
+    """Envoltorio asyncio de TaskDAO con un hilo de conexión dedicado y una cola de peticiones."""
+
+    # Métodos de TaskDAO que se agrupan en una transacción -> operación de apply_task_writes
+    WRITE_METHODS = {"insert_task": "insert", "update_task": "update", "delete_task": "delete"}
+    MAX_BATCH = 500 # Escrituras como máximo por transacción
+
+    def __init__(self, db_name="database.db", profile=None, instrumentation=None, max_batch=MAX_BATCH):
+        """Arranca el hilo de la conexión y espera a que la base de datos esté lista (migraciones)."""
+        self.db_name = db_name
+        self.max_batch = max_batch
+        self.batches = 0 # Transacciones de escritura confirmadas
+        self.batched_writes = 0 # Escrituras incluidas en esas transacciones
+        self._queue = queue.Queue()
+        self._closed = False
+        self._task_dao = None
+        self._startup_error = None
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(profile, instrumentation, ready),
+                                        name="dao-async", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+
+    # --- Hilo de la conexión ---
+
+    def _run(self, profile, instrumentation, ready):
+        try:
+            self._task_dao = TaskDAO(self.db_name, profile=profile, instrumentation=instrumentation)
+        except Exception as e:
+            self._startup_error = e
+            ready.set()
+            return
+        ready.set()
+        pending = None
+        while True:
+            request = pending if pending is not None else self._queue.get()
+            pending = None
+            if request is None:
+                break
+            if request.write is None:
+                self._execute(request)
+                continue
+            # Juntar las escrituras que ya esperan en la cola, hasta la primera que no lo sea
+            # (que se atiende después, para respetar el orden de llegada)
+            batch = [request]
+            while len(batch) < self.max_batch:
+                try:
+                    following = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if following is None or following.write is None:
+                    pending = following
+                    break
+                batch.append(following)
+            self._execute_batch(batch)
+        self._task_dao.close()
+
+    def _execute(self, request):
+        try:
+            result, ok = request.fn(self._task_dao), True
+        except BaseException as e:
+            result, ok = e, False
+        self._reply(request, ok, result)
+
+    def _execute_batch(self, batch):
+        try:
+            results = self._task_dao.apply_task_writes([request.write for request in batch])
+            self.batches += 1
+            self.batched_writes += len(batch)
+        except Exception as e:
+            results = [(False, e)] * len(batch)
+        for request, (ok, result) in zip(batch, results):
+            self._reply(request, ok, result)
+
+    def _reply(self, request, ok, value):
+        if request.loop is None:
+            return
+        try:
+            request.loop.call_soon_threadsafe(_set_future, request.future, ok, value)
+        except RuntimeError:
+            pass # El bucle del cliente ya se cerró: nadie espera el resultado
+
+    # --- Lado asyncio ---
+
+    def _submit(self, fn=None, write=None):
+        if self._closed:
+            raise Exception("El DAO asíncrono ya está cerrado.")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put(_Request(fn, write, loop, future))
+        return future
+
+    async def _call(self, name, *args, **kwargs):
+        if name in self.WRITE_METHODS and not kwargs and len(args) == 1:
+            return await self._submit(write=(self.WRITE_METHODS[name], args[0]))
+        return await self._submit(lambda task_dao: getattr(task_dao, name)(*args, **kwargs))
+
+    async def _iterate(self, name, *args, **kwargs):
+        """Recorre un método generador de TaskDAO pidiendo cada elemento al hilo de la conexión."""
+        iterator = await self._submit(lambda task_dao: iter(getattr(task_dao, name)(*args, **kwargs)))
+        try:
+            while True:
+                item = await self._submit(lambda task_dao: next(iterator, _END))
+                if item is _END:
+                    break
+                yield item
+        finally:
+            if not self._closed:
+                # Cerrar el generador en su hilo, sin esperar el resultado
+                self._queue.put(_Request(lambda task_dao: iterator.close(), None, None, None))
+
+    def __getattr__(self, name):
+        """Cada método público de TaskDAO se expone como corutina (o generador asíncrono)."""
+        attribute = getattr(TaskDAO, name, None)
+        if name.startswith("_") or not callable(attribute) or name in ("close", "interrupt"):
+            raise AttributeError(f"'{type(self).__name__}' no tiene el atributo '{name}'")
+        if inspect.isgeneratorfunction(attribute):
+            return functools.partial(self._iterate, name)
+        return functools.partial(self._call, name)
+
+    async def close(self):
+        """Termina las operaciones ya encoladas, cierra la conexión y detiene el hilo."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+
+    def get_batch_stats(self):
+        """Cuántas transacciones de escritura se hicieron y cuántas escrituras se agruparon en ellas."""
+        return {"transacciones": self.batches, "escrituras": self.batched_writes}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
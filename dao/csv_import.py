@@ -0,0 +1,131 @@
+"""
+Lectura y validación de archivos CSV para la importación de tareas.
+Los archivos grandes se dividen en rangos de bytes que se procesan en paralelo (ProcessPoolExecutor);
+las filas validadas se entregan siempre en el orden del archivo, para que un único escritor las guarde.
+"""
+
+import csv
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.util import Util
+
+RANGE_BYTES = 1024 * 1024 # Tamaño aproximado de cada rango que procesa un proceso
+PARALLEL_MIN_BYTES = 4 * 1024 * 1024 # Con archivos más chicos no compensa iniciar procesos
+
+def parse_import_row(row):
+    """Valida una fila del CSV. Devuelve (valores para INSERT, None) o (None, motivo del rechazo)."""
+    cedula = (row.get("cedula") or "").strip()
+    valid, message = Util.validate_cedula(cedula)
+    if not valid:
+        return None, message
+    values = [cedula]
+    for field, label in (("nombre", "Nombre"), ("apellido", "Apellido")):
+        valid, message = Util.validate_name(row.get(field) or "", field_name=label)
+        if not valid:
+            return None, message
+        values.append(row[field].strip())
+    for field in ("curso", "turno"):
+        value = (row.get(field) or "").strip()
+        if not value:
+            return None, f"El campo '{field}' no puede estar vacío."
+        values.append(value)
+    values.append((row.get("accion") or "").strip())
+
+    fecha_creacion = row.get("fecha_creacion") or ""
+    fecha_completado = row.get("fecha_completado") or ""
+    storage_creacion = Util.to_storage_date(fecha_creacion) if fecha_creacion.strip() else Util.now_timestamp()
+    storage_completado = Util.to_storage_date(fecha_completado) if fecha_completado.strip() else ""
+    if storage_creacion is None or storage_completado is None:
+        return None, f"Fecha no válida: '{fecha_creacion if storage_creacion is None else fecha_completado}'."
+    status = (row.get("status") or "pendiente").strip().lower()
+    if status not in ("pendiente", "completada"):
+        return None, f"Estado no válido: '{status}'."
+    values += [storage_creacion, storage_completado, status]
+    return tuple(values), None
+
+def split_csv_ranges(path, range_bytes=RANGE_BYTES):
+    """
+    Divide el archivo en rangos de bytes de aproximadamente 'range_bytes' que empiezan y terminan en un
+    límite de fila. Un corte nunca cae dentro de un campo entre comillas (con saltos de línea): se
+    controla la paridad de las comillas, ya que en CSV una comilla dentro de un campo se escribe doble.
+    Devuelve (nombres de columna, [(inicio, fin, número de la primera línea), ...]).
+    """
+    ranges = []
+    with open(path, "rb") as f:
+        header = f.readline()
+        fieldnames = next(csv.reader([header.decode("utf-8-sig")]), [])
+        offset = len(header)
+        line_number = 1
+        inside_quotes = header.count(b'"') % 2 == 1
+        range_start, range_line = offset, 2
+        for line in f:
+            offset += len(line)
+            line_number += 1
+            if line.count(b'"') % 2:
+                inside_quotes = not inside_quotes
+            if not inside_quotes and offset - range_start >= range_bytes:
+                ranges.append((range_start, offset, range_line))
+                range_start, range_line = offset, line_number + 1
+        if offset > range_start:
+            ranges.append((range_start, offset, range_line))
+    return fieldnames, ranges
+
+def parse_csv_range(path, start, end, first_line, fieldnames):
+    """
+    Se ejecuta en un proceso de trabajo: lee y valida las filas de un rango de bytes.
+    Devuelve una lista de (número de línea, cédula, valores o None, motivo del rechazo o None).
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8"), newline=""), fieldnames=fieldnames)
+    results = []
+    for row in reader:
+        values, reason = parse_import_row(row)
+        results.append((first_line + reader.line_num - 1, row.get("cedula") or "", values, reason))
+    return results
+
+def iter_parsed_rows(path, workers=1, progress=None):
+    """
+    Recorre las filas del CSV ya validadas, en el orden del archivo, como tuplas
+    (número de línea, cédula, valores o None, motivo del rechazo o None).
+    Con workers > 1 (y un archivo suficientemente grande) la validación se reparte entre procesos;
+    solo se adelantan unos pocos rangos, así que la memoria no crece con el tamaño del archivo.
+    progress: lista de un elemento donde se deja la fracción del archivo ya entregada.
+    """
+    size = max(os.path.getsize(path), 1)
+    progress = progress if progress is not None else [0.0]
+
+    if workers <= 1 or size < PARALLEL_MIN_BYTES:
+        chars_read = 0
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            def counted_lines():
+                # Cuenta los caracteres leídos para estimar el avance (csv no permite usar tell())
+                nonlocal chars_read
+                for line in f:
+                    chars_read += len(line)
+                    yield line
+            reader = csv.DictReader(counted_lines())
+            for row in reader:
+                values, reason = parse_import_row(row)
+                progress[0] = min(chars_read / size, 1.0)
+                yield reader.line_num, row.get("cedula") or "", values, reason
+        return
+
+    fieldnames, ranges = split_csv_ranges(path)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        next_range = 0
+        while next_range < len(ranges) or pending:
+            # Mantener a todos los procesos ocupados, pero sin adelantarse demasiado al escritor
+            while next_range < len(ranges) and len(pending) < workers * 2:
+                start, end, first_line = ranges[next_range]
+                pending.append((end, pool.submit(parse_csv_range, path, start, end, first_line, fieldnames)))
+                next_range += 1
+            end, future = pending.popleft() # En orden de envío: el resultado es determinista
+            results = future.result()
+            progress[0] = min(end / size, 1.0)
+            yield from results
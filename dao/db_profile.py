@@ -0,0 +1,80 @@
+"""
+Perfil de rendimiento de SQLite configurable mediante variables de entorno (.env).
+Define los PRAGMA que se aplican a cada conexión abierta por el DAO.
+"""
+
+import os
+import sqlite3
+
+class DatabaseProfile:
+    """Agrupa los ajustes de rendimiento de SQLite y los aplica sobre una conexión."""
+
+    JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+    SYNCHRONOUS_LEVELS = ("OFF", "NORMAL", "FULL", "EXTRA")
+    TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
+
+    def __init__(self, journal_mode="WAL", synchronous="NORMAL", cache_size=-20000,
+                 mmap_size=67108864, temp_store="MEMORY", busy_timeout=5000,
+                 checkpoint_on_close=True):
+        # Los valores se validan contra listas cerradas porque los PRAGMA no admiten parámetros
+        self.journal_mode = self._choice(journal_mode, self.JOURNAL_MODES, "journal_mode", "WAL")
+        self.synchronous = self._choice(synchronous, self.SYNCHRONOUS_LEVELS, "synchronous", "NORMAL")
+        self.cache_size = self._integer(cache_size, "cache_size", -20000) # Negativo = KiB, positivo = páginas
+        self.mmap_size = self._integer(mmap_size, "mmap_size", 67108864) # Bytes; 0 desactiva mmap
+        self.temp_store = self._choice(temp_store, self.TEMP_STORES, "temp_store", "MEMORY")
+        self.busy_timeout = self._integer(busy_timeout, "busy_timeout", 5000) # Milisegundos
+        self.checkpoint_on_close = bool(checkpoint_on_close)
+
+    @classmethod
+    def from_env(cls):
+        """Crea el perfil leyendo las claves DB_* del entorno (cargado desde .env)."""
+        return cls(
+            journal_mode=os.getenv("DB_JOURNAL_MODE", "WAL"),
+            synchronous=os.getenv("DB_SYNCHRONOUS", "NORMAL"),
+            cache_size=os.getenv("DB_CACHE_SIZE", "-20000"),
+            mmap_size=os.getenv("DB_MMAP_SIZE", "67108864"),
+            temp_store=os.getenv("DB_TEMP_STORE", "MEMORY"),
+            busy_timeout=os.getenv("DB_BUSY_TIMEOUT", "5000"),
+            checkpoint_on_close=os.getenv("DB_CHECKPOINT_ON_CLOSE", "true").strip().lower() in ("1", "true", "si", "sí", "yes")
+        )
+
+    @staticmethod
+    def _choice(value, options, name, default):
+        """Normaliza un valor de texto y verifica que pertenezca a las opciones válidas."""
+        normalized = str(value).strip().upper()
+        if normalized not in options:
+            print(f"Advertencia: valor '{value}' no válido para {name}. Se usará '{default}'.")
+            return default
+        return normalized
+
+    @staticmethod
+    def _integer(value, name, default):
+        """Convierte un valor a entero, usando el valor por defecto si no es válido."""
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            print(f"Advertencia: valor '{value}' no válido para {name}. Se usará {default}.")
+            return default
+
+    def apply(self, conn):
+        """Aplica el perfil a una conexión recién abierta."""
+        # busy_timeout primero, para que el cambio de journal_mode espere si la BD está ocupada
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout}")
+        try:
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        except sqlite3.Error as e:
+            # Puede fallar si otro proceso tiene la BD bloqueada; se sigue con el modo actual
+            print(f"Advertencia: no se pudo establecer journal_mode={self.journal_mode}: {e}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {self.cache_size}")
+        conn.execute(f"PRAGMA mmap_size = {self.mmap_size}")
+        conn.execute(f"PRAGMA temp_store = {self.temp_store}")
+
+    def checkpoint(self, conn):
+        """Vuelca el WAL a la base de datos principal y lo trunca (solo si el modo es WAL)."""
+        if not self.checkpoint_on_close or self.journal_mode != "WAL":
+            return
+        try:
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except sqlite3.Error as e:
+            print(f"Advertencia: no se pudo hacer checkpoint del WAL: {e}")
@@ -0,0 +1,205 @@
+"""
+Instrumentación opcional del DAO: tiempo y filas de cada método, SQL ejecutado (mediante
+set_trace_callback), tiempo de apertura de conexiones y registro de consultas lentas.
+Se activa con DB_INSTRUMENTATION=true en el .env; desactivada no agrega ningún costo.
+"""
+
+import inspect
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import wraps
+
+from models.task import Task
+from models.task_page import TaskPage
+
+class DAOInstrumentation:
+    """Acumula estadísticas de las llamadas al DAO y de las sentencias SQL que ejecutan."""
+
+    SAMPLES_PER_METHOD = 1000 # Duraciones recientes que se guardan por método (para los percentiles)
+    SLOW_LOG_SIZE = 200 # Consultas lentas que se conservan en memoria
+    STATEMENTS_PER_CALL = 50 # Sentencias SQL que se guardan por llamada para el registro de lentas
+    MAX_STATEMENTS = 500 # Sentencias distintas que se cuentan
+    EXCLUDED_METHODS = ("close", "interrupt", "get_connection_stats", "get_instrumentation_stats")
+    LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+    def __init__(self, enabled=False, slow_query_ms=200):
+        self.enabled = bool(enabled)
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._local = threading.local() # Pila de llamadas en curso del hilo, para asociarles su SQL
+        self.reset()
+
+    @classmethod
+    def from_env(cls):
+        """Crea la instrumentación leyendo DB_INSTRUMENTATION y DB_SLOW_QUERY_MS del entorno."""
+        enabled = os.getenv("DB_INSTRUMENTATION", "false").strip().lower() in ("1", "true", "si", "sí", "yes")
+        try:
+            slow_query_ms = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+        except ValueError:
+            print(f"Advertencia: valor '{os.getenv('DB_SLOW_QUERY_MS')}' no válido para DB_SLOW_QUERY_MS. Se usará 200.")
+            slow_query_ms = 200
+        return cls(enabled, slow_query_ms)
+
+    def reset(self):
+        """Descarta todas las estadísticas acumuladas."""
+        with self._lock:
+            self._methods = {} # nombre -> estadísticas del método
+            self._statements = {} # SQL normalizado -> cantidad de ejecuciones
+            self._slow = deque(maxlen=self.SLOW_LOG_SIZE)
+            self._connections = {"abiertas": 0, "apertura_total_ms": 0.0, "apertura_max_ms": 0.0}
+            self._since = datetime.now()
+
+    def instrument(self, dao):
+        """Reemplaza, en esta instancia del DAO, cada método público por una versión medida."""
+        if not self.enabled:
+            return
+        for name, method in inspect.getmembers(type(dao), inspect.isfunction):
+            if name.startswith("_") or name in self.EXCLUDED_METHODS:
+                continue
+            bound = getattr(dao, name)
+            if inspect.isgeneratorfunction(method):
+                setattr(dao, name, self._wrap_generator(name, bound))
+            else:
+                setattr(dao, name, self._wrap(name, bound))
+
+    def attach(self, conn):
+        """Registra el callback de trazas en una conexión recién abierta."""
+        if self.enabled:
+            conn.set_trace_callback(self._on_statement)
+
+    def record_connection_open(self, seconds):
+        """Registra lo que tardó en abrirse (y configurarse) una conexión."""
+        if not self.enabled:
+            return
+        ms = seconds * 1000
+        with self._lock:
+            self._connections["abiertas"] += 1
+            self._connections["apertura_total_ms"] += ms
+            self._connections["apertura_max_ms"] = max(self._connections["apertura_max_ms"], ms)
+
+    def _on_statement(self, sql):
+        """Callback de sqlite3: se llama con el texto de cada sentencia antes de ejecutarla."""
+        # sqlite3 entrega el SQL con los parámetros ya reemplazados: se quitan los literales para
+        # agrupar las sentencias iguales y para no guardar datos de los alumnos en las estadísticas
+        normalized = self.LITERAL_RE.sub("?", re.sub(r"\s+", " ", sql).strip())
+        with self._lock:
+            if normalized in self._statements or len(self._statements) < self.MAX_STATEMENTS:
+                self._statements[normalized] = self._statements.get(normalized, 0) + 1
+        for call in getattr(self._local, "calls", ()):
+            if len(call) < self.STATEMENTS_PER_CALL:
+                call.append(normalized)
+
+    def _wrap(self, name, method):
+        @wraps(method)
+        def measured(*args, **kwargs):
+            statements = self._begin()
+            start = time.perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except Exception:
+                self._end(name, start, statements, None, error=True)
+                raise
+            self._end(name, start, statements, self._count_rows(result))
+            return result
+        return measured
+
+    def _wrap_generator(self, name, method):
+        @wraps(method)
+        def measured(*args, **kwargs):
+            # Se mide todo el recorrido; las filas son las de todos los bloques entregados
+            statements = self._begin()
+            start = time.perf_counter()
+            rows, error = 0, False
+            try:
+                for item in method(*args, **kwargs):
+                    rows += len(item) if isinstance(item, list) else 1
+                    yield item
+            except Exception:
+                error = True
+                raise
+            finally:
+                self._end(name, start, statements, rows, error)
+        return measured
+
+    def _begin(self):
+        """Abre el registro de sentencias de una llamada en la pila del hilo."""
+        statements = []
+        if not hasattr(self._local, "calls"):
+            self._local.calls = []
+        self._local.calls.append(statements)
+        return statements
+
+    def _end(self, name, start, statements, rows, error=False):
+        """Cierra la llamada y acumula su duración, filas y, si fue lenta, su SQL."""
+        ms = (time.perf_counter() - start) * 1000
+        calls = getattr(self._local, "calls", [])
+        if statements in calls:
+            calls.remove(statements)
+        with self._lock:
+            stats = self._methods.get(name)
+            if stats is None:
+                stats = self._methods[name] = {"llamadas": 0, "errores": 0, "total_ms": 0.0, "max_ms": 0.0,
+                                               "filas": 0, "muestras": deque(maxlen=self.SAMPLES_PER_METHOD)}
+            stats["llamadas"] += 1
+            stats["errores"] += error
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+            stats["filas"] += rows or 0
+            stats["muestras"].append(ms)
+            slow = ms >= self.slow_query_ms
+            if slow:
+                self._slow.append({"fecha": datetime.now().isoformat(timespec="seconds"), "metodo": name,
+                                   "ms": round(ms, 1), "filas": rows, "sql": list(statements)})
+        if slow:
+            print(f"Consulta lenta: {name} tardó {ms:.0f} ms ({len(statements)} sentencia(s) SQL)")
+
+    @staticmethod
+    def _count_rows(result):
+        """Filas devueltas por un método del DAO (None si el resultado no es una lista de tareas)."""
+        if isinstance(result, (list, TaskPage)):
+            return len(result)
+        if isinstance(result, Task):
+            return 1
+        return None
+
+    def snapshot(self):
+        """Devuelve una copia de las estadísticas, lista para mostrar o guardar como JSON."""
+        with self._lock:
+            methods = {}
+            for name, stats in sorted(self._methods.items(), key=lambda item: -item[1]["total_ms"]):
+                samples = sorted(stats["muestras"])
+                methods[name] = {
+                    "llamadas": stats["llamadas"],
+                    "errores": stats["errores"],
+                    "total_ms": round(stats["total_ms"], 2),
+                    "media_ms": round(stats["total_ms"] / stats["llamadas"], 3),
+                    "p95_ms": round(samples[min(int(len(samples) * 0.95), len(samples) - 1)], 3),
+                    "max_ms": round(stats["max_ms"], 3),
+                    "filas": stats["filas"],
+                }
+            statements = sorted(self._statements.items(), key=lambda item: -item[1])
+            connections = dict(self._connections)
+            if connections["abiertas"]:
+                connections["apertura_media_ms"] = round(connections["apertura_total_ms"] / connections["abiertas"], 3)
+            return {
+                "desde": self._since.isoformat(timespec="seconds"),
+                "umbral_lenta_ms": self.slow_query_ms,
+                "metodos": methods,
+                "sentencias": [{"sql": sql, "veces": count} for sql, count in statements],
+                "consultas_lentas": list(self._slow),
+                "conexiones": connections,
+            }
+
+    def dump(self, filename):
+        """Guarda las estadísticas en un archivo JSON."""
+        try:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
+            return True, f"Estadísticas guardadas en {filename}"
+        except OSError as e:
+            return False, f"Error al guardar las estadísticas: {e}"
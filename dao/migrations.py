@@ -0,0 +1,265 @@
+"""
+Migraciones versionadas del esquema de la base de datos.
+La versión aplicada se guarda en PRAGMA user_version y cada migración se ejecuta una sola vez, en orden.
+"""
+
+import sqlite3
+
+from utils.util import Util
+
+def fts5_available():
+    """Indica si la versión de SQLite incluida en Python fue compilada con FTS5."""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute("CREATE VIRTUAL TABLE fts5_probe USING fts5(x)")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+def _create_fulltext_index(conn):
+    """
+    Crea la tabla FTS5 'tareas_fts' (contenido externo sobre 'tareas') y los triggers que la sincronizan.
+    Si SQLite no tiene FTS5 la migración no hace nada y el DAO sigue usando la búsqueda con LIKE.
+    """
+    if not fts5_available():
+        print("Advertencia: SQLite no incluye FTS5. La búsqueda usará LIKE.")
+        return
+    
+    # remove_diacritics 2: 'Peña' y 'pena', 'Ramírez' y 'ramirez' generan los mismos tokens.
+    # prefix '1 2 3': índices extra para que las búsquedas por prefijo cortas (mientras se escribe) sean rápidas.
+    conn.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tareas_fts USING fts5(
+            cedula, nombre, apellido, curso, turno, accion,
+            content='tareas', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='1 2 3'
+        )
+    ''')
+    _create_fulltext_triggers(conn)
+    # Indexar las filas que ya existían antes de la migración
+    conn.execute("INSERT INTO tareas_fts(tareas_fts) VALUES ('rebuild')")
+
+FULLTEXT_TRIGGERS = ("tareas_fts_ai", "tareas_fts_ad", "tareas_fts_au")
+
+def _create_fulltext_triggers(conn):
+    """Crea los triggers que mantienen tareas_fts al día con cada INSERT, UPDATE y DELETE de 'tareas'."""
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tareas_fts_ai AFTER INSERT ON tareas BEGIN
+            INSERT INTO tareas_fts(rowid, cedula, nombre, apellido, curso, turno, accion)
+            VALUES (new.id, new.cedula, new.nombre, new.apellido, new.curso, new.turno, new.accion);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tareas_fts_ad AFTER DELETE ON tareas BEGIN
+            INSERT INTO tareas_fts(tareas_fts, rowid, cedula, nombre, apellido, curso, turno, accion)
+            VALUES ('delete', old.id, old.cedula, old.nombre, old.apellido, old.curso, old.turno, old.accion);
+        END
+    ''')
+    conn.execute('''
+        CREATE TRIGGER IF NOT EXISTS tareas_fts_au AFTER UPDATE OF cedula, nombre, apellido, curso, turno, accion ON tareas BEGIN
+            INSERT INTO tareas_fts(tareas_fts, rowid, cedula, nombre, apellido, curso, turno, accion)
+            VALUES ('delete', old.id, old.cedula, old.nombre, old.apellido, old.curso, old.turno, old.accion);
+            INSERT INTO tareas_fts(rowid, cedula, nombre, apellido, curso, turno, accion)
+            VALUES (new.id, new.cedula, new.nombre, new.apellido, new.curso, new.turno, new.accion);
+        END
+    ''')
+
+def sync_fulltext_index(conn):
+    """
+    Ajusta los triggers de tareas_fts al SQLite que abre la base (se llama en cada inicio, no es una
+    migración): una base creada con FTS5 puede abrirse después con un SQLite sin FTS5 (otro equipo,
+    otro ejecutable), y entonces los triggers harían fallar cada alta, modificación y eliminación.
+    Sin FTS5 se eliminan; si FTS5 vuelve a estar disponible se recrean y se reconstruye el índice.
+    Devuelve True si la búsqueda puede usar tareas_fts.
+    """
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tareas_fts'").fetchone() is None:
+        return False
+    triggers = {row[0] for row in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'tareas'")} & set(FULLTEXT_TRIGGERS)
+    if not fts5_available():
+        if triggers:
+            print("Advertencia: SQLite no incluye FTS5. Se desactiva el índice de texto completo y la búsqueda usará LIKE.")
+            for name in triggers:
+                conn.execute(f"DROP TRIGGER {name}")
+        return False
+    if len(triggers) < len(FULLTEXT_TRIGGERS):
+        # Se desactivó en un SQLite sin FTS5: el índice quedó desactualizado
+        _create_fulltext_triggers(conn)
+        conn.execute("INSERT INTO tareas_fts(tareas_fts) VALUES ('rebuild')")
+    return True
+
+def _convert_dates_to_iso(conn):
+    """
+    Convierte fecha_creacion y fecha_completado del formato anterior ('dd/mm/YYYY HH:MM') a ISO-8601
+    ('YYYY-MM-DD HH:MM:SS'), que se ordena correctamente como texto. Los valores que no se pueden
+    interpretar se dejan como están.
+    """
+    iso_glob = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9][0-9]:[0-9][0-9]:[0-9][0-9]"
+    rows = conn.execute(f'''
+        SELECT id, fecha_creacion, fecha_completado FROM tareas
+        WHERE fecha_creacion NOT GLOB '{iso_glob}'
+        OR (COALESCE(fecha_completado, '') <> '' AND fecha_completado NOT GLOB '{iso_glob}')
+    ''').fetchall()
+    updates = []
+    unparsed = 0
+    for task_id, fecha_creacion, fecha_completado in rows:
+        nueva_creacion = Util.to_storage_date(fecha_creacion)
+        nuevo_completado = Util.to_storage_date(fecha_completado) if fecha_completado else ""
+        if nueva_creacion is None or nuevo_completado is None:
+            unparsed += 1
+        updates.append((nueva_creacion or fecha_creacion,
+                        fecha_completado if nuevo_completado is None else nuevo_completado,
+                        task_id))
+    conn.executemany("UPDATE tareas SET fecha_creacion = ?, fecha_completado = ? WHERE id = ?", updates)
+    if unparsed:
+        print(f"Advertencia: {unparsed} tareas tienen fechas que no se pudieron convertir a ISO-8601.")
+
+# Columnas cuyos totales mantiene la tabla tareas_resumen
+COUNTER_DIMENSIONS = ("status", "curso", "turno")
+
+def compute_counters(conn):
+    """Cuenta las tareas por cada dimensión recorriendo la tabla. Devuelve {(dimension, valor): cantidad}."""
+    counters = {}
+    for dimension in COUNTER_DIMENSIONS:
+        for valor, cantidad in conn.execute(f"SELECT {dimension}, COUNT(*) FROM tareas GROUP BY {dimension}"):
+            counters[(dimension, valor)] = cantidad
+    return counters
+
+def rebuild_counters(conn):
+    """Reemplaza el contenido de tareas_resumen por los conteos recalculados desde cero."""
+    counters = compute_counters(conn)
+    conn.execute("DELETE FROM tareas_resumen")
+    conn.executemany("INSERT INTO tareas_resumen(dimension, valor, cantidad) VALUES (?, ?, ?)",
+                     [(dimension, valor, cantidad) for (dimension, valor), cantidad in counters.items()])
+    return counters
+
+def _create_counters(conn):
+    """
+    Crea la tabla tareas_resumen (total de tareas por estado, curso y turno) y los triggers que la
+    mantienen al insertar, modificar o eliminar tareas, de modo que leer un total no recorre 'tareas'.
+    """
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS tareas_resumen (
+            dimension TEXT NOT NULL,
+            valor TEXT NOT NULL,
+            cantidad INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, valor)
+        ) WITHOUT ROWID
+    ''')
+    # INSERT OR IGNORE + UPDATE en lugar de UPSERT para funcionar también con versiones viejas de SQLite
+    def increment(dimension, row, delta):
+        return (f"INSERT OR IGNORE INTO tareas_resumen(dimension, valor, cantidad) VALUES ('{dimension}', {row}.{dimension}, 0); "
+                f"UPDATE tareas_resumen SET cantidad = cantidad {delta} WHERE dimension = '{dimension}' AND valor = {row}.{dimension};")
+    
+    conn.execute("CREATE TRIGGER IF NOT EXISTS tareas_resumen_ai AFTER INSERT ON tareas BEGIN "
+                 + " ".join(increment(d, "new", "+ 1") for d in COUNTER_DIMENSIONS) + " END")
+    conn.execute("CREATE TRIGGER IF NOT EXISTS tareas_resumen_ad AFTER DELETE ON tareas BEGIN "
+                 + " ".join(increment(d, "old", "- 1") for d in COUNTER_DIMENSIONS) + " END")
+    for dimension in COUNTER_DIMENSIONS:
+        # Un trigger por columna: solo se ejecuta si esa columna cambió de valor
+        conn.execute(f"CREATE TRIGGER IF NOT EXISTS tareas_resumen_au_{dimension} AFTER UPDATE OF {dimension} ON tareas "
+                     f"WHEN old.{dimension} IS NOT new.{dimension} BEGIN "
+                     + increment(dimension, "old", "- 1") + " " + increment(dimension, "new", "+ 1") + " END")
+    rebuild_counters(conn) # Contar las filas que ya existían
+
+# Cada migración es una tupla (versión, descripción, pasos).
+# Un paso puede ser una sentencia SQL (str) o una función que recibe la conexión.
+# Las versiones deben ser consecutivas y no se deben modificar una vez publicadas: para cambiar
+# el esquema se agrega una migración nueva al final de la lista.
+MIGRATIONS = [
+    (1, "Índice por estado ordenado por id (tareas pendientes/completadas más recientes primero)", [
+        "CREATE INDEX IF NOT EXISTS idx_tareas_status_id ON tareas(status, id DESC)",
+    ]),
+    (2, "Índices por curso, turno y fecha de creación", [
+        "CREATE INDEX IF NOT EXISTS idx_tareas_curso ON tareas(curso, status)",
+        "CREATE INDEX IF NOT EXISTS idx_tareas_turno ON tareas(turno, status)",
+        "CREATE INDEX IF NOT EXISTS idx_tareas_fecha_creacion ON tareas(fecha_creacion)",
+    ]),
+    (3, "Índice de texto completo FTS5 para la búsqueda (opcional según la versión de SQLite)", [
+        _create_fulltext_index,
+    ]),
+    (4, "Registro de cambios de tareas para la actualización automática incremental", [
+        """
+        CREATE TABLE IF NOT EXISTS tareas_cambios (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tarea_id INTEGER NOT NULL
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tareas_cambios_ai AFTER INSERT ON tareas BEGIN
+            INSERT INTO tareas_cambios(tarea_id) VALUES (new.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tareas_cambios_au AFTER UPDATE ON tareas BEGIN
+            INSERT INTO tareas_cambios(tarea_id) VALUES (new.id);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS tareas_cambios_ad AFTER DELETE ON tareas BEGIN
+            INSERT INTO tareas_cambios(tarea_id) VALUES (old.id);
+        END
+        """,
+    ]),
+    (5, "Fechas en formato ISO-8601 ordenable e índices para rangos de fechas", [
+        _convert_dates_to_iso,
+        # Pendientes más antiguas primero y rangos de fechas filtrados por estado
+        "CREATE INDEX IF NOT EXISTS idx_tareas_status_fecha ON tareas(status, fecha_creacion)",
+        "CREATE INDEX IF NOT EXISTS idx_tareas_fecha_completado ON tareas(fecha_completado)",
+    ]),
+    (6, "Índice de cobertura para los informes por curso, turno y estado", [
+        # El GROUP BY curso, turno, status del informe se resuelve leyendo solo este índice
+        "CREATE INDEX IF NOT EXISTS idx_tareas_curso_turno_status ON tareas(curso, turno, status)",
+    ]),
+    (7, "Totales por estado, curso y turno mantenidos por triggers (tareas_resumen)", [
+        _create_counters,
+    ]),
+    (8, "Progreso de las importaciones CSV, para reanudarlas después de una interrupción", [
+        """
+        CREATE TABLE IF NOT EXISTS importaciones_csv (
+            archivo TEXT PRIMARY KEY,
+            tamano INTEGER NOT NULL,
+            modificado REAL NOT NULL,
+            modo TEXT NOT NULL,
+            filas INTEGER NOT NULL,
+            actualizado TEXT NOT NULL
+        )
+        """,
+    ]),
+    (9, "Tamaño del archivo de rechazos en el punto de reanudación de cada importación CSV", [
+        # NULL en los puntos guardados antes de esta versión: al reanudarlos no se recorta el archivo
+        "ALTER TABLE importaciones_csv ADD COLUMN rechazos INTEGER",
+    ]),
+]
+
+def get_schema_version(conn):
+    """Devuelve la versión de esquema registrada en la base de datos."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def apply_migrations(conn, migrations=MIGRATIONS):
+    """Aplica las migraciones pendientes. Devuelve la lista de versiones aplicadas."""
+    applied = []
+    for version, description, steps in migrations:
+        if version <= get_schema_version(conn):
+            continue
+        # BEGIN IMMEDIATE toma el bloqueo de escritura: si otro proceso está migrando, esperamos
+        # y volvemos a leer la versión para no aplicar la misma migración dos veces.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= get_schema_version(conn):
+                conn.rollback()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            raise Exception(f"Error al aplicar la migración {version} ({description}): {e}")
+        applied.append(version)
+    return applied
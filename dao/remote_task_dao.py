@@ -0,0 +1,214 @@
+"""
+DAO remoto: implementa las operaciones de TaskDAO que usa la aplicación llamando al servidor
+HTTP/JSON (api/server.py) en lugar de abrir la base de datos. Se usa cuando TASK_API_URL está
+definido en el .env.
+"""
+
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit, urlencode, quote
+
+from dao.instrumentation import DAOInstrumentation
+from models.task import Task
+from models.task_page import TaskPage
+from utils.util import Util
+
+class RemoteTaskDAO:
+    """Cliente del servidor de tareas con la misma interfaz que TaskDAO (para el controlador y las vistas)."""
+
+    DEFAULT_PAGE_SIZE = 200
+    EXPORT_CHUNK_SIZE = 2000
+    ERROR_TYPES = {"LookupError": LookupError, "ValueError": ValueError, "PermissionError": PermissionError}
+    # Las escrituras no se reintentan (el servidor pudo haberlas aplicado), así que no se envían por una
+    # conexión inactiva más tiempo que esto: el servidor cierra las suyas a los 120 s (TaskAPIHandler.timeout)
+    WRITE_IDLE_SECONDS = 60
+    READ_ONLY_POSTS = ("/tasks/lookup",) # POST solo porque la lista de ids no entra en la URL
+
+    def __init__(self, base_url, token="", timeout=30):
+        url = urlsplit(base_url if "://" in base_url else f"http://{base_url}")
+        if url.scheme not in ("http", "https"):
+            raise Exception(f"URL del servidor no válida: '{base_url}'.")
+        self.base_url = base_url
+        self._scheme, self._host, self._port = url.scheme, url.hostname, url.port
+        self._prefix = url.path.rstrip("/")
+        self._headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if token:
+            self._headers["Authorization"] = f"Bearer {token}"
+        self.timeout = timeout
+        self.fts_enabled = True # La búsqueda la resuelve el servidor
+        self.instrumentation = DAOInstrumentation(enabled=False) # Las estadísticas se miden en el servidor
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = []
+        self.opened_count = 0
+        self.reused_count = 0
+
+    # --- Conexiones HTTP: una por hilo, reutilizada entre peticiones (keep-alive) ---
+
+    def _connection(self):
+        conn = getattr(self._local, "connection", None)
+        self._local.last_used = time.monotonic()
+        if conn is None:
+            connection_class = http.client.HTTPSConnection if self._scheme == "https" else http.client.HTTPConnection
+            conn = connection_class(self._host, self._port, timeout=self.timeout)
+            self._local.connection = conn
+            with self._lock:
+                self._connections.append(conn)
+                self.opened_count += 1
+        else:
+            with self._lock:
+                self.reused_count += 1
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            conn.close()
+            self._local.connection = None
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+
+    def _request(self, method, path, params=None, body=None):
+        """Hace la petición y devuelve el JSON de la respuesta; los errores se relanzan con su tipo original."""
+        url = self._prefix + path
+        if params:
+            url += "?" + urlencode({key: value for key, value in params.items() if value is not None})
+        data = json.dumps(body).encode("utf-8") if body is not None else None
+        idempotent = method == "GET" or path in self.READ_ONLY_POSTS
+        if not idempotent and time.monotonic() - getattr(self._local, "last_used", 0) > self.WRITE_IDLE_SECONDS:
+            self._drop_connection() # Probablemente el servidor ya la cerró: la escritura va por una nueva
+        for attempt in (1, 2):
+            reused = getattr(self._local, "connection", None) is not None
+            conn = self._connection()
+            try:
+                conn.request(method, url, body=data, headers=self._headers)
+                response = conn.getresponse()
+                payload = json.loads(response.read().decode("utf-8") or "{}")
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError) as e:
+                # El servidor cerró una conexión inactiva: las lecturas se reintentan una vez con una
+                # nueva; las escrituras no, porque el servidor pudo aplicarlas antes de cortar
+                self._drop_connection()
+                if not idempotent:
+                    raise Exception(f"Se perdió la conexión con el servidor de tareas durante una escritura; "
+                                    f"puede que se haya guardado, recargue las listas para comprobarlo: {e}")
+                if attempt == 2 or not reused:
+                    raise Exception(f"Se perdió la conexión con el servidor de tareas: {e}")
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                self._drop_connection()
+                raise Exception(f"No se pudo comunicar con el servidor de tareas ({self.base_url}): {e}")
+        if response.status >= 400:
+            raise self.ERROR_TYPES.get(payload.get("tipo"), Exception)(payload.get("error", f"Error HTTP {response.status}"))
+        return payload
+
+    # --- Operaciones (misma interfaz que TaskDAO) ---
+
+    def close(self):
+        """Cierra las conexiones HTTP abiertas."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+
+    def interrupt(self, thread):
+        """Sin efecto: una petición en curso no se puede cancelar; su resultado se descarta."""
+
+    def get_connection_stats(self):
+        with self._lock:
+            return {"abiertas": self.opened_count, "reutilizadas": self.reused_count,
+                    "activas": len(self._connections)}
+
+    def insert_task(self, task):
+        data = self._request("POST", "/tasks", body=task.to_dict())["tarea"]
+        task.id = data["id"]
+        return task
+
+    def update_task(self, task):
+        self._request("PUT", f"/tasks/{task.id}", body=task.to_dict())
+        return task
+
+    def delete_task(self, task_id):
+        return self._request("DELETE", f"/tasks/{task_id}")["eliminada"]
+
+    def update_status_many(self, task_ids, status):
+        return self._request("POST", "/tasks/status", body={"ids": list(task_ids), "status": status})["cambiadas"]
+
+    def delete_many(self, task_ids):
+        return self._request("POST", "/tasks/delete", body={"ids": list(task_ids)})["eliminadas"]
+
+    def get_task_by_id(self, task_id):
+        try:
+            return Task(**self._request("GET", f"/tasks/{task_id}")["tarea"])
+        except LookupError:
+            return None
+
+    def get_tasks_by_ids(self, task_ids):
+        task_ids = list(task_ids)
+        if not task_ids:
+            return []
+        return [Task(**data) for data in self._request("POST", "/tasks/lookup", body={"ids": task_ids})["tareas"]]
+
+    def get_task_ids(self, status=None, query=None):
+        return self._request("GET", "/tasks/ids", {"status": status, "q": query})["ids"]
+
+    def task_matches_query(self, task_id, query):
+        return self._request("GET", f"/tasks/{task_id}/matches", {"q": query})["coincide"]
+
+    def check_cedula_exists(self, cedula, exclude_id=None):
+        return self._request("GET", f"/cedulas/{quote(cedula)}", {"exclude_id": exclude_id})["existe"]
+
+    def search_tasks(self, query):
+        return [Task(**data) for data in self._request("GET", "/search", {"q": query})["tareas"]]
+
+    def _page(self, path, params, fetch_next):
+        data = self._request("GET", path, params)
+        return TaskPage([Task(**task) for task in data["tareas"]], data["hay_mas"], params["limit"], fetch_next)
+
+    def get_tasks_page(self, after_id=None, page_size=DEFAULT_PAGE_SIZE, status=None):
+        return self._page("/tasks", {"after_id": after_id, "limit": page_size, "status": status},
+                          lambda last_id: self.get_tasks_page(last_id, page_size, status))
+
+    def search_tasks_page(self, query, after_id=None, page_size=DEFAULT_PAGE_SIZE, status=None):
+        return self._page("/search/page", {"q": query, "after_id": after_id, "limit": page_size, "status": status},
+                          lambda last_id: self.search_tasks_page(query, last_id, page_size, status))
+
+    def get_all_tasks(self):
+        return list(self.get_tasks_page(page_size=self.EXPORT_CHUNK_SIZE).iter_all())
+
+    def iter_task_rows(self, chunk_size=EXPORT_CHUNK_SIZE):
+        """Recorre todas las tareas página por página (las más recientes primero), como tuplas."""
+        page = self.get_tasks_page(page_size=chunk_size)
+        while page is not None and page.tasks:
+            yield [task.to_tuple() for task in page.tasks]
+            page = page.next_page()
+
+    def get_report(self, period="month"):
+        return Util.report_from_json(self._request("GET", "/report", {"period": period}))
+
+    def get_counters(self):
+        return self._request("GET", "/counters")
+
+    def verify_counters(self, rebuild=False):
+        return [tuple(row) for row in self._request("POST", "/counters/verify", body={"rebuild": rebuild})["diferencias"]]
+
+    def get_last_change_seq(self):
+        return self._request("GET", "/changes/last")["seq"]
+
+    def get_data_version(self):
+        """En el servidor todas las escrituras pasan por él: el último cambio registrado sirve como versión."""
+        return self.get_last_change_seq()
+
+    def get_changes_since(self, seq, limit=1000):
+        changes = self._request("GET", "/changes", {"since": seq, "limit": limit})
+        changes["changed"] = [Task(**data) for data in changes["changed"]]
+        return changes
+
+    def get_import_checkpoint(self, csv_file):
+        return None
+
+    def import_from_csv(self, csv_file, **kwargs):
+        raise Exception("La importación desde CSV se hace en el equipo del servidor: "
+                        "python cli.py import <archivo> (con la misma base de datos).")
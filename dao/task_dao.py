@@ -4,18 +4,160 @@ Implementa el patrón DAO para encapsular toda la lógica de acceso a datos.
 """
 
 import sqlite3
-from datetime import datetime
+from contextlib import contextmanager
 import os
 import csv
-from models.task import Task
+import re
+import threading
+import time
+from itertools import islice
+from models.task import Task, task_row_factory
+from models.task_page import TaskPage
+from dao.db_profile import DatabaseProfile
+from dao.instrumentation import DAOInstrumentation
+from dao.csv_import import iter_parsed_rows
+from dao.migrations import apply_migrations, sync_fulltext_index, compute_counters, rebuild_counters, COUNTER_DIMENSIONS
+from utils.util import Util
+
+class ConnectionManager:
+    """
+    Administra conexiones SQLite de larga duración, una por hilo.
+    Cada hilo obtiene siempre la misma conexión (se abre la primera vez que se pide)
+    y la devuelve al terminar la operación, evitando abrir una conexión nueva por consulta.
+    """
+    
+    def __init__(self, db_name, on_connect=None, on_open=None):
+        """Inicializa el administrador para la base de datos indicada."""
+        self.db_name = db_name
+        self._on_connect = on_connect # Callback para configurar cada conexión nueva (PRAGMAs)
+        self._on_open = on_open # Callback que recibe los segundos que tardó en abrirse cada conexión
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections = {} # conexión -> hilo propietario
+        self.opened_count = 0
+        self.reused_count = 0
+        
+    def _open(self):
+        """Abre una conexión nueva para el hilo actual y la registra."""
+        start = time.perf_counter()
+        try:
+            # check_same_thread=False solo para poder cerrarla desde close_all();
+            # cada conexión sigue usándose únicamente desde su hilo propietario.
+            conn = sqlite3.connect(self.db_name, check_same_thread=False)
+            if self._on_connect:
+                self._on_connect(conn)
+        except sqlite3.Error as e:
+            raise Exception(f"Error al conectar con la base de datos '{self.db_name}': {e}")
+        if self._on_open:
+            self._on_open(time.perf_counter() - start)
+        
+        with self._lock:
+            self._prune_dead_threads()
+            self._connections[conn] = threading.current_thread()
+            self.opened_count += 1
+        return conn
+    
+    def _prune_dead_threads(self):
+        """Cierra las conexiones cuyos hilos ya terminaron (llamar con el lock tomado)."""
+        for conn, thread in list(self._connections.items()):
+            if not thread.is_alive():
+                del self._connections[conn]
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+    
+    def checkout(self):
+        """Entrega la conexión del hilo actual, abriéndola si todavía no existe."""
+        conn = getattr(self._local, "connection", None)
+        with self._lock:
+            is_alive = conn is not None and conn in self._connections
+            if is_alive:
+                self.reused_count += 1
+        if not is_alive:
+            conn = self._open()
+            self._local.connection = conn
+            self._local.depth = 0
+        self._local.depth += 1
+        return conn
+    
+    def checkin(self, conn):
+        """Devuelve la conexión al administrador; queda abierta para el siguiente uso del hilo."""
+        self._local.depth = max(getattr(self._local, "depth", 1) - 1, 0)
+        if self._local.depth == 0 and conn.in_transaction:
+            # No dejar transacciones colgadas entre operaciones
+            conn.rollback()
+    
+    @contextmanager
+    def connection(self):
+        """Context manager que hace checkout de la conexión y la devuelve al salir."""
+        conn = self.checkout()
+        try:
+            yield conn
+        finally:
+            self.checkin(conn)
+    
+    def interrupt(self, thread):
+        """Interrumpe la consulta que esté ejecutando la conexión de ese hilo (si tiene una)."""
+        with self._lock:
+            connections = [conn for conn, owner in self._connections.items() if owner is thread]
+        for conn in connections:
+            conn.interrupt() # La consulta en curso falla con sqlite3.OperationalError: interrupted
+    
+    def close_all(self):
+        """Cierra todas las conexiones abiertas. Se reabrirán bajo demanda si se vuelven a pedir."""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error al cerrar conexión: {e}")
+    
+    def get_stats(self):
+        """Devuelve cuántas conexiones se abrieron y cuántas veces se reutilizaron."""
+        with self._lock:
+            return {
+                "abiertas": self.opened_count,
+                "reutilizadas": self.reused_count,
+                "activas": len(self._connections)
+            }
 
 class TaskDAO:
     """Clase que maneja todas las operaciones de acceso a datos para las tareas."""
     
-    def __init__(self, db_name="database.db"):
-        """Inicializa el DAO con la conexión a la base de datos."""
+    # Pesos BM25 por columna de tareas_fts: cedula, nombre, apellido, curso, turno, accion
+    FTS_RANK_WEIGHTS = (10.0, 5.0, 5.0, 1.0, 1.0, 2.0)
+    
+    DEFAULT_PAGE_SIZE = 200
+    EXPORT_CHUNK_SIZE = 2000 # Filas por bloque al recorrer toda la tabla (exportación)
+    IMPORT_CHUNK_SIZE = 5000 # Filas por transacción al importar un CSV
+    
+    # Columnas por las que se puede agrupar en los informes, y formato strftime de cada periodo
+    REPORT_DIMENSIONS = ("curso", "turno", "status")
+    REPORT_PERIODS = {"day": "%Y-%m-%d", "week": "%Y-S%W", "month": "%Y-%m", "year": "%Y"}
+    CHANGE_LOG_RETENTION = 50000 # Entradas de tareas_cambios que se conservan (se recorta al iniciar y tras cada lote)
+    
+    # Columnas en el orden de TASK_FIELDS, que es el que esperan Task.from_row y task_row_factory
+    SELECT_TASK_SQL = """
+        SELECT id, cedula, nombre, apellido, curso, turno, accion,
+        fecha_creacion, fecha_completado, status FROM tareas
+    """
+    
+    def __init__(self, db_name="database.db", profile=None, instrumentation=None):
+        """
+        Inicializa el DAO con la conexión a la base de datos y su perfil de rendimiento.
+        instrumentation: DAOInstrumentation; por defecto se activa o no según DB_INSTRUMENTATION del .env.
+        """
         self.db_name = db_name
+        self.profile = profile or DatabaseProfile.from_env()
+        self.instrumentation = instrumentation or DAOInstrumentation.from_env()
         self._ensure_db_path_exists() # Asegurar que el directorio de la BD exista
+        self.connection_manager = ConnectionManager(db_name, on_connect=self._configure_connection,
+                                                    on_open=self.instrumentation.record_connection_open)
+        self.fts_enabled = False # Se determina en setup_database (sync_fulltext_index)
+        self.instrumentation.instrument(self)
         self.setup_database()
         
     def _ensure_db_path_exists(self):
@@ -28,15 +170,42 @@ class TaskDAO:
                 # Podría ser un problema de permisos o que la ruta no es válida
                 raise Exception(f"No se pudo crear el directorio para la base de datos '{db_dir}': {e}")
 
+    def _configure_connection(self, conn):
+        """Configura cada conexión nueva: PRAGMAs del perfil y, si está activa, la traza de SQL."""
+        self.profile.apply(conn)
+        self.instrumentation.attach(conn)
+
+    @contextmanager
     def _get_connection(self):
-        """Retorna una nueva conexión a la base de datos."""
-        try:
-            return sqlite3.connect(self.db_name)
-        except sqlite3.Error as e:
-            raise Exception(f"Error al conectar con la base de datos '{self.db_name}': {e}")
+        """Entrega la conexión persistente del hilo actual y gestiona la transacción (commit/rollback)."""
+        with self.connection_manager.connection() as conn:
+            with conn:
+                yield conn
+    
+    def close(self):
+        """Cierra todas las conexiones abiertas por el DAO, haciendo checkpoint del WAL si está configurado."""
+        if self.profile.checkpoint_on_close:
+            try:
+                with self.connection_manager.connection() as conn:
+                    self.profile.checkpoint(conn)
+            except Exception as e:
+                print(f"Error al hacer checkpoint antes de cerrar: {e}")
+        self.connection_manager.close_all()
+    
+    def get_connection_stats(self):
+        """Devuelve las estadísticas de conexiones abiertas versus reutilizadas."""
+        return self.connection_manager.get_stats()
+
+    def interrupt(self, thread):
+        """Interrumpe la consulta que esté ejecutando ese hilo (ver ConnectionManager.interrupt)."""
+        self.connection_manager.interrupt(thread)
+
+    def get_instrumentation_stats(self):
+        """Devuelve las estadísticas de la instrumentación (vacías si no está activada)."""
+        return self.instrumentation.snapshot()
 
     def setup_database(self):
-        """Configura la base de datos y crea la tabla si no existe."""
+        """Configura la base de datos, crea la tabla si no existe y aplica las migraciones pendientes."""
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
@@ -56,10 +225,23 @@ class TaskDAO:
                     )
                 ''')
                 conn.commit()
+                apply_migrations(conn) # Índices y cambios de esquema versionados (PRAGMA user_version)
+                # Sin FTS5 en este SQLite se quitan los triggers de tareas_fts y se busca con LIKE
+                self.fts_enabled = sync_fulltext_index(conn)
+                self._prune_change_log(cursor)
         except sqlite3.Error as e:
             # Envolver el error de SQLite en una excepción más genérica o específica de la app
             raise Exception(f"Error al configurar la tabla 'tareas': {e}")
     
+    def _prune_change_log(self, cursor):
+        """
+        Recorta tareas_cambios a las últimas CHANGE_LOG_RETENTION entradas; los clientes que se
+        queden atrás recargan todo. Va en la misma transacción que la escritura que lo llena
+        (importación, operaciones en lote), así el registro no crece sin límite hasta el próximo inicio.
+        """
+        cursor.execute("DELETE FROM tareas_cambios WHERE seq <= (SELECT MAX(seq) FROM tareas_cambios) - ?",
+                       (self.CHANGE_LOG_RETENTION,))
+
     def migrate_from_csv(self, csv_file="alumnos_pendientes.csv"):
         """Migra datos desde CSV si existe el archivo y la BD está vacía."""
         if not os.path.exists(csv_file):
@@ -69,45 +251,173 @@ class TaskDAO:
         if self.has_data():
             print("La base de datos ya contiene datos. No se realizará la migración desde CSV.")
             return False
-            
+        
+        stats = self.import_from_csv(csv_file, mode="skip")
+        if stats["insertadas"]:
+            print(f"Migración desde '{csv_file}' completada. {stats['insertadas']} tareas importadas, "
+                  f"{stats['rechazadas']} rechazadas.")
+            return True
+        print(f"No se encontraron datos válidos en '{csv_file}' para migrar.")
+        return False
+    
+    def get_import_checkpoint(self, csv_file):
+        """
+        Devuelve la cantidad de filas de 'csv_file' ya importadas por una importación que no terminó, o None
+        si no hay nada que reanudar (o el archivo cambió desde entonces).
+        """
+        checkpoint = self._read_import_checkpoint(csv_file)
+        return checkpoint[0] if checkpoint else None
+
+    def _read_import_checkpoint(self, csv_file):
+        """(filas importadas, tamaño del archivo de rechazos o None) del punto de reanudación vigente, o None."""
+        path = os.path.abspath(csv_file)
         try:
-            with self._get_connection() as conn, open(csv_file, newline="", encoding="utf-8") as f:
-                cursor = conn.cursor()
-                reader = csv.DictReader(f)
-                tasks_to_insert = []
-                for row in reader:
-                    # Validar datos mínimos o usar valores por defecto más robustos
-                    task_data = (
-                        row.get("cedula") or f"cedula_faltante_{datetime.now().timestamp()}", # Evitar duplicados si falta cédula
-                        row.get("nombre") or "Nombre no especificado",
-                        row.get("apellido") or "Apellido no especificado",
-                        row.get("curso") or "Curso no especificado",
-                        row.get("turno") or "Turno no especificado",
-                        row.get("accion") or "Acción pendiente no especificada",
-                        row.get("fecha_creacion") or datetime.now().strftime("%d/%m/%Y %H:%M"),
-                        row.get("fecha_completado") or "",
-                        row.get("status") or "pendiente"
-                    )
-                    tasks_to_insert.append(task_data)
+            stat = os.stat(path)
+            with self._get_connection() as conn:
+                row = conn.execute("SELECT tamano, modificado, filas, rechazos FROM importaciones_csv WHERE archivo = ?",
+                                   (path,)).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            raise Exception(f"Error al leer el progreso de la importación de '{csv_file}': {e}")
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime:
+            return row[2], row[3]
+        return None
+    
+    def import_from_csv(self, csv_file, mode="skip", chunk_size=IMPORT_CHUNK_SIZE, resume=True,
+                        reject_file=None, on_progress=None, cancel_event=None, workers=None):
+        """
+        Importa tareas desde un CSV de cualquier tamaño, leyéndolo por bloques de 'chunk_size' filas.
+        Cada bloque se guarda en su propia transacción, junto con el número de filas procesadas: si la
+        importación se interrumpe, al volver a llamarla con el mismo archivo (sin cambios) continúa desde
+        el último bloque confirmado (a menos que resume=False).
+        mode: 'skip' deja como están las tareas cuya cédula ya existe; 'upsert' las actualiza con los datos
+        del CSV (manteniendo su fecha de creación). Si una cédula se repite en el archivo, gana la primera
+        fila con 'skip' y la última con 'upsert'.
+        Las filas inválidas se rechazan y se escriben en 'reject_file' (por defecto '<archivo>.rechazos.csv')
+        con su número de línea y el motivo; al reanudar, el archivo se recorta al tamaño que tenía en el
+        último bloque confirmado, así ningún rechazo se pierde ni se repite.
+        on_progress(filas_leidas, fraccion_del_archivo) se llama después de cada bloque; cancel_event
+        (threading.Event) detiene la importación al terminar el bloque en curso (se puede reanudar).
+        workers: procesos que leen y validan el archivo en paralelo (por defecto IMPORT_WORKERS del .env;
+        0 = uno por núcleo). La escritura en la BD la hace siempre este hilo, en el orden del archivo.
+        Devuelve un diccionario con las estadísticas de la importación.
+        """
+        if mode not in ("skip", "upsert"):
+            raise ValueError(f"Modo de importación no válido: '{mode}'. Opciones: 'skip', 'upsert'.")
+        if chunk_size <= 0:
+            raise ValueError("El tamaño de bloque debe ser mayor que cero.")
+        path = os.path.abspath(csv_file)
+        if not os.path.exists(path):
+            raise Exception(f"Archivo CSV '{csv_file}' no encontrado.")
+        
+        if workers is None:
+            workers = int(os.getenv("IMPORT_WORKERS", "0"))
+        workers = workers if workers > 0 else (os.cpu_count() or 1)
+        
+        stat = os.stat(path)
+        reject_file = reject_file or os.path.splitext(path)[0] + ".rechazos.csv"
+        checkpoint = self._read_import_checkpoint(path) if resume else None
+        start_row, rejects_size = checkpoint or (0, None)
+        if start_row and rejects_size is not None and os.path.exists(reject_file) \
+                and os.path.getsize(reject_file) > rejects_size:
+            # Rechazos escritos por un bloque que no llegó a confirmarse: se vuelven a generar
+            os.truncate(reject_file, rejects_size)
+        stats = {"leidas": 0, "insertadas": 0, "actualizadas": 0, "omitidas": 0, "rechazadas": 0,
+                 "reanudada_desde": start_row, "cancelado": False, "archivo_rechazos": None,
+                 "segundos": 0.0, "filas_por_segundo": 0.0, "procesos": workers}
+        started = time.perf_counter()
+        progress = [0.0] # Fracción del archivo leída, la actualiza iter_parsed_rows
+        rows = iter_parsed_rows(path, workers, progress)
+        
+        try:
+            with open(reject_file, "a" if start_row else "w", newline="", encoding="utf-8-sig") as rejects:
+                reject_writer = csv.writer(rejects)
+                if rejects.tell() == 0:
+                    reject_writer.writerow(("linea", "cedula", "motivo"))
                 
-                if tasks_to_insert:
-                    cursor.executemany('''
-                        INSERT OR IGNORE INTO tareas 
-                        (cedula, nombre, apellido, curso, turno, accion, 
-                         fecha_creacion, fecha_completado, status)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', tasks_to_insert) # Usar executemany para inserción masiva
-                    conn.commit()
-                    print(f"Migración desde '{csv_file}' completada. {len(tasks_to_insert)} tareas procesadas.")
-                    return True
-                else:
-                    print(f"No se encontraron datos válidos en '{csv_file}' para migrar.")
-                    return False
-        except sqlite3.Error as e:
-            raise Exception(f"Error de base de datos durante la migración desde CSV: {e}")
-        except Exception as e:
-            raise Exception(f"Error general durante la migración desde CSV: {e}")
+                rows_done = 0 # Filas de datos procesadas (incluidas las de una ejecución anterior)
+                chunk, chunk_rejects = {}, []
+                for line_number, cedula, values, reason in rows:
+                    rows_done += 1
+                    if rows_done <= start_row:
+                        continue # Ya importada antes de la interrupción
+                    if reason:
+                        chunk_rejects.append((line_number, cedula, reason))
+                    elif values[0] in chunk and mode == "skip":
+                        stats["omitidas"] += 1 # Cédula repetida en el archivo: gana la primera
+                    else:
+                        if values[0] in chunk:
+                            stats["omitidas"] += 1 # Con 'upsert' gana la última
+                        chunk[values[0]] = values
+                    
+                    if rows_done - start_row - stats["leidas"] >= chunk_size:
+                        self._import_chunk(chunk, chunk_rejects, rows_done, path, stat, mode, stats, rejects)
+                        chunk, chunk_rejects = {}, []
+                        if on_progress:
+                            on_progress(stats["leidas"] + start_row, progress[0])
+                        if cancel_event is not None and cancel_event.is_set():
+                            stats["cancelado"] = True
+                            break
                 
+                if not stats["cancelado"]:
+                    if rows_done - start_row > stats["leidas"]:
+                        self._import_chunk(chunk, chunk_rejects, rows_done, path, stat, mode, stats, rejects)
+                    # Terminada: ya no hay nada que reanudar
+                    with self._get_connection() as conn:
+                        conn.execute("DELETE FROM importaciones_csv WHERE archivo = ?", (path,))
+        except sqlite3.Error as e:
+            raise Exception(f"Error de base de datos durante la importación desde '{csv_file}': {e}")
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            raise Exception(f"Error al leer el archivo '{csv_file}': {e}")
+        finally:
+            rows.close() # Detiene los procesos de lectura si la importación terminó antes de tiempo
+        
+        if stats["rechazadas"]:
+            stats["archivo_rechazos"] = reject_file
+        elif not start_row and os.path.exists(reject_file):
+            os.remove(reject_file) # Sin rechazos: no dejar un archivo vacío
+        stats["segundos"] = time.perf_counter() - started
+        if stats["segundos"] > 0:
+            stats["filas_por_segundo"] = stats["leidas"] / stats["segundos"]
+        return stats
+    
+    def _import_chunk(self, chunk, chunk_rejects, rows_done, path, stat, mode, stats, rejects):
+        """
+        Guarda un bloque de la importación y su punto de reanudación en una misma transacción.
+        Los rechazos del bloque se escriben en disco antes del commit y el punto de reanudación guarda
+        el tamaño del archivo de rechazos: si el proceso muere entre ambos, al reanudar se recortan.
+        """
+        csv.writer(rejects).writerows(chunk_rejects)
+        rejects.flush()
+        os.fsync(rejects.fileno())
+        rejects_size = os.fstat(rejects.fileno()).st_size
+        values = list(chunk.values())
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            if mode == "upsert" and values:
+                # Sin UPSERT de SQLite (3.24+): primero actualizar las existentes, después insertar las nuevas
+                cursor.executemany('''
+                    UPDATE tareas SET nombre = ?, apellido = ?, curso = ?, turno = ?, accion = ?,
+                    fecha_completado = ?, status = ? WHERE cedula = ?
+                ''', [v[1:6] + v[7:9] + (v[0],) for v in values])
+                stats["actualizadas"] += max(cursor.rowcount, 0)
+            if values:
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO tareas
+                    (cedula, nombre, apellido, curso, turno, accion, fecha_creacion, fecha_completado, status)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', values)
+                inserted = max(cursor.rowcount, 0)
+                stats["insertadas"] += inserted
+                if mode == "skip":
+                    stats["omitidas"] += len(values) - inserted # Ya existían
+            cursor.execute('''
+                INSERT OR REPLACE INTO importaciones_csv (archivo, tamano, modificado, modo, filas, actualizado, rechazos)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (path, stat.st_size, stat.st_mtime, mode, rows_done, Util.now_timestamp(), rejects_size))
+            self._prune_change_log(cursor)
+        stats["rechazadas"] += len(chunk_rejects)
+        stats["leidas"] = rows_done - stats["reanudada_desde"]
+    
     def has_data(self):
         """Verifica si la base de datos ya tiene registros."""
         try:
@@ -121,129 +431,520 @@ class TaskDAO:
             print(f"Error al verificar si hay datos: {e}")
             return False # Asumir que no hay datos si hay un error
     
+    def _execute_insert(self, cursor, task):
+        """Ejecuta el INSERT de una tarea (sin confirmar) y le asigna su ID."""
+        cursor.execute('''
+            INSERT INTO tareas 
+            (cedula, nombre, apellido, curso, turno, accion, 
+             fecha_creacion, fecha_completado, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            task.cedula,
+            task.nombre,
+            task.apellido,
+            task.curso,
+            task.turno,
+            task.accion,
+            Util.to_storage_date(task.fecha_creacion) or task.fecha_creacion,
+            Util.to_storage_date(task.fecha_completado) or task.fecha_completado,
+            task.status
+        ))
+        task.id = cursor.lastrowid
+        return task
+
+    def _execute_update(self, cursor, task):
+        """Ejecuta el UPDATE de una tarea (sin confirmar)."""
+        cursor.execute('''
+            UPDATE tareas SET 
+            cedula = ?, nombre = ?, apellido = ?, curso = ?, 
+            turno = ?, accion = ?, fecha_completado = ?, status = ?
+            WHERE id = ?
+        ''', (
+            task.cedula,
+            task.nombre,
+            task.apellido,
+            task.curso,
+            task.turno,
+            task.accion,
+            Util.to_storage_date(task.fecha_completado) or task.fecha_completado,
+            task.status,
+            task.id
+        ))
+        if cursor.rowcount == 0:
+            # Esto podría significar que el ID no existe, o que los datos eran iguales
+            # Para ser más precisos, se podría verificar si el ID existe antes de actualizar
+            print(f"Advertencia: No se actualizó ninguna fila para la tarea con ID {task.id}. Puede que no exista o los datos sean idénticos.")
+        return task # Devolver la tarea actualizada (o la original si no hubo cambios)
+
+    def _execute_delete(self, cursor, task_id):
+        """Ejecuta el DELETE de una tarea (sin confirmar)."""
+        cursor.execute("DELETE FROM tareas WHERE id = ?", (task_id,))
+        if cursor.rowcount == 0:
+            # Si no se eliminó ninguna fila, es porque el ID no existía
+            raise Exception(f"No se encontró la tarea con ID {task_id} para eliminar.")
+        return True
+
+    def _write_error(self, operation, arg, error):
+        """
+        Traduce el error de SQLite de una escritura a la excepción que ve el usuario. La cédula
+        repetida es un ValueError, como en TaskService (y en RemoteTaskDAO, que recibe un 400).
+        """
+        if operation == "delete":
+            return Exception(f"Error de base de datos al eliminar tarea: {error}")
+        action = "insertar" if operation == "insert" else "actualizar"
+        if isinstance(error, sqlite3.IntegrityError):
+            if "UNIQUE constraint failed: tareas.cedula" in str(error):
+                if operation == "insert":
+                    return ValueError(f"Error: La cédula '{arg.cedula}' ya existe en la base de datos.")
+                return ValueError(f"Error: La cédula '{arg.cedula}' ya pertenece a otro registro.")
+            return Exception(f"Error de integridad al {action} tarea: {error}")
+        return Exception(f"Error de base de datos al {action} tarea: {error}")
+
     def insert_task(self, task):
         """Inserta una nueva tarea en la base de datos."""
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO tareas 
-                    (cedula, nombre, apellido, curso, turno, accion, 
-                     fecha_creacion, fecha_completado, status)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    task.cedula,
-                    task.nombre,
-                    task.apellido,
-                    task.curso,
-                    task.turno,
-                    task.accion,
-                    task.fecha_creacion,
-                    task.fecha_completado,
-                    task.status
-                ))
-                task.id = cursor.lastrowid
+                self._execute_insert(conn.cursor(), task)
                 conn.commit()
                 return task
-        except sqlite3.IntegrityError as e: # Capturar error de unicidad de cédula
-            if "UNIQUE constraint failed: tareas.cedula" in str(e):
-                raise Exception(f"Error: La cédula '{task.cedula}' ya existe en la base de datos.")
-            else:
-                raise Exception(f"Error de integridad al insertar tarea: {e}")
         except sqlite3.Error as e:
-            raise Exception(f"Error de base de datos al insertar tarea: {e}")
-    
+            raise self._write_error("insert", task, e)
+
+    def insert_task_rows(self, rows, chunk_size=IMPORT_CHUNK_SIZE, on_progress=None):
+        """
+        Inserta muchas tareas ya validadas con executemany, en una transacción por cada bloque de
+        'chunk_size' filas. 'rows' es un iterable de tuplas (cedula, nombre, apellido, curso, turno,
+        accion, fecha_creacion, fecha_completado, status) con las fechas en el formato de la BD.
+        Las cédulas que ya existen se ignoran. on_progress(filas_procesadas) se llama tras cada bloque.
+        Devuelve (insertadas, ignoradas).
+        """
+        inserted = ignored = 0
+        rows = iter(rows)
+        try:
+            while True:
+                chunk = list(islice(rows, chunk_size))
+                if not chunk:
+                    break
+                with self._get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.executemany('''
+                        INSERT OR IGNORE INTO tareas
+                        (cedula, nombre, apellido, curso, turno, accion, fecha_creacion, fecha_completado, status)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', chunk)
+                    done = max(cursor.rowcount, 0)
+                    self._prune_change_log(cursor)
+                    conn.commit()
+                inserted += done
+                ignored += len(chunk) - done
+                if on_progress:
+                    on_progress(inserted + ignored)
+            return inserted, ignored
+        except sqlite3.Error as e:
+            raise Exception(f"Error de base de datos al insertar tareas en bloque: {e}")
+
     def update_task(self, task):
         """Actualiza una tarea existente en la base de datos."""
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE tareas SET 
-                    cedula = ?, nombre = ?, apellido = ?, curso = ?, 
-                    turno = ?, accion = ?, fecha_completado = ?, status = ?
-                    WHERE id = ?
-                ''', (
-                    task.cedula,
-                    task.nombre,
-                    task.apellido,
-                    task.curso,
-                    task.turno,
-                    task.accion,
-                    task.fecha_completado,
-                    task.status,
-                    task.id
-                ))
+                self._execute_update(conn.cursor(), task)
                 conn.commit()
-                if cursor.rowcount == 0:
-                    # Esto podría significar que el ID no existe, o que los datos eran iguales
-                    # Para ser más precisos, se podría verificar si el ID existe antes de actualizar
-                    print(f"Advertencia: No se actualizó ninguna fila para la tarea con ID {task.id}. Puede que no exista o los datos sean idénticos.")
-                    # Devolver la tarea original si no hubo cambios o no se encontró
-                    # Opcionalmente, se podría lanzar una excepción si se espera que siempre exista
-                return task # Devolver la tarea actualizada (o la original si no hubo cambios)
-        except sqlite3.IntegrityError as e: # Capturar error de unicidad de cédula
-            if "UNIQUE constraint failed: tareas.cedula" in str(e):
-                raise Exception(f"Error: La cédula '{task.cedula}' ya pertenece a otro registro.")
-            else:
-                raise Exception(f"Error de integridad al actualizar tarea: {e}")
-        except sqlite3.Error as e:
-            raise Exception(f"Error de base de datos al actualizar tarea: {e}")
+                return task
+        except sqlite3.Error as e:
+            raise self._write_error("update", task, e)
     
     def delete_task(self, task_id):
         """Elimina una tarea por su ID."""
+        try:
+            with self._get_connection() as conn:
+                result = self._execute_delete(conn.cursor(), task_id)
+                conn.commit()
+                return result
+        except sqlite3.Error as e:
+            raise self._write_error("delete", task_id, e)
+
+    def update_status_many(self, task_ids, status):
+        """
+        Cambia el estado de varias tareas con un executemany en una sola transacción. Al completar
+        se guarda la fecha actual; al volver a pendiente se borra. Las tareas que ya tenían ese
+        estado no se tocan (conservan su fecha de completado). Devuelve cuántas tareas cambiaron.
+        """
+        completed_at = Util.now_timestamp() if status == "completada" else ""
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
-                cursor.execute("DELETE FROM tareas WHERE id = ?", (task_id,))
+                cursor.executemany(
+                    "UPDATE tareas SET status = ?, fecha_completado = ? WHERE id = ? AND status <> ?",
+                    [(status, completed_at, task_id, status) for task_id in task_ids])
+                changed = max(cursor.rowcount, 0)
+                self._prune_change_log(cursor)
                 conn.commit()
-                if cursor.rowcount == 0:
-                    # Si no se eliminó ninguna fila, es porque el ID no existía
-                    raise Exception(f"No se encontró la tarea con ID {task_id} para eliminar.")
-                return True
+                return changed
         except sqlite3.Error as e:
-            raise Exception(f"Error de base de datos al eliminar tarea: {e}")
+            raise Exception(f"Error de base de datos al cambiar el estado de las tareas: {e}")
+
+    def delete_many(self, task_ids):
+        """Elimina varias tareas con un executemany en una sola transacción. Devuelve cuántas se eliminaron."""
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany("DELETE FROM tareas WHERE id = ?", [(task_id,) for task_id in task_ids])
+                deleted = max(cursor.rowcount, 0)
+                self._prune_change_log(cursor)
+                conn.commit()
+                return deleted
+        except sqlite3.Error as e:
+            raise Exception(f"Error de base de datos al eliminar tareas: {e}")
+
+    def apply_task_writes(self, operations):
+        """
+        Ejecuta varias escrituras en una sola transacción (un solo commit). 'operations' es una
+        lista de (operación, argumento): ("insert", Task), ("update", Task) o ("delete", task_id).
+        Cada escritura va en su propio SAVEPOINT, así que si una falla (cédula repetida, ID
+        inexistente) se deshace solo esa y las demás se confirman igual.
+        Devuelve una lista con (True, resultado) o (False, excepción) por cada operación, en orden.
+        """
+        executors = {"insert": self._execute_insert, "update": self._execute_update,
+                     "delete": self._execute_delete}
+        results = []
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                for operation, arg in operations:
+                    cursor.execute("SAVEPOINT escritura")
+                    try:
+                        results.append((True, executors[operation](cursor, arg)))
+                    except sqlite3.Error as e:
+                        cursor.execute("ROLLBACK TO escritura")
+                        results.append((False, self._write_error(operation, arg, e)))
+                    except Exception as e:
+                        cursor.execute("ROLLBACK TO escritura")
+                        results.append((False, e))
+                    cursor.execute("RELEASE escritura")
+                self._prune_change_log(cursor)
+                conn.commit()
+            return results
+        except sqlite3.Error as e:
+            raise Exception(f"Error de base de datos al aplicar escrituras en lote: {e}")
     
     def _map_row_to_task(self, row):
         """Mapea una fila de la base de datos a un objeto Task."""
         if not row: return None
-        return Task(
-            id=row[0],
-            cedula=row[1],
-            nombre=row[2],
-            apellido=row[3],
-            curso=row[4],
-            turno=row[5],
-            accion=row[6],
-            fecha_creacion=row[7],
-            fecha_completado=row[8],
-            status=row[9]
-        )
+        return Task.from_row(row)
+    
+    @staticmethod
+    def _task_cursor(conn):
+        """Cursor cuyas filas se convierten directamente en Task (sin tuplas intermedias)."""
+        cursor = conn.cursor()
+        cursor.row_factory = task_row_factory
+        return cursor
 
     def get_all_tasks(self):
         """Obtiene todas las tareas de la base de datos."""
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
+                cursor = self._task_cursor(conn)
                 cursor.execute('''
                     SELECT id, cedula, nombre, apellido, curso, turno, accion, 
                     fecha_creacion, fecha_completado, status FROM tareas ORDER BY id DESC
                 ''') # Ordenar por ID descendente para mostrar las más recientes primero
-                return [self._map_row_to_task(row) for row in cursor.fetchall()]
+                return cursor.fetchall()
         except sqlite3.Error as e:
             raise Exception(f"Error al obtener todas las tareas: {e}")
     
+    def iter_task_rows(self, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Recorre todas las tareas (las más recientes primero) en bloques de hasta 'chunk_size' filas.
+        Cada fila es una tupla en el orden de TASK_FIELDS (sin crear objetos Task). Usa fetchmany sobre
+        un único cursor, así que la memoria no depende del tamaño de la tabla. La conexión del hilo queda
+        ocupada hasta terminar (o cerrar) el generador.
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.arraysize = chunk_size
+                cursor.execute(self.SELECT_TASK_SQL + " ORDER BY id DESC")
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    yield rows
+        except sqlite3.Error as e:
+            raise Exception(f"Error al recorrer las tareas: {e}")
+    
+    def get_tasks_by_status(self, status):
+        """Obtiene las tareas con el estado indicado, las más recientes primero (usa idx_tareas_status_id)."""
+        try:
+            with self._get_connection() as conn:
+                cursor = self._task_cursor(conn)
+                cursor.execute(self.SELECT_TASK_SQL + " WHERE status = ? ORDER BY id DESC", (status,))
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            raise Exception(f"Error al obtener tareas con estado '{status}': {e}")
+    
+    def find_tasks(self, status=None, curso=None, turno=None):
+        """Obtiene las tareas filtradas por estado, curso y/o turno (cada filtro es opcional)."""
+        conditions = []
+        params = []
+        for column, value in (("status", status), ("curso", curso), ("turno", turno)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        
+        query = self.SELECT_TASK_SQL
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC"
+        try:
+            with self._get_connection() as conn:
+                cursor = self._task_cursor(conn)
+                cursor.execute(query, tuple(params))
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            raise Exception(f"Error al filtrar tareas: {e}")
+    
+    def get_tasks_by_date_range(self, desde=None, hasta=None, status=None, column="fecha_creacion"):
+        """
+        Obtiene las tareas cuya fecha ('fecha_creacion' o 'fecha_completado') está en el intervalo
+        [desde, hasta), ordenadas de la más antigua a la más reciente. Los límites pueden ser datetime,
+        date o texto en un formato reconocido por Util.to_storage_date; None deja el extremo abierto.
+        Como las fechas se guardan en ISO-8601, el filtro es una comparación de texto que usa los índices.
+        """
+        if column not in ("fecha_creacion", "fecha_completado"):
+            raise ValueError(f"Columna de fecha no válida: '{column}'.")
+        
+        conditions = [f"{column} <> ''"] # Las tareas pendientes no tienen fecha_completado
+        params = []
+        for operator, value in ((">=", desde), ("<", hasta)):
+            if value is None:
+                continue
+            storage_date = Util.to_storage_date(value)
+            if storage_date is None:
+                raise ValueError(f"Fecha no válida: '{value}'.")
+            conditions.append(f"{column} {operator} ?")
+            params.append(storage_date)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        
+        query = self.SELECT_TASK_SQL + " WHERE " + " AND ".join(conditions) + f" ORDER BY {column}, id"
+        try:
+            with self._get_connection() as conn:
+                cursor = self._task_cursor(conn)
+                cursor.execute(query, tuple(params))
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            raise Exception(f"Error al obtener tareas por rango de fechas: {e}")
+    
+    def get_oldest_pending_tasks(self, limit=DEFAULT_PAGE_SIZE):
+        """Obtiene las tareas pendientes más antiguas primero (usa idx_tareas_status_fecha)."""
+        try:
+            with self._get_connection() as conn:
+                cursor = self._task_cursor(conn)
+                cursor.execute(self.SELECT_TASK_SQL + " WHERE status = 'pendiente' ORDER BY fecha_creacion, id LIMIT ?",
+                               (limit,))
+                return cursor.fetchall()
+        except sqlite3.Error as e:
+            raise Exception(f"Error al obtener las tareas pendientes más antiguas: {e}")
+    
+    def get_group_counts(self, dimensions=REPORT_DIMENSIONS, status=None):
+        """
+        Cuenta las tareas agrupadas por las columnas indicadas (GROUP BY en SQLite, sin traer filas a Python).
+        Devuelve tuplas (valor de cada dimensión..., cantidad), p. ej. ('1° Año', 'Mañana', 'pendiente', 42).
+        """
+        dimensions = tuple(dimensions)
+        if not dimensions or any(d not in self.REPORT_DIMENSIONS for d in dimensions):
+            raise ValueError(f"Dimensiones no válidas: {dimensions}. Opciones: {self.REPORT_DIMENSIONS}.")
+        columns = ", ".join(dimensions)
+        query = f"SELECT {columns}, COUNT(*) FROM tareas"
+        params = ()
+        if status is not None:
+            query += " WHERE status = ?"
+            params = (status,)
+        query += f" GROUP BY {columns} ORDER BY {columns}"
+        try:
+            with self._get_connection() as conn:
+                return conn.execute(query, params).fetchall()
+        except sqlite3.Error as e:
+            raise Exception(f"Error al contar tareas por {columns}: {e}")
+    
+    def get_period_counts(self, period="month"):
+        """
+        Cuenta las tareas creadas y completadas en cada periodo ('day', 'week', 'month' o 'year').
+        Devuelve tuplas (periodo, creadas, completadas) ordenadas por periodo, p. ej. ('2024-03', 120, 87).
+        Las semanas se etiquetan 'AAAA-Snn' (semana del año que empieza en lunes).
+        """
+        if period not in self.REPORT_PERIODS:
+            raise ValueError(f"Periodo no válido: '{period}'. Opciones: {tuple(self.REPORT_PERIODS)}.")
+        fmt = self.REPORT_PERIODS[period]
+        try:
+            with self._get_connection() as conn:
+                # Ambas fechas están en ISO-8601, así que strftime las agrupa sin conversiones en Python
+                return conn.execute('''
+                    SELECT periodo, SUM(creadas), SUM(completadas) FROM (
+                        SELECT strftime(?, fecha_creacion) AS periodo, COUNT(*) AS creadas, 0 AS completadas
+                        FROM tareas GROUP BY periodo
+                        UNION ALL
+                        SELECT strftime(?, fecha_completado), 0, COUNT(*)
+                        FROM tareas WHERE fecha_completado > '' GROUP BY 1
+                    )
+                    WHERE periodo IS NOT NULL
+                    GROUP BY periodo ORDER BY periodo
+                ''', (fmt, fmt)).fetchall()
+        except sqlite3.Error as e:
+            raise Exception(f"Error al contar tareas por periodo '{period}': {e}")
+    
+    def get_report(self, period="month"):
+        """
+        Genera el informe completo (totales, por curso, por turno, curso × turno × estado y por periodo)
+        con dos consultas agregadas, en lugar de cargar todas las tareas y contarlas en Python.
+        """
+        return Util.build_report(self.get_group_counts(), self.get_period_counts(period), period)
+    
+    def get_counters(self):
+        """
+        Totales de tareas leídos de tareas_resumen (mantenida por triggers), sin recorrer 'tareas'.
+        Devuelve {'total': n, 'status': {...}, 'curso': {...}, 'turno': {...}}.
+        """
+        counters = {dimension: {} for dimension in COUNTER_DIMENSIONS}
+        try:
+            with self._get_connection() as conn:
+                for dimension, valor, cantidad in conn.execute(
+                        "SELECT dimension, valor, cantidad FROM tareas_resumen WHERE cantidad <> 0 ORDER BY dimension, valor"):
+                    counters[dimension][valor] = cantidad
+        except sqlite3.Error as e:
+            raise Exception(f"Error al leer los totales de tareas: {e}")
+        counters["total"] = sum(counters["status"].values())
+        return counters
+    
+    def get_counter(self, dimension, valor):
+        """Cantidad de tareas con el valor indicado en una dimensión, p. ej. get_counter('status', 'pendiente')."""
+        if dimension not in COUNTER_DIMENSIONS:
+            raise ValueError(f"Dimensión no válida: '{dimension}'. Opciones: {COUNTER_DIMENSIONS}.")
+        try:
+            with self._get_connection() as conn:
+                row = conn.execute("SELECT cantidad FROM tareas_resumen WHERE dimension = ? AND valor = ?",
+                                   (dimension, valor)).fetchone()
+                return row[0] if row else 0
+        except sqlite3.Error as e:
+            raise Exception(f"Error al leer el total de {dimension} '{valor}': {e}")
+    
+    def verify_counters(self, rebuild=False):
+        """
+        Recalcula los totales desde 'tareas' y los compara con tareas_resumen.
+        Devuelve la lista de diferencias como tuplas (dimension, valor, guardado, real); con rebuild=True
+        además reemplaza tareas_resumen por los valores recalculados (en la misma transacción).
+        """
+        try:
+            with self._get_connection() as conn:
+                if rebuild:
+                    conn.execute("BEGIN IMMEDIATE") # Que nadie escriba entre el recálculo y el reemplazo
+                stored = {(dimension, valor): cantidad for dimension, valor, cantidad in
+                          conn.execute("SELECT dimension, valor, cantidad FROM tareas_resumen")}
+                actual = rebuild_counters(conn) if rebuild else compute_counters(conn)
+        except sqlite3.Error as e:
+            raise Exception(f"Error al verificar los totales de tareas: {e}")
+        
+        drift = []
+        for key in sorted(set(stored) | set(actual)):
+            if stored.get(key, 0) != actual.get(key, 0):
+                drift.append(key + (stored.get(key, 0), actual.get(key, 0)))
+        return drift
+    
+    def get_task_ids(self, status=None, query=None):
+        """
+        Obtiene solo los ids de las tareas (opcionalmente filtradas por estado y texto), en el orden
+        en que se muestran: los más recientes primero, o por relevancia si se busca con FTS5.
+        Es barato incluso con muchas filas porque se resuelve con índices sin leer las filas completas.
+        """
+        try:
+            match_query = self._build_fts_query(query) if query and self.fts_enabled else ""
+            if match_query:
+                try:
+                    weights = ", ".join(str(w) for w in self.FTS_RANK_WEIGHTS)
+                    sql = """
+                        SELECT t.id FROM tareas_fts JOIN tareas t ON t.id = tareas_fts.rowid
+                        WHERE tareas_fts MATCH ?
+                    """
+                    params = [match_query]
+                    if status is not None:
+                        sql += " AND t.status = ?"
+                        params.append(status)
+                    sql += f" ORDER BY bm25(tareas_fts, {weights}), t.id DESC"
+                    with self._get_connection() as conn:
+                        return [row[0] for row in conn.execute(sql, tuple(params))]
+                except sqlite3.OperationalError as e:
+                    print(f"Advertencia: búsqueda de texto completo no disponible, se usará LIKE: {e}")
+                    self.fts_enabled = False
+            
+            conditions = []
+            params = []
+            if query:
+                search_term = f'%{query.lower()}%'
+                conditions.append("(LOWER(cedula) LIKE ? OR LOWER(nombre) LIKE ? OR LOWER(apellido) LIKE ? OR "
+                                  "LOWER(curso) LIKE ? OR LOWER(turno) LIKE ? OR LOWER(accion) LIKE ?)")
+                params.extend([search_term] * 6)
+            if status is not None:
+                conditions.append("status = ?")
+                params.append(status)
+            sql = "SELECT id FROM tareas"
+            if conditions:
+                sql += " WHERE " + " AND ".join(conditions)
+            sql += " ORDER BY id DESC"
+            with self._get_connection() as conn:
+                return [row[0] for row in conn.execute(sql, tuple(params))]
+        except sqlite3.Error as e:
+            raise Exception(f"Error al obtener ids de tareas: {e}")
+    
+    def task_matches_query(self, task_id, query):
+        """Indica si una tarea coincide con el texto de búsqueda (misma semántica que search_tasks)."""
+        try:
+            match_query = self._build_fts_query(query) if self.fts_enabled else ""
+            with self._get_connection() as conn:
+                if match_query:
+                    row = conn.execute("SELECT 1 FROM tareas_fts WHERE tareas_fts MATCH ? AND rowid = ?",
+                                       (match_query, task_id)).fetchone()
+                else:
+                    search_term = f'%{query.lower()}%'
+                    row = conn.execute('''
+                        SELECT 1 FROM tareas WHERE id = ? AND (
+                        LOWER(cedula) LIKE ? OR LOWER(nombre) LIKE ? OR LOWER(apellido) LIKE ? OR
+                        LOWER(curso) LIKE ? OR LOWER(turno) LIKE ? OR LOWER(accion) LIKE ?)
+                    ''', (task_id,) + (search_term,) * 6).fetchone()
+                return row is not None
+        except sqlite3.Error as e:
+            raise Exception(f"Error al verificar si la tarea {task_id} coincide con '{query}': {e}")
+    
+    def get_tasks_by_ids(self, task_ids):
+        """Obtiene las tareas con los ids indicados, en el mismo orden. Los ids inexistentes se omiten."""
+        task_ids = list(task_ids)
+        tasks_by_id = {}
+        try:
+            with self._get_connection() as conn:
+                cursor = self._task_cursor(conn)
+                # Por lotes, para no superar el límite de parámetros de SQLite
+                for start in range(0, len(task_ids), 500):
+                    chunk = task_ids[start:start + 500]
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(self.SELECT_TASK_SQL + f" WHERE id IN ({placeholders})", tuple(chunk))
+                    for task in cursor.fetchall():
+                        tasks_by_id[task.id] = task
+        except sqlite3.Error as e:
+            raise Exception(f"Error al obtener tareas por ids: {e}")
+        return [tasks_by_id[task_id] for task_id in task_ids if task_id in tasks_by_id]
+    
     def get_task_by_id(self, task_id):
         """Obtiene una tarea por su ID."""
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
+                cursor = self._task_cursor(conn)
                 cursor.execute('''
                     SELECT id, cedula, nombre, apellido, curso, turno, accion, 
                     fecha_creacion, fecha_completado, status FROM tareas
                     WHERE id = ?
                 ''', (task_id,))
-                return self._map_row_to_task(cursor.fetchone())
+                return cursor.fetchone()
         except sqlite3.Error as e:
             raise Exception(f"Error al obtener tarea por ID '{task_id}': {e}")
     
@@ -267,10 +968,46 @@ class TaskDAO:
             return False # Asumir que no existe si hay error para evitar bloqueos, aunque podría ser riesgoso
     
     def search_tasks(self, query):
-        """Busca tareas por texto en múltiples columnas."""
+        """
+        Busca tareas por texto en múltiples columnas.
+        Usa el índice FTS5 (prefijos, sin distinguir acentos, ordenado por relevancia BM25) si está
+        disponible; si no, recurre a la búsqueda con LIKE.
+        """
+        match_query = self._build_fts_query(query) if self.fts_enabled else ""
+        if match_query:
+            try:
+                return self._search_tasks_fts(match_query)
+            except sqlite3.OperationalError as e:
+                # Por ejemplo, la BD fue abierta con una versión de SQLite sin FTS5
+                print(f"Advertencia: búsqueda de texto completo no disponible, se usará LIKE: {e}")
+                self.fts_enabled = False
+        return self._search_tasks_like(query)
+    
+    @staticmethod
+    def _build_fts_query(query):
+        """Convierte el texto del usuario en una consulta FTS5 de prefijos: 'ana per' -> '"ana"* "per"*'."""
+        tokens = re.findall(r"\w+", query or "")
+        return " ".join(f'"{token}"*' for token in tokens)
+    
+    def _search_tasks_fts(self, match_query):
+        """Búsqueda mediante la tabla FTS5 'tareas_fts', ordenada por relevancia."""
+        weights = ", ".join(str(w) for w in self.FTS_RANK_WEIGHTS)
+        with self._get_connection() as conn:
+            cursor = self._task_cursor(conn)
+            cursor.execute(f'''
+                SELECT t.id, t.cedula, t.nombre, t.apellido, t.curso, t.turno, t.accion,
+                t.fecha_creacion, t.fecha_completado, t.status
+                FROM tareas_fts JOIN tareas t ON t.id = tareas_fts.rowid
+                WHERE tareas_fts MATCH ?
+                ORDER BY bm25(tareas_fts, {weights}), t.id DESC
+            ''', (match_query,))
+            return cursor.fetchall()
+    
+    def _search_tasks_like(self, query):
+        """Búsqueda con LIKE sobre cada columna (recorre toda la tabla)."""
         try:
             with self._get_connection() as conn:
-                cursor = conn.cursor()
+                cursor = self._task_cursor(conn)
                 search_term = f'%{query.lower()}%' # Convertir query a minúsculas para búsqueda case-insensitive
                 cursor.execute('''
                     SELECT id, cedula, nombre, apellido, curso, turno, accion, 
@@ -280,6 +1017,146 @@ class TaskDAO:
                     ORDER BY id DESC
                 ''', (search_term, search_term, search_term, 
                      search_term, search_term, search_term))
-                return [self._map_row_to_task(row) for row in cursor.fetchall()]
+                return cursor.fetchall()
         except sqlite3.Error as e:
             raise Exception(f"Error en búsqueda de tareas con query '{query}': {e}")
+    
+    def _fetch_page(self, query, params, page_size, fetch_next):
+        """Ejecuta una consulta paginada (pidiendo una fila extra para saber si hay más) y arma la TaskPage."""
+        if page_size <= 0:
+            raise ValueError("El tamaño de página debe ser mayor que cero.")
+        with self._get_connection() as conn:
+            cursor = self._task_cursor(conn)
+            cursor.execute(query + " LIMIT ?", tuple(params) + (page_size + 1,))
+            tasks = cursor.fetchall()
+        has_more = len(tasks) > page_size
+        del tasks[page_size:]
+        return TaskPage(tasks, has_more, page_size, fetch_next)
+    
+    def get_tasks_page(self, after_id=None, page_size=DEFAULT_PAGE_SIZE, status=None):
+        """
+        Obtiene una página de tareas ordenadas por id descendente.
+        after_id es el último id visto (None para la primera página); status filtra opcionalmente por estado.
+        """
+        conditions = []
+        params = []
+        if after_id is not None:
+            conditions.append("id < ?")
+            params.append(after_id)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        
+        query = self.SELECT_TASK_SQL
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC"
+        try:
+            return self._fetch_page(query, params, page_size,
+                                    lambda last_id: self.get_tasks_page(last_id, page_size, status))
+        except sqlite3.Error as e:
+            raise Exception(f"Error al obtener página de tareas: {e}")
+    
+    def search_tasks_page(self, query, after_id=None, page_size=DEFAULT_PAGE_SIZE, status=None):
+        """
+        Igual que search_tasks pero paginado por id descendente (sin orden por relevancia,
+        ya que la paginación por clave necesita un orden estable).
+        """
+        fetch_next = lambda last_id: self.search_tasks_page(query, last_id, page_size, status)
+        match_query = self._build_fts_query(query) if self.fts_enabled else ""
+        try:
+            if match_query:
+                try:
+                    return self._search_page_fts(match_query, after_id, page_size, status, fetch_next)
+                except sqlite3.OperationalError as e:
+                    print(f"Advertencia: búsqueda de texto completo no disponible, se usará LIKE: {e}")
+                    self.fts_enabled = False
+            return self._search_page_like(query, after_id, page_size, status, fetch_next)
+        except sqlite3.Error as e:
+            raise Exception(f"Error en búsqueda paginada con query '{query}': {e}")
+    
+    def _search_page_fts(self, match_query, after_id, page_size, status, fetch_next):
+        """Página de resultados usando tareas_fts (FTS5 recorre su rowid en orden descendente)."""
+        sql = """
+            SELECT t.id, t.cedula, t.nombre, t.apellido, t.curso, t.turno, t.accion,
+            t.fecha_creacion, t.fecha_completado, t.status
+            FROM tareas_fts JOIN tareas t ON t.id = tareas_fts.rowid
+            WHERE tareas_fts MATCH ?
+        """
+        params = [match_query]
+        if after_id is not None:
+            sql += " AND tareas_fts.rowid < ?"
+            params.append(after_id)
+        if status is not None:
+            sql += " AND t.status = ?"
+            params.append(status)
+        sql += " ORDER BY tareas_fts.rowid DESC"
+        return self._fetch_page(sql, params, page_size, fetch_next)
+    
+    def _search_page_like(self, query, after_id, page_size, status, fetch_next):
+        """Página de resultados con LIKE; recorre la clave primaria hacia atrás y se detiene al llenar la página."""
+        search_term = f'%{query.lower()}%'
+        sql = self.SELECT_TASK_SQL + """
+            WHERE (LOWER(cedula) LIKE ? OR LOWER(nombre) LIKE ? OR LOWER(apellido) LIKE ? OR
+            LOWER(curso) LIKE ? OR LOWER(turno) LIKE ? OR LOWER(accion) LIKE ?)
+        """
+        params = [search_term] * 6
+        if after_id is not None:
+            sql += " AND id < ?"
+            params.append(after_id)
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        sql += " ORDER BY id DESC"
+        return self._fetch_page(sql, params, page_size, fetch_next)
+    
+    def get_data_version(self):
+        """
+        Devuelve PRAGMA data_version de la conexión del hilo actual: cambia cada vez que otra conexión
+        confirma cambios en la BD. Es una lectura en memoria, muy barata para consultar a menudo.
+        """
+        try:
+            with self._get_connection() as conn:
+                return conn.execute("PRAGMA data_version").fetchone()[0]
+        except sqlite3.Error as e:
+            raise Exception(f"Error al leer data_version: {e}")
+    
+    def get_last_change_seq(self):
+        """Número de secuencia del último cambio registrado en tareas_cambios (0 si no hay)."""
+        try:
+            with self._get_connection() as conn:
+                return conn.execute("SELECT COALESCE(MAX(seq), 0) FROM tareas_cambios").fetchone()[0]
+        except sqlite3.Error as e:
+            raise Exception(f"Error al leer el registro de cambios: {e}")
+    
+    def get_changes_since(self, seq, limit=1000):
+        """
+        Devuelve los cambios posteriores a 'seq' como un diccionario:
+        'seq' (nuevo último número de secuencia), 'changed' (tareas insertadas o modificadas, estado actual),
+        'deleted' (ids eliminados) y 'complete' (False si el registro ya no cubre 'seq' o hay más de
+        'limit' tareas afectadas: en ese caso conviene recargar todo).
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute("SELECT COALESCE(MIN(seq), 0), COALESCE(MAX(seq), 0) FROM tareas_cambios")
+                min_seq, max_seq = cursor.fetchone()
+                if max_seq <= seq:
+                    return {"seq": max_seq, "changed": [], "deleted": [], "complete": True}
+                if min_seq > seq + 1:
+                    # Las entradas intermedias se recortaron
+                    return {"seq": max_seq, "changed": [], "deleted": [], "complete": False}
+                
+                cursor.execute('''
+                    SELECT DISTINCT tarea_id FROM tareas_cambios WHERE seq > ? AND seq <= ? LIMIT ?
+                ''', (seq, max_seq, limit + 1))
+                task_ids = [row[0] for row in cursor.fetchall()]
+                if len(task_ids) > limit:
+                    return {"seq": max_seq, "changed": [], "deleted": [], "complete": False}
+        except sqlite3.Error as e:
+            raise Exception(f"Error al leer los cambios desde {seq}: {e}")
+        
+        changed = self.get_tasks_by_ids(task_ids)
+        existing = {task.id for task in changed}
+        deleted = [task_id for task_id in task_ids if task_id not in existing]
+        return {"seq": max_seq, "changed": changed, "deleted": deleted, "complete": True}
@@ -0,0 +1,322 @@
+"""
+Escritura diferida (write-behind) opcional para TaskDAO. Se activa con WRITE_BEHIND=true en el .env.
+
+Las modificaciones y eliminaciones (también las de varias tareas: update_status_many y
+delete_many, que usan los botones de estado y eliminar) se guardan en memoria y la interfaz se actualiza en el acto; un
+hilo las escribe juntas, en una sola transacción (TaskDAO.apply_task_writes), WRITE_BEHIND_MS
+milisegundos después de la primera pendiente, o antes si se acumulan WRITE_BEHIND_MAX. Varias
+modificaciones seguidas de la misma tarea se guardan como una sola. Así se paga un commit (y su
+fsync) por lote en lugar de uno por clic, que es lo que domina en WAL o en una unidad de red.
+
+Garantías:
+    - Cada lote es una transacción: la base nunca queda con un lote aplicado a medias.
+    - Al cerrar la aplicación (close) y al terminar el proceso normalmente o por una excepción
+      (atexit) se guarda todo lo pendiente.
+    - Si el proceso muere sin pasar por ahí (corte de luz, se mata el proceso) se pierde lo que
+      no se llegó a guardar: normalmente las escrituras de los últimos WRITE_BEHIND_MS milisegundos.
+    - Si la transacción de un lote falla entera (base bloqueada, disco lleno, unidad de red caída)
+      el lote vuelve a la cola, el error se informa con on_error y se reintenta en el siguiente
+      ciclo. Mientras siga fallando la cola crece sin límite, y un cierre abrupto pierde todo lo
+      escrito desde el último lote guardado, no solo los últimos WRITE_BEHIND_MS.
+    - Las altas (insert_task) no se difieren: necesitan el ID y saber si la cédula está repetida.
+      Se guardan en el acto, junto con lo pendiente.
+    - Las lecturas de una tarea (get_task_by_id, get_tasks_by_ids, task_matches_query) y las
+      listas de ids (get_task_ids, la que usa la búsqueda) ven las escrituras pendientes sin
+      guardarlas. Las lecturas que no dependen de ellas (PASSTHROUGH_METHODS: registro de cambios,
+      totales, punto de reanudación de la importación) tampoco guardan; los totales de
+      tareas_resumen solo cuentan lo ya guardado. Cualquier otra operación guarda antes lo
+      pendiente, así que siempre ve los datos al día.
+    - Si una escritura diferida falla (p. ej. otro equipo tomó esa cédula), solo esa se descarta
+      y el error se informa con on_error.
+"""
+
+import atexit
+import heapq
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from models.task import Task
+
+def _fold(text):
+    """Minúsculas y sin acentos, como el tokenizador 'unicode61 remove_diacritics 2' de tareas_fts."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+class WriteBehindTaskDAO:
+    """Envoltorio de TaskDAO que acumula modificaciones y eliminaciones y las guarda por lotes."""
+
+    DEFAULT_DELAY_MS = 500
+    DEFAULT_MAX_PENDING = 50
+    # Lecturas que no necesitan lo pendiente: no lo guardan antes de llamarlas. El registro de
+    # cambios solo interesa por lo que confirmaron otras conexiones (lo propio ya está en los
+    # árboles) y los totales son informativos (búsqueda, barra de estado)
+    PASSTHROUGH_METHODS = ("interrupt", "get_connection_stats", "get_instrumentation_stats", "get_data_version",
+                           "get_last_change_seq", "get_changes_since", "get_counters", "get_counter",
+                           "get_import_checkpoint")
+
+    def __init__(self, task_dao, delay_ms=DEFAULT_DELAY_MS, max_pending=DEFAULT_MAX_PENDING, on_error=None):
+        """
+        task_dao: el TaskDAO que guarda los datos.
+        on_error(excepción): se llama (desde el hilo que guarda) por cada escritura diferida que falló.
+        """
+        self.task_dao = task_dao
+        self.delay = delay_ms / 1000
+        self.max_pending = max(1, max_pending)
+        self.on_error = on_error
+        self.flush_count = 0 # Transacciones hechas
+        self.flushed_writes = 0 # Escrituras guardadas en ellas
+        self._pending = OrderedDict() # task_id -> ("update", Task) o ("delete", task_id)
+        self._in_flight = OrderedDict() # Lote que se está guardando (sigue visible para las lecturas)
+        self._lock = threading.RLock() # Protege _pending e _in_flight; nunca se retiene durante una transacción
+        self._flush_lock = threading.Lock() # Un solo lote a la vez, en orden
+        self._dirty = threading.Event() # Hay escrituras pendientes
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_worker, name="dao-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    @classmethod
+    def from_env(cls, task_dao, on_error=None):
+        """Envuelve el DAO si WRITE_BEHIND está activo en el entorno; si no, lo devuelve tal cual."""
+        if os.getenv("WRITE_BEHIND", "false").strip().lower() not in ("1", "true", "si", "sí", "yes"):
+            return task_dao
+        settings = {}
+        for name, key, default in (("WRITE_BEHIND_MS", "delay_ms", cls.DEFAULT_DELAY_MS),
+                                   ("WRITE_BEHIND_MAX", "max_pending", cls.DEFAULT_MAX_PENDING)):
+            try:
+                settings[key] = int(os.getenv(name, str(default)))
+            except ValueError:
+                print(f"Advertencia: valor '{os.getenv(name)}' no válido para {name}. Se usará {default}.")
+                settings[key] = default
+        return cls(task_dao, on_error=on_error, **settings)
+
+    # --- Escrituras ---
+
+    def insert_task(self, task):
+        """Inserta la tarea en el acto, en la misma transacción que las escrituras pendientes."""
+        with self._flush_lock:
+            operations = self._take_pending()
+            try:
+                results = self.task_dao.apply_task_writes(operations + [("insert", task)])
+            except Exception:
+                self._restore_pending()
+                raise
+            self._flushed(results[:-1])
+        ok, result = results[-1]
+        if not ok:
+            raise result
+        return result
+
+    def update_task(self, task):
+        """Encola la modificación (reemplaza a otra pendiente de la misma tarea)."""
+        self._enqueue(task.id, ("update", Task(**task.to_dict()))) # Copia: el llamador puede seguir usándola
+        return task
+
+    def delete_task(self, task_id):
+        """Encola la eliminación (descarta una modificación pendiente de la misma tarea)."""
+        self._enqueue(task_id, ("delete", task_id))
+        return True
+
+    def update_status_many(self, task_ids, status):
+        """Encola el cambio de estado de varias tareas (las que ya tenían ese estado no se tocan)."""
+        changed = []
+        for task in self.get_tasks_by_ids(task_ids):
+            if task.status == status:
+                continue
+            if status == "completada":
+                task.mark_as_completed()
+            else:
+                task.mark_as_pending()
+            changed.append((task.id, ("update", task)))
+        self._enqueue_many(changed)
+        return len(changed)
+
+    def delete_many(self, task_ids):
+        """Encola la eliminación de varias tareas. Devuelve cuántas existían."""
+        existing = [task.id for task in self.get_tasks_by_ids(task_ids)]
+        self._enqueue_many([(task_id, ("delete", task_id)) for task_id in existing])
+        return len(existing)
+
+    def _enqueue(self, task_id, operation):
+        self._enqueue_many([(task_id, operation)])
+
+    def _enqueue_many(self, operations):
+        if not operations:
+            return
+        with self._lock:
+            for task_id, operation in operations:
+                self._pending[task_id] = operation
+            self._dirty.set()
+            full = len(self._pending) >= self.max_pending
+        if full: # Fuera del lock: flush() lo toma solo para tomar el lote
+            try:
+                self.flush()
+            except Exception as e:
+                self._report(e) # Queda pendiente: el hilo lo reintentará
+
+    def flush(self):
+        """Guarda ya todas las escrituras pendientes en una transacción. Devuelve cuántas eran."""
+        with self._flush_lock:
+            operations = self._take_pending()
+            if not operations:
+                return 0
+            try:
+                results = self.task_dao.apply_task_writes(operations)
+            except Exception:
+                # La transacción falló (p. ej. base bloqueada): el lote vuelve a quedar pendiente
+                self._restore_pending()
+                raise
+            return self._flushed(results)
+
+    def _take_pending(self):
+        """Pasa lo pendiente a _in_flight (solo bajo el lock, sin tocar la BD) y devuelve sus operaciones."""
+        with self._lock:
+            self._in_flight, self._pending = self._pending, OrderedDict()
+            self._dirty.clear()
+            return list(self._in_flight.values())
+
+    def _restore_pending(self):
+        """Devuelve el lote que no se pudo guardar a la cola; lo encolado después tiene prioridad."""
+        with self._lock:
+            restored = self._in_flight
+            for task_id, operation in self._pending.items():
+                restored[task_id] = operation
+            self._pending, self._in_flight = restored, OrderedDict()
+            if self._pending:
+                self._dirty.set()
+
+    def _flushed(self, results):
+        """Descarta el lote ya guardado e informa las escrituras que fallaron."""
+        with self._lock:
+            self._in_flight = OrderedDict()
+            if results:
+                self.flush_count += 1
+                self.flushed_writes += len(results)
+        for ok, error in results:
+            if not ok:
+                self._report(error)
+        return len(results)
+
+    def _report(self, error):
+        if self.on_error:
+            try:
+                self.on_error(error)
+                return
+            except Exception as e:
+                print(f"Error al informar una escritura diferida fallida: {e}")
+        print(f"Error al guardar una escritura diferida: {error}")
+
+    def _flush_worker(self):
+        """Guarda lo pendiente WRITE_BEHIND_MS después de la primera escritura de cada lote."""
+        while True:
+            self._dirty.wait()
+            if self._stop.wait(self.delay):
+                return
+            try:
+                self.flush()
+            except Exception as e:
+                self._report(e)
+
+    # --- Lecturas que combinan la BD con lo pendiente ---
+
+    def _overlay(self, task_id):
+        """Escritura pendiente o en curso de una tarea (llamar con el lock tomado), o None."""
+        operation = self._pending.get(task_id)
+        return operation if operation is not None else self._in_flight.get(task_id)
+
+    def get_task_by_id(self, task_id):
+        with self._lock:
+            operation = self._overlay(task_id)
+            if operation is not None:
+                return Task(**operation[1].to_dict()) if operation[0] == "update" else None
+        # Sin escrituras pendientes de esa tarea: la BD está al día (se lee sin retener el lock)
+        return self.task_dao.get_task_by_id(task_id)
+
+    def get_tasks_by_ids(self, task_ids):
+        task_ids = list(task_ids)
+        with self._lock:
+            overlay = {task_id: self._overlay(task_id) for task_id in task_ids}
+        overlay = {task_id: operation for task_id, operation in overlay.items() if operation is not None}
+        stored = {task.id: task for task in
+                  self.task_dao.get_tasks_by_ids(task_id for task_id in task_ids if task_id not in overlay)}
+        for task_id, operation in overlay.items():
+            if operation[0] == "update":
+                stored[task_id] = Task(**operation[1].to_dict())
+        return [stored[task_id] for task_id in task_ids if task_id in stored]
+
+    def task_matches_query(self, task_id, query):
+        """
+        Indica si la tarea coincide con la búsqueda sin guardar lo pendiente: si la tarea tiene una
+        escritura pendiente se evalúa en memoria sobre sus campos; si no, la BD ya está al día.
+        """
+        with self._lock:
+            operation = self._overlay(task_id)
+        if operation is None:
+            return self.task_dao.task_matches_query(task_id, query)
+        return operation[0] == "update" and self._matches_in_memory(operation[1], query)
+
+    def get_task_ids(self, status=None, query=None):
+        """
+        Ids de la BD corregidos con lo pendiente, sin guardarlo: se quitan las tareas eliminadas o que
+        dejaron de cumplir el filtro y se agregan las que pasaron a cumplirlo (en su lugar por id, o
+        al final si la BD las ordena por relevancia).
+        """
+        with self._lock:
+            # Antes de leer la BD: si un lote se guarda mientras tanto, la BD y esta copia coinciden
+            overlay = {task_id: self._overlay(task_id) for task_id in list(self._in_flight) + list(self._pending)}
+        ids = self.task_dao.get_task_ids(status, query)
+        if not overlay:
+            return ids
+        shown = {task_id: operation == "update" and (status is None or arg.status == status)
+                          and (not query or self._matches_in_memory(arg, query))
+                 for task_id, (operation, arg) in overlay.items()}
+        ids = [task_id for task_id in ids if shown.get(task_id, True)]
+        present = set(ids)
+        added = sorted((task_id for task_id, visible in shown.items() if visible and task_id not in present),
+                       reverse=True)
+        if not added:
+            return ids
+        if query and self.task_dao.fts_enabled:
+            return ids + added
+        return list(heapq.merge(ids, added, reverse=True))
+
+    def _matches_in_memory(self, task, query):
+        """Misma semántica que la BD: prefijos de palabras sin acentos (FTS5) o subcadena (LIKE)."""
+        fields = (task.cedula, task.nombre, task.apellido, task.curso, task.turno, task.accion or "")
+        if not self.task_dao.fts_enabled:
+            return any(query.lower() in field.lower() for field in fields)
+        words = re.findall(r"\w+", _fold(" ".join(fields)))
+        return all(any(word.startswith(token) for word in words) for token in re.findall(r"\w+", _fold(query)))
+
+    def get_write_behind_stats(self):
+        """Escrituras pendientes, transacciones hechas y escrituras guardadas en ellas."""
+        with self._lock:
+            return {"pendientes": len(self._pending) + len(self._in_flight), "transacciones": self.flush_count,
+                    "escrituras": self.flushed_writes}
+
+    # --- Todo lo demás va directo al TaskDAO, después de guardar lo pendiente ---
+
+    def __getattr__(self, name):
+        attribute = getattr(self.task_dao, name)
+        if not callable(attribute) or name in self.PASSTHROUGH_METHODS:
+            return attribute
+
+        def flushed_call(*args, **kwargs):
+            self.flush()
+            return attribute(*args, **kwargs)
+        return flushed_call
+
+    def close(self):
+        """Detiene el hilo, guarda lo pendiente y cierra el DAO."""
+        self._stop.set()
+        self._dirty.set() # Despertar al hilo si estaba esperando escrituras
+        self._thread.join()
+        try:
+            self.flush()
+        except Exception as e:
+            print(f"Error al guardar las escrituras pendientes al cerrar: {e}")
+        atexit.unregister(self.flush)
+        self.task_dao.close()
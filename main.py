@@ -5,6 +5,7 @@ Implementa la interfaz de usuario utilizando tkinter y se comunica con el contro
 
 import sys
 import os  # Ensure os is imported for path manipulation
+import multiprocessing
 
 # --- Start of sys.path modification ---
 # Get the absolute path of the directory containing the current script (main.py)
@@ -30,6 +31,7 @@ from models.task import Task
 from dao.task_dao import TaskDAO
 from controllers.task_controller import TaskController
 from utils.util import Util
+from views.task_tree_view import TaskTreeView
 
 class StudentTaskManager:
     """Clase principal de la aplicación que implementa la interfaz de usuario."""
@@ -49,6 +51,8 @@ class StudentTaskManager:
         self.current_tab = "pendientes"
         self.editing_mode = False
         self.accion_pendiente_entry = None 
+        # Modo virtual de los árboles: solo se renderizan las filas visibles
+        self.virtual_trees = os.getenv("VIRTUAL_TREES", "true").strip().lower() in ("1", "true", "si", "sí", "yes")
         
         # Tema
         self.current_theme = "light" 
@@ -66,10 +70,9 @@ class StudentTaskManager:
         # Crear interfaz (widgets principales como el notebook y las pestañas)
         self.create_widgets()
         
-        # Cargar datos existentes en los árboles y actualizar la UI
+        # Cargar datos existentes en los árboles y actualizar la UI (en segundo plano)
         # Esto se hace después de que todos los widgets, incluidos los árboles, estén creados.
-        if self.controller.load_tasks():
-            self.controller.update_trees()
+        self.controller.reload_tasks()
 
         # Mostrar mensaje inicial
         self.update_status("Aplicación iniciada correctamente. ¡Bienvenido!")
@@ -79,9 +82,11 @@ class StudentTaskManager:
         
     def on_closing(self):
         """Maneja el evento de cierre de la ventana."""
-        # Asegurarse de detener cualquier thread en ejecución
-        if hasattr(self.controller, 'auto_refresh_enabled'):
-            self.controller.auto_refresh_enabled = False
+        # Asegurarse de detener cualquier thread en ejecución y cerrar las conexiones
+        try:
+            self.controller.close()
+        except Exception as e:
+            print(f"Error al cerrar el controlador: {e}")
             
         self.root.destroy()
         
@@ -287,14 +292,52 @@ class StudentTaskManager:
         self.status_frame = ttk.Frame(self.root)
         self.status_frame.grid(row=2, column=0, sticky="ew")
         
+        # Indicador de actividad: visible solo mientras hay operaciones de BD en segundo plano
+        self.busy_bar = ttk.Progressbar(self.status_frame, mode="indeterminate", length=120)
+        # Botón para cancelar la operación larga en curso (p. ej. una exportación); solo visible durante ella
+        self.cancel_button = ttk.Button(self.status_frame, text="Cancelar")
+        
         self.status_label = ttk.Label(self.status_frame, style='Status.TLabel', 
                                      text="Listo", relief="sunken", anchor="w")
-        self.status_label.pack(fill="x")
+        self.status_label.pack(side="left", fill="x", expand=True)
         
     def update_status(self, message):
         """Actualiza el mensaje de la barra de estado"""
         self.status_label.config(text=message)
         
+    def set_busy(self, busy, message=""):
+        """Muestra u oculta el indicador de actividad de la barra de estado."""
+        if busy:
+            if message:
+                self.update_status(message)
+            if not self.busy_bar.winfo_manager():
+                self.busy_bar.pack(side="right", padx=5)
+                self.busy_bar.start(15)
+            self.root.config(cursor="watch")
+        else:
+            self.busy_bar.stop()
+            self.busy_bar.config(mode="indeterminate")
+            self.busy_bar.pack_forget()
+            self.root.config(cursor="")
+    
+    def set_progress(self, fraction):
+        """Muestra el avance (0 a 1) de la operación en curso en la barra de estado; None vuelve al modo indeterminado."""
+        if fraction is None:
+            self.busy_bar.config(mode="indeterminate")
+            if self.busy_bar.winfo_manager():
+                self.busy_bar.start(15)
+            return
+        self.busy_bar.stop()
+        self.busy_bar.config(mode="determinate", maximum=100, value=min(max(fraction, 0), 1) * 100)
+    
+    def set_cancel_action(self, command):
+        """Muestra el botón 'Cancelar' de la barra de estado con la acción indicada, o lo oculta si es None."""
+        if command is None:
+            self.cancel_button.pack_forget()
+        else:
+            self.cancel_button.config(command=command)
+            self.cancel_button.pack(side="right", padx=5)
+        
     def tab_changed(self, event):
         """Maneja el cambio entre pestañas"""
         tab_id = self.notebook.select()
@@ -372,7 +415,8 @@ class StudentTaskManager:
         tree_frame = ttk.Frame(self.pendientes_frame)
         tree_frame.grid(row=1, column=0, padx=10, pady=5, sticky="nsew")
         
-        self.tree_pendientes = self.create_tree(tree_frame)
+        self.pendientes_view = self.create_tree(tree_frame, "pendiente")
+        self.tree_pendientes = self.pendientes_view.tree
         
     def create_completadas_tab(self):
         """Crea la pestaña de tareas completadas."""
@@ -380,7 +424,8 @@ class StudentTaskManager:
         tree_frame = ttk.Frame(self.completadas_frame)
         tree_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         
-        self.tree_completadas = self.create_tree(tree_frame)
+        self.completadas_view = self.create_tree(tree_frame, "completada")
+        self.tree_completadas = self.completadas_view.tree
         
     def create_controls(self):
         """Crea los controles y la barra de búsqueda."""
@@ -395,7 +440,8 @@ class StudentTaskManager:
         ttk.Label(search_frame, text="Filtrar por:").grid(row=0, column=0, padx=5, pady=8)
         self.search_entry = ttk.Entry(search_frame, width=40)
         self.search_entry.grid(row=0, column=1, padx=5, pady=8)
-        self.search_entry.bind("<KeyRelease>", self.controller.search_tasks)
+        self.search_entry.bind("<KeyRelease>", self.controller.on_search_key)
+        self.search_entry.bind("<Return>", lambda event: self.controller.search_tasks())
         
         ttk.Button(search_frame, text="🔍 Buscar", 
                  command=self.controller.search_tasks).grid(row=0, column=2, padx=5)
@@ -420,16 +466,19 @@ class StudentTaskManager:
         
         file_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Archivo", menu=file_menu)
+        file_menu.add_command(label="Importar desde CSV...", command=self.controller.import_tasks_from_csv)
         file_menu.add_command(label="Exportar a CSV", command=self.controller.export_tasks_to_csv)
         file_menu.add_separator()
-        file_menu.add_command(label="Salir", command=self.root.quit)
+        file_menu.add_command(label="Salir", command=self.on_closing)
         
         # Menú Herramientas
         tools_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Herramientas", menu=tools_menu)
         tools_menu.add_command(label="Generar informe", command=self.controller.generate_and_show_report)
+        tools_menu.add_command(label="Verificar totales", command=self.controller.verify_counters)
+        tools_menu.add_command(label="Estadísticas de la base de datos", command=self.controller.show_db_stats)
         tools_menu.add_command(label="Activar actualización automática", 
-                              command=lambda: self.controller.toggle_auto_refresh(30))
+                              command=self.controller.toggle_auto_refresh)
         tools_menu.add_command(label="Cambiar Tema", command=self.toggle_theme) # Nueva opción de menú
         
         # Menú Ayuda
@@ -480,8 +529,8 @@ class StudentTaskManager:
         
         ttk.Button(frame, text="Cerrar", command=about_window.destroy).pack(pady=10)
         
-    def create_tree(self, parent):
-        """Crea un treeview con scrollbars."""
+    def create_tree(self, parent, status):
+        """Crea un treeview con scrollbars y devuelve la vista (TaskTreeView) que lo administra."""
         # Frame para contener el treeview y scrollbars
         frame = ttk.Frame(parent)
         frame.pack(fill="both", expand=True)
@@ -492,7 +541,8 @@ class StudentTaskManager:
         
         # Configuración del treeview
         columns = ("ID", "Cédula", "Nombre", "Apellido", "Curso", "Turno", "Acción", "Creado", "Completado")
-        tree = ttk.Treeview(frame, columns=columns, show="headings", selectmode="browse",
+        # Selección extendida: Shift/Ctrl + clic para marcar varias tareas y actuar sobre todas juntas
+        tree = ttk.Treeview(frame, columns=columns, show="headings", selectmode="extended",
                            yscrollcommand=vsb.set, xscrollcommand=hsb.set)
         
         # Configurar scrollbars
@@ -516,36 +566,64 @@ class StudentTaskManager:
         tree.column("Creado", width=150)
         tree.column("Completado", width=150)
         
+        # Colores de las filas según el estado
+        if status == "pendiente":
+            tree.tag_configure("pendiente", foreground="#e74c3c") # Considerar usar colores del tema
+        else:
+            tree.tag_configure("completada", foreground="#27ae60") # Considerar usar colores del tema
+        
+        # La vista se encarga de la selección (por id) y, en modo virtual, del desplazamiento
+        # Las filas se leen en el DAOExecutor del controlador, nunca en el hilo de Tk
+        view = TaskTreeView(tree, vsb, self.controller.task_dao.get_tasks_by_ids, self.controller.executor,
+                            tag=status, on_select=self.load_selected, virtual=self.virtual_trees)
+        
         # Eventos
-        tree.bind("<<TreeviewSelect>>", self.load_selected)
         tree.bind("<Double-1>", self.on_item_double_click)
+        tree.bind("<Control-a>", lambda event: view.select_all())
         
-        return tree
+        return view
         
-    def load_selected(self, event):
-        """Carga los datos de una tarea seleccionada en los campos."""
-        widget = event.widget
-        selected_item = widget.selection()
-        
-        if selected_item:
-            values = widget.item(selected_item)['values']
-            
+    def load_selected(self, view):
+        """Carga los datos de la tarea seleccionada en los campos (aunque su fila no esté renderizada)."""
+        selected_count = len(view.selected_ids)
+        if selected_count > 1:
+            # Varias tareas: el formulario queda vacío; los botones de estado y eliminar actúan sobre todas
+            self.clear_fields()
+            self.update_status(f"{selected_count} tareas seleccionadas")
+            return
+        selected = view.get_selected_ids()
+        if not selected:
+            return
+        task = view.cached_task(selected[0])
+        if task is None:
+            # La fila no está en memoria: se lee en segundo plano (no bloquear el hilo de Tk)
+            self.controller.executor.submit_read(
+                lambda: self.controller.task_dao.get_task_by_id(selected[0]),
+                lambda task: self._fill_form(task) if view.get_selected_ids() == selected else None,
+                lambda e: self.update_status(f"Error al cargar la tarea: {e}"),
+                description="Cargando tarea...")
+            return
+        self._fill_form(task)
+    
+    def _fill_form(self, task):
+        """Carga los datos de una tarea en los campos del formulario."""
+        if task:
             # Limpiar campos primero
             self.clear_fields()
             
             # Cargar valores
-            self.cédula.insert(0, values[1])  # Cédula está en el índice 1 ahora
-            self.nombre.insert(0, values[2])
-            self.apellido.insert(0, values[3])
-            self.curso_grado.set(values[4])
-            self.turno.set(values[5])
-            self.accion_pendiente_entry.insert(0, values[6]) # Renombrado
+            self.cédula.insert(0, task.cedula)
+            self.nombre.insert(0, task.nombre)
+            self.apellido.insert(0, task.apellido)
+            self.curso_grado.set(task.curso)
+            self.turno.set(task.turno)
+            self.accion_pendiente_entry.insert(0, task.accion or "") # Renombrado
             
             # Guardar el ID de la tarea seleccionada
-            self.current_index = values[0]
+            self.current_index = task.id
             
             # Actualizar barra de estado
-            self.update_status(f"Registro seleccionado: {values[2]} {values[3]}")
+            self.update_status(f"Registro seleccionado: {task.nombre} {task.apellido}")
             
     def on_item_double_click(self, event):
         """Activa el modo de edición al hacer doble clic."""
@@ -651,6 +729,9 @@ if __name__ == "__main__":
     # load_dotenv() is already called at the top-level module scope,
     # so environment variables should be loaded by now.
 
+    # Needed by the parallel CSV import (ProcessPoolExecutor) when running as a PyInstaller executable
+    multiprocessing.freeze_support()
+
     main_root = tk.Tk()  # Create the main Tkinter window
     app_instance = StudentTaskManager(main_root)  # Create an instance of the application
     configurar_icono(main_root)  # Configure the application icon
@@ -2,10 +2,20 @@
 Modelo para representar una tarea en el sistema.
 Parte del patrón de diseño DAO (Data Access Object).
 """
-from datetime import datetime
+from utils.util import Util
+
+# Orden de las columnas en las consultas del DAO (SELECT_TASK_SQL) y en las exportaciones
+TASK_FIELDS = ('id', 'cedula', 'nombre', 'apellido', 'curso', 'turno', 'accion',
+               'fecha_creacion', 'fecha_completado', 'status')
 
 class Task:
-    """Clase que representa una tarea individual en el sistema."""
+    """
+    Clase que representa una tarea individual en el sistema.
+    Usa __slots__ (sin __dict__ por instancia) porque las vistas y exportaciones llegan a manejar
+    cientos de miles de tareas a la vez.
+    """
+    
+    __slots__ = TASK_FIELDS
     
     def __init__(self, id=None, cedula="", nombre="", apellido="", curso="", 
                  turno="", accion="", fecha_creacion=None, fecha_completado=None, 
@@ -18,25 +28,32 @@ class Task:
         self.turno = turno
         self.accion = accion
         
-        # Si no se proporciona una fecha de creación, usar la fecha actual
-        self.fecha_creacion = fecha_creacion or datetime.now().strftime("%d/%m/%Y %H:%M")
+        # Si no se proporciona una fecha de creación, usar la fecha actual.
+        # Las fechas se guardan en ISO-8601 ('YYYY-MM-DD HH:MM:SS'); Util.format_date las formatea para mostrar.
+        self.fecha_creacion = fecha_creacion or Util.now_timestamp()
         self.fecha_completado = fecha_completado or ""
         self.status = status
     
+    @classmethod
+    def from_row(cls, row):
+        """
+        Crea una tarea a partir de una fila (id, cedula, ..., status) sin pasar por __init__,
+        que es lo más costoso al cargar muchas filas.
+        """
+        task = object.__new__(cls)
+        (task.id, task.cedula, task.nombre, task.apellido, task.curso, task.turno, task.accion,
+         task.fecha_creacion, fecha_completado, task.status) = row
+        task.fecha_completado = fecha_completado or ""
+        return task
+    
+    def to_tuple(self):
+        """Devuelve los valores de la tarea en el orden de TASK_FIELDS (sin crear un diccionario)."""
+        return (self.id, self.cedula, self.nombre, self.apellido, self.curso, self.turno, self.accion,
+                self.fecha_creacion, self.fecha_completado, self.status)
+    
     def to_dict(self):
         """Convierte la tarea a un diccionario."""
-        return {
-            'id': self.id,
-            'cedula': self.cedula,
-            'nombre': self.nombre,
-            'apellido': self.apellido,
-            'curso': self.curso,
-            'turno': self.turno,
-            'accion': self.accion,
-            'fecha_creacion': self.fecha_creacion,
-            'fecha_completado': self.fecha_completado,
-            'status': self.status
-        }
+        return dict(zip(TASK_FIELDS, self.to_tuple()))
     
     def __str__(self):
         """Representación en texto de la tarea."""
@@ -45,9 +62,13 @@ class Task:
     def mark_as_completed(self):
         """Marca la tarea como completada."""
         self.status = "completada"
-        self.fecha_completado = datetime.now().strftime("%d/%m/%Y %H:%M")
+        self.fecha_completado = Util.now_timestamp()
         
     def mark_as_pending(self):
         """Marca la tarea como pendiente."""
         self.status = "pendiente"
         self.fecha_completado = ""
+
+def task_row_factory(cursor, row):
+    """row_factory de sqlite3: convierte cada fila de SELECT_TASK_SQL directamente en una Task."""
+    return Task.from_row(row)
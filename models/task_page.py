@@ -0,0 +1,46 @@
+"""
+Modelo para representar una página de tareas obtenida con paginación por clave (keyset).
+Permite recorrer resultados grandes de forma incremental sin cargar toda la tabla en memoria.
+"""
+
+class TaskPage:
+    """Página de tareas ordenadas por id descendente, con acceso perezoso a la página siguiente."""
+
+    def __init__(self, tasks, has_more, page_size, fetch_next=None):
+        """
+        tasks: tareas de esta página.
+        has_more: True si existen más filas después de la última tarea de la página.
+        fetch_next: función que recibe el último id visto y devuelve la siguiente TaskPage.
+        """
+        self.tasks = tasks
+        self.has_more = has_more
+        self.page_size = page_size
+        self._fetch_next = fetch_next
+
+    @property
+    def last_id(self):
+        """Id de la última tarea de la página; es la clave para pedir la página siguiente."""
+        return self.tasks[-1].id if self.tasks else None
+
+    def next_page(self):
+        """Obtiene la página siguiente desde la base de datos, o None si no hay más filas."""
+        if not self.has_more or self._fetch_next is None:
+            return None
+        return self._fetch_next(self.last_id)
+
+    def iter_all(self):
+        """Itera esta página y las siguientes, pidiendo cada página solo cuando hace falta."""
+        page = self
+        while page is not None:
+            yield from page.tasks
+            page = page.next_page()
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def __str__(self):
+        """Representación en texto de la página."""
+        return f"TaskPage({len(self.tasks)} tareas, hay más: {self.has_more})"
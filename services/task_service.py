@@ -0,0 +1,139 @@
+"""
+Capa de servicio: las operaciones sobre tareas (con sus validaciones y reglas) sin depender de la
+interfaz. La usan el controlador de Tk y la línea de comandos (cli.py); no importa tkinter.
+"""
+
+import os
+
+from models.task import Task
+from utils.util import Util
+
+class TaskService:
+    """Operaciones de negocio sobre las tareas, encima de un TaskDAO."""
+
+    EDITABLE_FIELDS = ("cedula", "nombre", "apellido", "curso", "turno", "accion")
+    STATUSES = ("pendiente", "completada")
+
+    def __init__(self, task_dao):
+        self.task_dao = task_dao
+
+    @staticmethod
+    def validate(fields):
+        """
+        Valida los datos de una tarea (diccionario con EDITABLE_FIELDS).
+        Lanza ValueError con el mismo mensaje que mostraría el formulario.
+        """
+        valid, message = Util.validate_cedula(fields.get("cedula") or "")
+        if not valid:
+            raise ValueError(message)
+        for field, label in (("nombre", "Nombre"), ("apellido", "Apellido")):
+            valid, message = Util.validate_name(fields.get(field) or "", field_name=label)
+            if not valid:
+                raise ValueError(message)
+        for field, label in (("curso", "Curso/Grado"), ("turno", "Turno")):
+            if not (fields.get(field) or "").strip():
+                raise ValueError(f"El campo '{label}' no puede estar vacío.")
+
+    def _get_existing(self, task_id, action):
+        """Devuelve la tarea o lanza LookupError si ya no existe."""
+        task = self.task_dao.get_task_by_id(task_id)
+        if not task:
+            raise LookupError(f"No se encontró la tarea con ID {task_id} para {action}.")
+        return task
+
+    def get_existing_tasks(self, task_ids, action):
+        """Devuelve las tareas en el orden pedido o lanza LookupError con los ids que ya no existen."""
+        task_ids = list(dict.fromkeys(task_ids))
+        found = {task.id: task for task in self.task_dao.get_tasks_by_ids(task_ids)}
+        missing = [str(task_id) for task_id in task_ids if task_id not in found]
+        if missing:
+            raise LookupError(f"No se encontraron las tareas con ID {', '.join(missing)} para {action}.")
+        return [found[task_id] for task_id in task_ids]
+
+    def add_task(self, fields):
+        """Crea una tarea pendiente. ValueError si los datos no son válidos o la cédula ya existe."""
+        fields = {field: (fields.get(field) or "").strip() for field in self.EDITABLE_FIELDS}
+        self.validate(fields)
+        if self.task_dao.check_cedula_exists(fields["cedula"]):
+            raise ValueError("Ya existe un estudiante con esa cédula")
+        return self.task_dao.insert_task(Task(**fields))
+
+    def update_task(self, task_id, fields):
+        """
+        Modifica los campos indicados de una tarea (los que no se pasan quedan igual).
+        LookupError si la tarea no existe; ValueError si los datos no son válidos o la cédula es de otra tarea.
+        """
+        task = self._get_existing(task_id, "actualizar")
+        changes = {field: value.strip() for field, value in fields.items()
+                   if field in self.EDITABLE_FIELDS and value is not None}
+        merged = {field: changes.get(field, getattr(task, field)) for field in self.EDITABLE_FIELDS}
+        self.validate(merged)
+        if merged["cedula"] != task.cedula and self.task_dao.check_cedula_exists(merged["cedula"], task.id):
+            raise ValueError("Ya existe otro estudiante con esa cédula")
+        for field, value in merged.items():
+            setattr(task, field, value)
+        return self.task_dao.update_task(task)
+
+    def set_status(self, task_id, status):
+        """Marca una tarea como completada (con la fecha actual) o como pendiente."""
+        if status not in self.STATUSES:
+            raise ValueError(f"Estado no válido: '{status}'.")
+        task = self._get_existing(task_id, "cambiar estado")
+        if status == "completada":
+            task.mark_as_completed()
+        else:
+            task.mark_as_pending()
+        return self.task_dao.update_task(task)
+
+    def complete_task(self, task_id):
+        return self.set_status(task_id, "completada")
+
+    def reopen_task(self, task_id):
+        return self.set_status(task_id, "pendiente")
+
+    def delete_task(self, task_id):
+        """Elimina una tarea y la devuelve (para informar a quién pertenecía)."""
+        task = self._get_existing(task_id, "eliminar")
+        self.task_dao.delete_task(task_id)
+        return task
+
+    def set_status_many(self, task_ids, status):
+        """
+        Cambia el estado de varias tareas en una sola transacción y devuelve las tareas ya
+        actualizadas (las que ya no existen se omiten).
+        """
+        if status not in self.STATUSES:
+            raise ValueError(f"Estado no válido: '{status}'.")
+        task_ids = list(task_ids)
+        self.task_dao.update_status_many(task_ids, status)
+        return self.task_dao.get_tasks_by_ids(task_ids)
+
+    def delete_many(self, task_ids):
+        """Elimina varias tareas en una sola transacción. LookupError si ninguna existía."""
+        task_ids = list(task_ids)
+        deleted = self.task_dao.delete_many(task_ids)
+        if task_ids and not deleted:
+            raise LookupError("No se encontraron las tareas seleccionadas para eliminar.")
+        return deleted
+
+    def search(self, query, status=None, limit=None):
+        """Tareas que coinciden con la búsqueda (por relevancia), opcionalmente de un solo estado."""
+        tasks = self.task_dao.search_tasks(query)
+        if status:
+            tasks = [task for task in tasks if task.status == status]
+        return tasks[:limit] if limit else tasks
+
+    def import_csv(self, filename, mode="skip", resume=True, on_progress=None, cancel_event=None, workers=None):
+        """Importa un CSV por bloques (ver TaskDAO.import_from_csv) y devuelve sus estadísticas."""
+        return self.task_dao.import_from_csv(filename, mode=mode, resume=resume, on_progress=on_progress,
+                                             cancel_event=cancel_event, workers=workers)
+
+    def export_csv(self, filename, on_progress=None, cancel_event=None):
+        """Exporta todas las tareas por bloques. Devuelve (éxito, mensaje, estadísticas)."""
+        total = self.task_dao.get_counters()["total"]
+        return Util.export_rows_to_csv(self.task_dao.iter_task_rows(), filename, total,
+                                       on_progress, cancel_event)
+
+    def report(self, period=None):
+        """Informe de tareas calculado en SQLite; el periodo por defecto es REPORT_PERIOD del .env."""
+        return self.task_dao.get_report(period or os.getenv("REPORT_PERIOD", "month"))
@@ -0,0 +1,54 @@
+"""Pruebas de WriteBehindTaskDAO: la búsqueda trabaja sobre lo pendiente sin guardarlo."""
+
+import os
+import tempfile
+import unittest
+
+from dao.task_dao import TaskDAO
+from dao.write_behind import WriteBehindTaskDAO
+from models.task import Task
+
+class WriteBehindSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        # Un retraso largo: en la prueba el hilo nunca llega a guardar por su cuenta
+        self.dao = WriteBehindTaskDAO(TaskDAO(os.path.join(self.directory.name, "tareas.db")), delay_ms=60000)
+        self.tasks = [self.dao.insert_task(Task(cedula=str(1000000 + i), nombre=nombre, apellido="Núñez",
+                                                curso="1° Grado", turno="Mañana", accion=""))
+                      for i, nombre in enumerate(("Ana", "Bruno", "Carla"))]
+
+    def tearDown(self):
+        self.dao.close()
+        self.directory.cleanup()
+
+    def search(self, query):
+        """Las mismas lecturas que TaskController._search_ids."""
+        self.dao.get_last_change_seq()
+        ids = (self.dao.get_task_ids("pendiente", query or None), self.dao.get_task_ids("completada", query or None))
+        self.dao.get_counters()
+        return ids
+
+    def test_search_does_not_flush_pending_writes(self):
+        ana, bruno, carla = self.tasks
+        ana.mark_as_completed()
+        self.dao.update_task(ana)
+        bruno.nombre = "Beatriz"
+        self.dao.update_task(bruno)
+        self.dao.delete_task(carla.id)
+        flushes = self.dao.flush_count
+
+        self.assertEqual(self.search(""), ([bruno.id], [ana.id]))
+        self.assertEqual(self.search("beat"), ([bruno.id], []))
+        self.assertEqual(self.search("bruno"), ([], []))
+        self.assertEqual(self.search("nunez"), ([bruno.id], [ana.id]))
+
+        self.assertEqual(self.dao.flush_count, flushes)
+        self.assertEqual(self.dao.get_write_behind_stats()["pendientes"], 3)
+        # Una vez guardado, la BD da el mismo resultado
+        self.dao.flush()
+        self.assertEqual(self.dao.task_dao.get_task_ids("pendiente", "beat"), [bruno.id])
+        self.assertEqual(self.dao.task_dao.get_task_ids("completada"), [ana.id])
+
+if __name__ == "__main__":
+    unittest.main()
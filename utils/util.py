@@ -3,12 +3,31 @@ Este archivo contiene una clase con funciones de utilidad para la aplicación.
 Proporciona funcionalidades reutilizables como validación, formateo de datos, etc.
 """
 
+import os
 import re
-from datetime import datetime
+from datetime import datetime, date
 
 class Util:
     """Clase que proporciona funciones de utilidad para la aplicación."""
     
+    # Las fechas se guardan en ISO-8601 (se ordenan bien como texto y sirven para rangos en SQL);
+    # el formato dd/mm/YYYY solo se usa al mostrarlas.
+    STORAGE_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+    DISPLAY_DATE_FORMAT = "%d/%m/%Y %H:%M"
+    _STORAGE_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$')
+    _DISPLAY_DATE_RE = re.compile(r'^(\d{2})/(\d{2})/(\d{4}) (\d{2}):(\d{2})$')
+    
+    # Formatos que se aceptan al leer fechas (del más específico al más general)
+    KNOWN_DATE_FORMATS = (
+        "%Y-%m-%d %H:%M:%S",    # ISO sin microsegundos (formato de almacenamiento)
+        "%Y-%m-%d %H:%M:%S.%f", # ISO con microsegundos
+        "%Y-%m-%dT%H:%M:%S",    # ISO con T
+        "%Y-%m-%d %H:%M",
+        "%Y-%m-%d",             # Solo fecha ISO
+        "%d/%m/%Y %H:%M",       # Formato anterior de la aplicación
+        "%d/%m/%Y",             # Solo fecha con barras
+    )
+    
     @staticmethod
     def validate_cedula(cedula):
         """Valida que una cédula sea numérica y tenga una longitud apropiada (6-10 dígitos)."""
@@ -20,45 +39,75 @@ class Util:
             return False, f"La cédula debe tener entre 6 y 10 dígitos (actual: {len(cedula)})."
         return True, ""
     
+    @staticmethod
+    def now_timestamp():
+        """Fecha y hora actual en el formato en que se guardan en la base de datos."""
+        return datetime.now().strftime(Util.STORAGE_DATE_FORMAT)
+    
+    @staticmethod
+    def _parse_date(value):
+        """Convierte un datetime/date o un texto en alguno de los formatos conocidos a datetime (o None)."""
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, date):
+            return datetime(value.year, value.month, value.day)
+        if not isinstance(value, str):
+            return None
+        value = value.strip()
+        for fmt in Util.KNOWN_DATE_FORMATS:
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                continue # Probar el siguiente formato
+        return None
+    
+    @staticmethod
+    def to_storage_date(value):
+        """
+        Convierte una fecha (datetime, date o texto en un formato conocido) al formato ISO-8601 ordenable
+        que se guarda en la base de datos ('YYYY-MM-DD HH:MM:SS'). Devuelve None si no se puede interpretar.
+        """
+        if isinstance(value, str):
+            if Util._STORAGE_DATE_RE.match(value):
+                return value # Ya está en el formato de almacenamiento
+            # Formato de pantalla/exportación ('dd/mm/YYYY HH:MM'): reordenar sin strptime, que es lento
+            # cuando se alternan muchos formatos (importaciones grandes)
+            match = Util._DISPLAY_DATE_RE.match(value.strip())
+            if match:
+                day, month, year, hour, minute = match.groups()
+                try:
+                    datetime(int(year), int(month), int(day), int(hour), int(minute)) # Validar la fecha
+                except ValueError:
+                    return None
+                return f"{year}-{month}-{day} {hour}:{minute}:00"
+        parsed_date = Util._parse_date(value)
+        return parsed_date.strftime(Util.STORAGE_DATE_FORMAT) if parsed_date else None
+    
     @staticmethod
     def format_date(date_str):
-        """Formatea una fecha si es necesario. Devuelve string vacío si la entrada es vacía."""
+        """
+        Formatea una fecha para mostrarla ('dd/mm/YYYY HH:MM'). Devuelve string vacío si la entrada es vacía.
+        Las fechas guardadas en la BD ya están en ISO-8601, así que normalmente basta con reordenar el texto.
+        """
         if not date_str or not str(date_str).strip():
             return "" # Devuelve vacío si la entrada es None, vacía o solo espacios
         
+        # Formato de almacenamiento: 'YYYY-MM-DD HH:MM:SS' -> 'DD/MM/YYYY HH:MM' sin parsear
+        if isinstance(date_str, str) and Util._STORAGE_DATE_RE.match(date_str):
+            return f"{date_str[8:10]}/{date_str[5:7]}/{date_str[0:4]} {date_str[11:16]}"
+        
         # Si ya tiene el formato deseado, devolverlo tal cual
         if isinstance(date_str, str) and re.match(r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}', date_str):
             return date_str
         
-        # Intentar convertir varios formatos de fecha
-        # Formatos comunes a intentar (del más específico al más general)
-        common_formats = [
-            "%Y-%m-%d %H:%M:%S.%f", # ISO con microsegundos
-            "%Y-%m-%d %H:%M:%S",    # ISO sin microsegundos
-            "%Y-%m-%dT%H:%M:%S",   # ISO con T
-            "%Y-%m-%d",             # Solo fecha ISO
-            "%d/%m/%Y %H:%M",      # Formato deseado (por si acaso)
-            "%d/%m/%Y"             # Solo fecha con barras
-        ]
-        
-        parsed_date = None
-        if isinstance(date_str, datetime): # Si ya es un objeto datetime
-            parsed_date = date_str
-        elif isinstance(date_str, str):
-            for fmt in common_formats:
-                try:
-                    parsed_date = datetime.strptime(date_str, fmt)
-                    break # Salir del bucle si se parsea correctamente
-                except ValueError:
-                    continue # Probar el siguiente formato
-        
+        parsed_date = Util._parse_date(date_str)
         if parsed_date:
-            return parsed_date.strftime("%d/%m/%Y %H:%M")
+            return parsed_date.strftime(Util.DISPLAY_DATE_FORMAT)
         else:
             # Si no se pudo parsear y no es el formato deseado, registrar o advertir
             # print(f"Advertencia: No se pudo formatear la fecha '{date_str}'. Se usará la fecha actual.")
             # Considerar si devolver la fecha actual es el comportamiento deseado o un string vacío/error
-            return datetime.now().strftime("%d/%m/%Y %H:%M") # Opcional: devolver fecha actual como fallback
+            return datetime.now().strftime(Util.DISPLAY_DATE_FORMAT) # Opcional: devolver fecha actual como fallback
     
     @staticmethod
     def validate_name(name, field_name="Nombre"):
@@ -79,74 +128,145 @@ class Util:
     @staticmethod
     def export_to_csv(tasks, filename):
         """Exporta una lista de tareas a un archivo CSV."""
-        import csv # Mover import aquí para que solo se cargue si se usa la función
-        
         if not tasks:
             print("No hay tareas para exportar.")
             return False, "No hay datos para exportar."
-
+        
+        success, message, _ = Util.export_rows_to_csv([[task.to_tuple() for task in tasks]], filename)
+        return success, message
+    
+    @staticmethod
+    def export_rows_to_csv(chunks, filename, total=None, on_progress=None, cancel_event=None):
+        """
+        Escribe en un CSV las filas (tuplas en el orden de TASK_FIELDS) que llegan por bloques, p. ej. de
+        TaskDAO.iter_task_rows(), sin juntarlas en memoria.
+        on_progress(filas_escritas, total) se llama después de cada bloque. Si cancel_event (threading.Event)
+        se activa, la exportación se detiene y se borra el archivo parcial.
+        Devuelve (éxito, mensaje, estadísticas), con las filas escritas, los segundos y las filas por segundo.
+        """
+        import csv # Mover import aquí para que solo se cargue si se usa la función
+        import time
+        from models.task import TASK_FIELDS
+        
+        format_date = Util.format_date
+        stats = {"filas": 0, "segundos": 0.0, "filas_por_segundo": 0.0, "cancelado": False}
+        start = time.perf_counter()
+        success, error_msg = False, None
         try:
             with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile: # utf-8-sig para mejor compatibilidad con Excel
-                fieldnames = ['id', 'cedula', 'nombre', 'apellido', 'curso', 
-                             'turno', 'accion', 'fecha_creacion', 'fecha_completado', 'status']
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore') # Ignorar campos extra en el dict
-                
-                writer.writeheader()
-                for task in tasks:
-                    # Asegurarse de que to_dict() devuelve todos los fieldnames esperados
-                    task_dict = task.to_dict()
-                    # Formatear fechas para el CSV si es necesario, aunque to_dict debería manejarlo
-                    task_dict['fecha_creacion'] = Util.format_date(task_dict.get('fecha_creacion'))
-                    task_dict['fecha_completado'] = Util.format_date(task_dict.get('fecha_completado'))
-                    writer.writerow(task_dict)
-                    
-            return True, f"Datos exportados correctamente a {filename}"
+                writer = csv.writer(csvfile)
+                writer.writerow(TASK_FIELDS)
+                row = [None] * len(TASK_FIELDS) # Se reutiliza en cada fila en lugar de crear una lista o un dict
+                for chunk in chunks:
+                    if cancel_event is not None and cancel_event.is_set():
+                        stats["cancelado"] = True
+                        break
+                    for values in chunk:
+                        row[:] = values
+                        row[7] = format_date(row[7]) # fecha_creacion
+                        row[8] = format_date(row[8]) # fecha_completado
+                        writer.writerow(row)
+                    stats["filas"] += len(chunk)
+                    if on_progress:
+                        on_progress(stats["filas"], total)
+            success = not stats["cancelado"] and stats["filas"] > 0
         except IOError as e: # Más específico para errores de archivo
             error_msg = f"Error de E/S al exportar a CSV '{filename}': {e}"
-            print(error_msg)
-            return False, error_msg
         except Exception as e:
             error_msg = f"Error inesperado al exportar a CSV: {e}"
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close() # Libera el cursor si la exportación terminó antes de tiempo
+        
+        stats["segundos"] = time.perf_counter() - start
+        if stats["segundos"] > 0:
+            stats["filas_por_segundo"] = stats["filas"] / stats["segundos"]
+        
+        if success:
+            return True, f"{stats['filas']} tareas exportadas correctamente a {filename}", stats
+        
+        # No dejar archivos a medio escribir
+        try:
+            os.remove(filename)
+        except OSError:
+            pass
+        if error_msg:
             print(error_msg)
-            return False, error_msg
+            return False, error_msg, stats
+        if stats["cancelado"]:
+            return False, f"Exportación cancelada ({stats['filas']} tareas escritas, archivo descartado).", stats
+        print("No hay tareas para exportar.")
+        return False, "No hay datos para exportar.", stats
     
     @staticmethod
     def generate_report(tasks):
         """Genera un informe resumido basado en la lista de tareas."""
         if not tasks:
-            return {
-                "total": 0,
-                "pendientes": 0,
-                "completadas": 0,
-                "por_curso": {},
-                "por_turno": {},
-                "message": "No hay tareas para generar el informe."
-            }
-
+            return Util.build_report([])
+        
+        group_counts = {}
+        for task in tasks:
+            if not isinstance(task, object) or not hasattr(task, 'status'): # Chequeo básico de validez del objeto task
+                continue
+            # Usar getattr para seguridad
+            key = (getattr(task, 'curso', 'Desconocido'), getattr(task, 'turno', 'Desconocido'), task.status)
+            group_counts[key] = group_counts.get(key, 0) + 1
+        
+        return Util.build_report((curso, turno, status, cantidad)
+                                 for (curso, turno, status), cantidad in group_counts.items())
+    
+    @staticmethod
+    def build_report(group_counts, period_counts=None, period="month"):
+        """
+        Arma el informe a partir de conteos ya agrupados, sin recorrer tareas:
+        group_counts: tuplas (curso, turno, status, cantidad), p. ej. de TaskDAO.get_group_counts().
+        period_counts: tuplas (periodo, creadas, completadas), p. ej. de TaskDAO.get_period_counts().
+        """
         report = {
-            "total": len(tasks),
+            "total": 0,
             "pendientes": 0,
             "completadas": 0,
             "por_curso": {},
-            "por_turno": {}
+            "por_turno": {},
+            "por_curso_turno": {}, # (curso, turno) -> {"pendiente": n, "completada": m}
+            "por_periodo": {}, # periodo -> {"creadas": n, "completadas": m}
+            "periodo": period
         }
         
-        for task in tasks:
-            if not isinstance(task, object) or not hasattr(task, 'status'): # Chequeo básico de validez del objeto task
-                continue
-
+        for curso, turno, status, cantidad in group_counts:
+            report["total"] += cantidad
             # Contar por estado
-            if task.status == "pendiente":
-                report["pendientes"] += 1
-            elif task.status == "completada": # Ser explícito con el estado
-                report["completadas"] += 1
-                
-            # Contar por curso
-            curso = getattr(task, 'curso', 'Desconocido') # Usar getattr para seguridad
-            report["por_curso"][curso] = report["por_curso"].get(curso, 0) + 1
-            
-            # Contar por turno
-            turno = getattr(task, 'turno', 'Desconocido') # Usar getattr para seguridad
-            report["por_turno"][turno] = report["por_turno"].get(turno, 0) + 1
+            if status == "pendiente":
+                report["pendientes"] += cantidad
+            elif status == "completada": # Ser explícito con el estado
+                report["completadas"] += cantidad
+            # Contar por curso, por turno y por ambos
+            report["por_curso"][curso] = report["por_curso"].get(curso, 0) + cantidad
+            report["por_turno"][turno] = report["por_turno"].get(turno, 0) + cantidad
+            cell = report["por_curso_turno"].setdefault((curso, turno), {"pendiente": 0, "completada": 0})
+            cell[status] = cell.get(status, 0) + cantidad
+        
+        for periodo, creadas, completadas in period_counts or ():
+            report["por_periodo"][periodo] = {"creadas": creadas, "completadas": completadas}
         
+        if report["total"] == 0:
+            report["message"] = "No hay tareas para generar el informe."
+        return report
+    
+    @staticmethod
+    def report_to_json(report):
+        """Copia del informe apta para JSON: el cruce curso × turno (con tuplas como clave) pasa a ser una lista."""
+        report = dict(report)
+        report["por_curso_turno"] = [{"curso": curso, "turno": turno, **counts}
+                                     for (curso, turno), counts in report.get("por_curso_turno", {}).items()]
+        return report
+    
+    @staticmethod
+    def report_from_json(data):
+        """Inversa de report_to_json: vuelve a indexar el cruce curso × turno por (curso, turno)."""
+        report = dict(data)
+        report["por_curso_turno"] = {
+            (cell["curso"], cell["turno"]): {k: v for k, v in cell.items() if k not in ("curso", "turno")}
+            for cell in data.get("por_curso_turno", [])
+        }
         return report
@@ -0,0 +1,485 @@
+"""
+Vista de una lista de tareas sobre un ttk.Treeview.
+En modo virtual solo se materializan las filas visibles (más un pequeño buffer en memoria) y el resto
+se pide al DAO a medida que se desplaza la barra, de modo que listas de decenas de miles de tareas
+no congelan la interfaz. Las filas se leen en segundo plano (DAOExecutor): mientras llegan se
+muestra una fila provisional con el id y se completa al recibir la tarea.
+"""
+
+import heapq
+
+from utils.util import Util
+
+class TaskTreeView:
+    """Adaptador entre una lista ordenada de ids de tareas y un ttk.Treeview."""
+
+    DEFAULT_ROW_HEIGHT = 25 # Debe coincidir con el rowheight del estilo 'Treeview'
+    DEFAULT_VISIBLE_ROWS = 20 # Filas a mostrar mientras el widget aún no tiene tamaño real
+
+    LOADING_TEXT = "Cargando..." # Texto de las filas provisionales
+
+    def __init__(self, tree, scrollbar, load_tasks, executor, tag=None, on_select=None,
+                 virtual=True, buffer_rows=30):
+        """
+        tree / scrollbar: widgets ya creados (la scrollbar vertical del tree).
+        load_tasks: función que recibe una lista de ids y devuelve las tareas (p. ej. TaskDAO.get_tasks_by_ids).
+        executor: DAOExecutor en el que se ejecuta load_tasks (nunca se llama en el hilo de Tk).
+        tag: tag de Treeview aplicado a cada fila (para los colores por estado).
+        on_select: callback que recibe esta vista cuando el usuario cambia la selección.
+        virtual: si es False se insertan todas las filas y el Treeview se desplaza de forma nativa.
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.load_tasks = load_tasks
+        self.executor = executor
+        self.tags = (tag,) if tag else ()
+        self.on_select = on_select
+        self.virtual = virtual
+        self.buffer_rows = buffer_rows
+
+        self.ids = [] # Ids de todas las filas, en orden de visualización
+        self.id_ordered = True # False si self.ids viene ordenada por relevancia (búsqueda activa)
+        self.offset = 0 # Índice (en self.ids) de la primera fila mostrada
+        self.selected_ids = set() # La selección se guarda por id, así sobrevive al desplazamiento
+        self._cache = {} # id -> Task de las filas mostradas y del buffer
+        self._position_index = None # id -> posición en self.ids (perezoso)
+        self._loading = set() # Ids ya pedidos al DAO cuyo resultado aún no llegó
+        self._gone = set() # Ids pedidos que el DAO no devolvió (borradas por otro usuario)
+        self._generation = 0 # Cambia al descartar el buffer: las cargas anteriores se ignoran
+        self._visible_rows = self.DEFAULT_VISIBLE_ROWS
+        self._extending = False # Shift/Ctrl en el último clic o tecla (selección múltiple)
+
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<ButtonPress-1>", self._remember_modifiers, add="+")
+        self.tree.bind("<KeyPress>", self._remember_modifiers, add="+")
+        if self.virtual:
+            self.scrollbar.config(command=self._on_scrollbar)
+            self.tree.config(yscrollcommand="")
+            self.tree.bind("<Configure>", self._on_configure)
+            self.tree.bind("<MouseWheel>", self._on_mousewheel) # Windows / macOS
+            self.tree.bind("<Button-4>", lambda event: self.scroll(-3)) # Linux (X11)
+            self.tree.bind("<Button-5>", lambda event: self.scroll(3))
+            self.tree.bind("<Up>", lambda event: self._on_arrow_key(-1, event))
+            self.tree.bind("<Down>", lambda event: self._on_arrow_key(1, event))
+            self.tree.bind("<Prior>", lambda event: self.scroll(-self._visible_rows) or "break")
+            self.tree.bind("<Next>", lambda event: self.scroll(self._visible_rows) or "break")
+            self.tree.bind("<Home>", lambda event: self.scroll_to(0) or "break")
+            self.tree.bind("<End>", lambda event: self.scroll_to(len(self.ids)) or "break")
+
+    @classmethod
+    def placeholder_values(cls, task_id):
+        """Valores de la fila provisional de una tarea que todavía se está leyendo."""
+        return (task_id, cls.LOADING_TEXT) + ("",) * 7
+
+    @staticmethod
+    def row_values(task):
+        """Valores de las columnas del Treeview para una tarea."""
+        return (
+            task.id,
+            task.cedula,
+            task.nombre,
+            task.apellido,
+            task.curso,
+            task.turno,
+            task.accion,
+            Util.format_date(task.fecha_creacion),
+            Util.format_date(task.fecha_completado)
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, task_id):
+        return task_id in self._positions()
+
+    def item_id(self, task_id):
+        """Id del item del Treeview para una tarea (las filas usan el id de la tarea como iid)."""
+        return str(task_id)
+
+    def _positions(self):
+        """Índice id -> posición en self.ids; se reconstruye solo cuando la lista cambió."""
+        if self._position_index is None:
+            self._position_index = {task_id: index for index, task_id in enumerate(self.ids)}
+        return self._position_index
+
+    # --- Contenido ---
+
+    def set_ids(self, ids, id_ordered=True):
+        """
+        Reemplaza el contenido de la vista. Conserva la selección de las tareas que sigan presentes.
+        id_ordered indica si los ids vienen en orden descendente; si no (resultados por relevancia),
+        las tareas que se agreguen después van al final.
+        """
+        self.ids = list(ids)
+        self.id_ordered = id_ordered
+        self._position_index = None
+        self.selected_ids &= set(self.ids)
+        self._discard_buffer()
+        if not self.virtual:
+            self.offset = 0
+        self.render()
+
+    def refresh(self):
+        """Vuelve a leer de la BD las filas mostradas (los datos cambiaron pero no el orden)."""
+        self._discard_buffer()
+        self.render()
+
+    def _discard_buffer(self):
+        """Olvida las tareas leídas y las cargas en curso (sus resultados llegarán desactualizados)."""
+        self._cache = {}
+        self._loading = set()
+        self._gone = set()
+        self._generation += 1
+
+    def cached_task(self, task_id):
+        """Tarea ya materializada (fila visible o buffer), sin consultar al DAO; None si no está."""
+        return self._cache.get(task_id)
+
+    # --- Cambios incrementales (no reconstruyen la vista) ---
+
+    def insert_task(self, task):
+        """
+        Agrega una tarea en su posición (ids descendentes, o al final si la vista está ordenada por
+        relevancia) modificando solo una fila del Treeview.
+        """
+        if task.id in self:
+            self.update_task(task)
+            return
+        low = self._insert_position(task.id) if self.id_ordered else len(self.ids)
+        self.ids.insert(low, task.id)
+        self._position_index = None
+        self._cache[task.id] = task
+        if self.virtual:
+            self._render_if_in_window(low, 1)
+        else:
+            self.tree.insert("", low, iid=self.item_id(task.id), values=self.row_values(task), tags=self.tags)
+
+    def _insert_position(self, task_id):
+        """Posición que le corresponde a un id en la lista descendente."""
+        # Búsqueda binaria (sin bisect(key=...) para soportar Python < 3.10)
+        low, high = 0, len(self.ids)
+        while low < high:
+            middle = (low + high) // 2
+            if self.ids[middle] > task_id:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def update_task(self, task):
+        """Actualiza los valores de la fila de una tarea existente (si está renderizada)."""
+        if task.id not in self:
+            return
+        self._cache[task.id] = task
+        iid = self.item_id(task.id)
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=self.row_values(task))
+
+    def remove_task(self, task_id):
+        """Quita una tarea de la vista; devuelve False si no estaba."""
+        index = self._positions().get(task_id)
+        if index is None:
+            return False
+        del self.ids[index]
+        self._position_index = None
+        self._cache.pop(task_id, None)
+        self.selected_ids.discard(task_id)
+        if self.virtual:
+            self._render_if_in_window(index, -1)
+        elif self.tree.exists(self.item_id(task_id)):
+            self.tree.delete(self.item_id(task_id))
+        return True
+
+    # --- Cambios en lote (un solo redibujado, para las acciones sobre varias tareas) ---
+
+    def insert_tasks(self, tasks):
+        """Agrega (o actualiza) varias tareas y redibuja una sola vez."""
+        anchor = self._first_visible_id()
+        positions = self._positions()
+        new_tasks = {}
+        for task in tasks:
+            if task.id in positions:
+                self.update_task(task)
+            else:
+                new_tasks[task.id] = task
+        if new_tasks:
+            if self.id_ordered:
+                # Una sola pasada: se mezclan las dos listas descendentes
+                self.ids = list(heapq.merge(self.ids, sorted(new_tasks, reverse=True), reverse=True))
+            else:
+                self.ids.extend(new_tasks) # Orden por relevancia: las nuevas coincidencias van al final
+            self._position_index = None
+            self._cache.update(new_tasks)
+            if not self.virtual:
+                # En orden de posición final, así cada fila anterior ya está en el Treeview
+                for index, task_id in enumerate(self.ids):
+                    if task_id in new_tasks:
+                        self.tree.insert("", index, iid=self.item_id(task_id),
+                                         values=self.row_values(new_tasks[task_id]), tags=self.tags)
+        self._render_after_bulk(anchor)
+
+    def remove_tasks(self, task_ids):
+        """Quita varias tareas y redibuja una sola vez; devuelve cuántas estaban en la vista."""
+        positions = self._positions()
+        removed = {task_id for task_id in task_ids if task_id in positions}
+        if not removed:
+            return 0
+        anchor = self._first_visible_id()
+        self.ids = [task_id for task_id in self.ids if task_id not in removed]
+        self._position_index = None
+        self.selected_ids -= removed
+        for task_id in removed:
+            self._cache.pop(task_id, None)
+        if not self.virtual:
+            rendered = [self.item_id(task_id) for task_id in removed if self.tree.exists(self.item_id(task_id))]
+            if rendered:
+                self.tree.delete(*rendered)
+        self._render_after_bulk(anchor)
+        return len(removed)
+
+    def _first_visible_id(self):
+        return self.ids[self.offset] if self.virtual and self.offset < len(self.ids) else None
+
+    def _render_after_bulk(self, anchor):
+        """En modo virtual, mantiene arriba la misma fila que se veía antes del cambio y redibuja."""
+        if not self.virtual:
+            return
+        position = self._positions().get(anchor)
+        if position is not None:
+            self.offset = position
+        self.render()
+
+    def select_all(self):
+        """Selecciona todas las tareas de la vista, también las que no están renderizadas."""
+        self.selected_ids = set(self.ids)
+        self.render()
+        if self.on_select:
+            self.on_select(self)
+        return "break"
+
+    def _render_if_in_window(self, index, delta):
+        """
+        En modo virtual, vuelve a dibujar solo si el cambio cae dentro de las filas visibles.
+        Si cae por encima se corre el offset para que el usuario siga viendo las mismas filas.
+        """
+        if index < self.offset:
+            self.offset = max(0, self.offset + delta)
+            self._update_scrollbar(*self._window())
+        elif index < self.offset + self._visible_rows:
+            self.render()
+        else:
+            self._update_scrollbar(*self._window())
+
+    # --- Selección ---
+
+    def get_selected_ids(self):
+        """Ids seleccionados (incluidos los que quedaron fuera de la zona visible), en orden de visualización."""
+        positions = self._positions()
+        return sorted((task_id for task_id in self.selected_ids if task_id in positions), key=positions.get)
+
+    def select_id(self, task_id, see=True):
+        """Selecciona una tarea por id, desplazando la vista para mostrarla si hace falta."""
+        if task_id not in self:
+            return False
+        self.selected_ids = {task_id}
+        if see:
+            self.see(task_id)
+        else:
+            self.render()
+        return True
+
+    def clear_selection(self):
+        """Quita la selección."""
+        self.selected_ids = set()
+        self.render()
+
+    def _on_tree_select(self, event):
+        """Sincroniza la selección por id y avisa solo si el cambio lo hizo el usuario (no un re-render)."""
+        rendered = {int(iid) for iid in self.tree.get_children()}
+        current = {int(iid) for iid in self.tree.selection()}
+        if current == self.selected_ids & rendered:
+            return
+        if str(self.tree.cget("selectmode")) == "browse" or not self._extending:
+            self.selected_ids = current
+        else:
+            # Con Shift/Ctrl se mantienen las filas seleccionadas que no están renderizadas
+            self.selected_ids = (self.selected_ids - rendered) | current
+        if self.on_select:
+            self.on_select(self)
+
+    def _remember_modifiers(self, event):
+        """Recuerda si el clic o la tecla extiende la selección (Shift = 0x1, Control = 0x4)."""
+        self._extending = bool(event.state & 0x0005)
+
+    # --- Desplazamiento (modo virtual) ---
+
+    def see(self, task_id):
+        """Desplaza la vista para que la tarea quede visible."""
+        if not self.virtual:
+            self.render()
+            if self.tree.exists(str(task_id)):
+                self.tree.see(str(task_id))
+            return
+        index = self._positions()[task_id]
+        if not (self.offset <= index < self.offset + self._visible_rows):
+            self.offset = max(0, index - self._visible_rows // 2)
+        self.render()
+
+    def scroll(self, rows):
+        """Desplaza la ventana visible la cantidad de filas indicada (negativo = hacia arriba)."""
+        self.scroll_to(self.offset + rows)
+
+    def scroll_to(self, offset):
+        """Ubica la ventana visible a partir de la fila 'offset'."""
+        offset = max(0, min(int(offset), max(0, len(self.ids) - self._visible_rows)))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def _on_scrollbar(self, action, *args):
+        """Recibe los comandos de la scrollbar ('moveto' o 'scroll')."""
+        if action == "moveto":
+            self.scroll_to(float(args[0]) * len(self.ids))
+        elif action == "scroll":
+            amount = int(args[0])
+            if args[1] == "pages":
+                amount *= self._visible_rows
+            self.scroll(amount)
+
+    def _on_mousewheel(self, event):
+        """Rueda del ratón: 120 unidades de delta equivalen a 3 filas."""
+        self.scroll(-3 * int(event.delta / 120) if abs(event.delta) >= 120 else (-1 if event.delta > 0 else 1))
+        return "break"
+
+    def _on_arrow_key(self, direction, event=None):
+        """Mueve la selección con las flechas, desplazando la ventana al llegar a un borde."""
+        if event is not None:
+            self._remember_modifiers(event)
+        selected = self.get_selected_ids()
+        if not selected or not self.ids:
+            return None
+        index = self._positions()[selected[0]] + direction
+        if not (0 <= index < len(self.ids)):
+            return "break"
+        if self.offset <= index < self.offset + self._visible_rows:
+            return None # Dentro de la ventana, el Treeview lo resuelve solo
+        self.scroll(direction)
+        self.tree.selection_set(str(self.ids[index])) # Cambio del usuario: dispara on_select
+        self.tree.focus(str(self.ids[index]))
+        return "break"
+
+    def _on_configure(self, event):
+        """Recalcula cuántas filas entran cuando cambia el tamaño del widget."""
+        rows = self._measure_visible_rows()
+        if rows != self._visible_rows:
+            self._visible_rows = rows
+            self.render()
+
+    def _measure_visible_rows(self):
+        """Filas completas que entran en el alto actual del Treeview."""
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return self.DEFAULT_VISIBLE_ROWS
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else ""
+        if bbox:
+            header_height, row_height = bbox[1], bbox[3]
+        else:
+            header_height, row_height = self.DEFAULT_ROW_HEIGHT, self.DEFAULT_ROW_HEIGHT
+        return max(1, (height - header_height) // max(row_height, 1))
+
+    # --- Renderizado ---
+
+    def _window(self):
+        """Rango [inicio, fin) de self.ids que debe estar en el Treeview."""
+        if not self.virtual:
+            return 0, len(self.ids)
+        self.offset = max(0, min(self.offset, max(0, len(self.ids) - self._visible_rows)))
+        return self.offset, min(len(self.ids), self.offset + self._visible_rows)
+
+    def _is_known(self, task_id):
+        """La tarea ya está en el buffer, se está leyendo o se sabe que ya no existe."""
+        return task_id in self._cache or task_id in self._loading or task_id in self._gone
+
+    def _ensure_cached(self, start, end):
+        """
+        Pide en segundo plano las tareas de la ventana que falten, junto con el buffer a ambos lados.
+        No espera: render muestra filas provisionales y _on_tasks_loaded las completa.
+        """
+        if all(self._is_known(task_id) for task_id in self.ids[start:end]):
+            return
+        if self.virtual:
+            start = max(0, start - self.buffer_rows)
+            end = min(len(self.ids), end + self.buffer_rows)
+            # Mantener acotado el buffer: se descarta lo que quedó lejos de la ventana actual
+            wanted = set(self.ids[start:end])
+            self._cache = {task_id: task for task_id, task in self._cache.items() if task_id in wanted}
+        missing = [task_id for task_id in self.ids[start:end] if not self._is_known(task_id)]
+        if not missing:
+            return
+        self._loading.update(missing) # Así desplazarse no vuelve a pedir las mismas filas
+        generation = self._generation
+        self.executor.submit_read(lambda: self.load_tasks(missing),
+                                  lambda tasks: self._on_tasks_loaded(generation, missing, tasks),
+                                  lambda e: self._on_load_error(generation, missing, e),
+                                  description="") # Sin mensaje: no pisar la barra de estado al desplazarse
+
+    def _on_tasks_loaded(self, generation, requested, tasks):
+        """En el hilo de Tk: guarda las tareas leídas y completa sus filas provisionales."""
+        if generation != self._generation:
+            return # El contenido cambió mientras se leían
+        self._loading.difference_update(requested)
+        for task in tasks:
+            # Lo que llegó por insert_task/update_task durante la lectura es más reciente
+            self._cache.setdefault(task.id, task)
+        gone = [task_id for task_id in requested if task_id not in self._cache]
+        self._gone.update(gone)
+        if any(self.tree.exists(self.item_id(task_id)) for task_id in gone):
+            self.render() # Quitar las filas de tareas borradas sin dejar huecos
+            return
+        for task_id in requested:
+            iid = self.item_id(task_id)
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=self.row_values(self._cache[task_id]))
+
+    def _on_load_error(self, generation, requested, error):
+        """Las filas quedan provisionales; se vuelven a pedir en el próximo redibujado."""
+        if generation == self._generation:
+            self._loading.difference_update(requested)
+        print(f"Error al cargar las filas de la lista: {error}")
+
+    def render(self):
+        """Materializa en el Treeview las filas de la ventana actual y actualiza la scrollbar."""
+        start, end = self._window()
+        self._ensure_cached(start, end)
+
+        children = self.tree.get_children()
+        if children:
+            self.tree.delete(*children)
+        for task_id in self.ids[start:end]:
+            task = self._cache.get(task_id)
+            if task is not None:
+                values = self.row_values(task)
+            elif task_id in self._gone:
+                continue # Borrada por otro usuario después de obtener los ids
+            else:
+                values = self.placeholder_values(task_id) # Se completa al llegar la lectura
+            self.tree.insert("", "end", iid=str(task_id), values=values, tags=self.tags)
+
+        selected = [str(task_id) for task_id in self.ids[start:end]
+                    if task_id in self.selected_ids and self.tree.exists(str(task_id))]
+        self.tree.selection_set(selected)
+        if selected:
+            self.tree.focus(selected[0])
+
+        self._update_scrollbar(start, end)
+
+    def _update_scrollbar(self, start, end):
+        """Ubica el cursor de la scrollbar según la ventana mostrada (solo en modo virtual)."""
+        if not self.virtual:
+            return
+        total = len(self.ids)
+        if total:
+            self.scrollbar.set(start / total, end / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)